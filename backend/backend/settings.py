@@ -54,7 +54,7 @@ INSTALLED_APPS = [
 ]
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',  # role + profiles in one query, cached per token
         'rest_framework.authentication.SessionAuthentication',
     ),
 }
@@ -179,6 +179,12 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Let the web server send media bytes after Django resolves the path (see core/media_responses.py)
+# '' streams through Django, 'x-accel' for nginx, 'x-sendfile' for Apache/lighttpd.
+# For nginx, map MEDIA_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT in an `internal` location.
+MEDIA_OFFLOAD_MODE = os.getenv('MEDIA_OFFLOAD_MODE', '')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -196,13 +202,68 @@ EMAIL_HOST_USER = 'earistojtsys@gmail.com'
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_PASSWORD', '')  # Set this in .env file
 DEFAULT_FROM_EMAIL = 'EARIST OJT System <earistojtsys@gmail.com>'
 
+# Email outbox (see core/email_outbox.py)
+# Views only enqueue; run `python manage.py send_queued_emails --loop` to deliver.
+# Set EMAIL_USE_OUTBOX=False to send synchronously inside the request instead.
+EMAIL_USE_OUTBOX = os.getenv('EMAIL_USE_OUTBOX', 'True') == 'True'
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 30
+# Sent/Failed rows are deleted after this many days; their bodies are blanked as soon as they finish
+EMAIL_OUTBOX_RETENTION_DAYS = 7
+EMAIL_TIMEOUT = 30
+
 # Cache Configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Set REDIS_URL so all workers share one cache (typing indicators, counters, etc.)
+# "shared" holds state that must be shared in every deployment (login throttling,
+# see core/shared_cache.py); without Redis it uses the core_shared_cache table.
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'core_shared_cache',
+        },
+    }
+
+# Typing indicators (see core/presence.py)
+TYPING_INDICATOR_TTL = 5  # seconds
+TYPING_INDICATOR_USE_DATABASE = os.getenv('TYPING_INDICATOR_USE_DATABASE', 'False') == 'True'
+
+# Longest a per-process (non-Redis) cache may hold values other workers cannot invalidate
+# (see core/shared_cache.py)
+LOCAL_CACHE_TTL = 30
+
+# Seconds a resolved API token stays in the cache (see core/authentication.py); 0 disables.
+# Only used with a shared cache: without REDIS_URL a revoked token would stay valid in other workers.
+AUTH_TOKEN_CACHE_TTL = 60 if REDIS_URL else 0
+
+# Seconds a cached unread-notification count lives before it is recounted (see core/notifications.py).
+# Counts are only consistent across workers with a shared cache (REDIS_URL).
+NOTIFICATION_UNREAD_TTL = 60
+
+# Login throttling (see core/login_throttle.py)
+# Lockouts are kept in the cache; run `python manage.py persist_login_lockouts --loop` to audit them
+# and `python manage.py clear_login_lockouts` to unlock accounts.
+LOGIN_MAX_ATTEMPTS = 3
+LOGIN_IP_MAX_ATTEMPTS = 20
+LOGIN_LOCKOUT_SECONDS = 120
+# Reverse proxies in front of Django that append to X-Forwarded-For; 0 trusts only REMOTE_ADDR
+LOGIN_TRUSTED_PROXIES = int(os.getenv('LOGIN_TRUSTED_PROXIES', '0'))
 
 # ========== SECURITY SETTINGS ==========
 
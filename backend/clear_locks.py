@@ -4,9 +4,9 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
-from core.models import LoginAttempt
-from django.contrib.auth.models import User
+from django.core.management import call_command
 
-print(f"Found {LoginAttempt.objects.count()} login attempts.")
-LoginAttempt.objects.all().delete()
+# Failures and lockouts live in the cache (see core/login_throttle.py);
+# LoginAttempt rows are only the audit trail and are kept
+call_command('clear_login_lockouts', '--all')
 print("Cleared all login attempts.")
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django import forms
-from .models import Company, Internship, Application
+from .models import Company, Internship, Application, OutboxEmail, StoredBlob, HoursLedger
 
 # --- Inline to show Applications in User admin ---
 class ApplicationInline(admin.TabularInline):
@@ -82,3 +82,33 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('student', 'internship', 'status', 'applied_at')
     list_filter = ('status', 'internship__company')
     search_fields = ('student__username', 'internship__position')
+
+# --- Register Outbox Email ---
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    # Bodies hold verification codes and temporary passwords
+    exclude = ('body_text', 'body_html')
+
+# --- Register Stored Blob ---
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'ref_count', 'created_at', 'last_referenced_at')
+    search_fields = ('sha256', 'name')
+    readonly_fields = ('sha256', 'name', 'size', 'created_at', 'last_referenced_at')
+
+# --- Register Hours Ledger (read-only; rebuilt from attendance and journals) ---
+@admin.register(HoursLedger)
+class HoursLedgerAdmin(admin.ModelAdmin):
+    list_display = ('student', 'application', 'attendance_hours', 'journal_hours', 'journal_approved_hours', 'updated_at')
+    search_fields = ('student__username', 'student__first_name', 'student__last_name')
+    list_select_related = ('student',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,199 @@
+"""
+Bulk application status transitions for the EARIST OJT System
+Validates a set of applications, applies the change with a single UPDATE
+and batches the notification/email side effects.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Application, Internship, Notification, UserRole
+from . import notifications as notification_utils
+
+VALID_STATUSES = {choice[0] for choice in Application._meta.get_field('status').choices}
+
+
+def scope_applications(user, queryset=None):
+    """Restrict applications to what this user may manage"""
+    queryset = queryset if queryset is not None else Application.objects.all()
+    role = user.user_role.role if hasattr(user, 'user_role') else None
+
+    if role == UserRole.ADMIN or (user.is_staff and not role):
+        return queryset
+    if role == UserRole.COORDINATOR:
+        if hasattr(user, 'coordinator_profile') and user.coordinator_profile.college:
+            return queryset.filter(student__student_profile__college=user.coordinator_profile.college)
+        return queryset.none()
+    if role == UserRole.SUPERVISOR:
+        if hasattr(user, 'company_user_profile'):
+            return queryset.filter(internship__company=user.company_user_profile.company)
+        return queryset.none()
+    return queryset.none()
+
+
+def bulk_transition_applications(user, application_ids, new_status, feedback=''):
+    """
+    Move many applications to new_status in one transaction.
+
+    Returns (results, updated_count); results holds one dict per requested id with
+    'result' set to 'updated', 'unchanged', 'rejected' (approving another of the
+    student's applications rejected it) or 'error'. Every application that is
+    rejected automatically gets its own notification and email.
+    """
+    if new_status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status '{new_status}'")
+
+    requested_ids = []
+    for app_id in application_ids:
+        try:
+            app_id = int(app_id)
+        except (TypeError, ValueError):
+            continue
+        if app_id not in requested_ids:
+            requested_ids.append(app_id)
+
+    results = {app_id: {'id': app_id, 'result': 'error', 'error': 'Application not found'} for app_id in requested_ids}
+
+    with transaction.atomic():
+        applications = list(
+            scope_applications(user, Application.objects.filter(id__in=requested_ids))
+            .select_related('student', 'internship', 'internship__company')
+            .select_for_update()
+        )
+        # Process in the order the client sent, so earlier ids win contested slots
+        position = {app_id: index for index, app_id in enumerate(requested_ids)}
+        applications.sort(key=lambda application: position[application.id])
+
+        to_update = []
+        for application in applications:
+            if application.status == new_status:
+                results[application.id] = {
+                    'id': application.id,
+                    'result': 'unchanged',
+                    'status': application.status,
+                }
+            else:
+                to_update.append(application)
+
+        if new_status == 'Approved':
+            to_update = _check_approvals(to_update, results)
+
+        if not to_update:
+            return [results[app_id] for app_id in requested_ids], 0
+
+        update_ids = [application.id for application in to_update]
+        fields = {'status': new_status}
+        now = timezone.now()
+        if new_status == 'Completed':
+            fields['completed_at'] = now
+        elif new_status == 'Terminated':
+            fields['terminated_at'] = now
+        if feedback:
+            fields['feedback'] = feedback
+        Application.objects.filter(id__in=update_ids).update(**fields)
+
+        auto_rejected = []
+        if new_status == 'Approved':
+            # A student can only hold one internship; reject their other pending applications
+            auto_rejected = list(
+                Application.objects.filter(
+                    student_id__in=[application.student_id for application in to_update],
+                    status='Pending'
+                ).exclude(id__in=update_ids)
+                .select_related('student', 'internship', 'internship__company')
+                .select_for_update()
+            )
+            Application.objects.filter(id__in=[application.id for application in auto_rejected]).update(status='Rejected')
+
+        for application in to_update:
+            results[application.id] = {
+                'id': application.id,
+                'result': 'updated',
+                'old_status': application.status,
+                'status': new_status,
+            }
+            application.status = new_status
+
+        for application in auto_rejected:
+            if application.id in results:
+                # Requested in the same batch as the student's approved application
+                results[application.id] = {
+                    'id': application.id,
+                    'result': 'rejected',
+                    'old_status': application.status,
+                    'status': 'Rejected',
+                    'error': 'Student was approved for another internship',
+                }
+            application.status = 'Rejected'
+
+        _queue_side_effects(to_update, new_status)
+        if auto_rejected:
+            _queue_side_effects(auto_rejected, 'Rejected')
+
+    return [results[app_id] for app_id in requested_ids], len(to_update)
+
+
+def _check_approvals(candidates, results):
+    """Enforce one approved internship per student and decrement slots with F() expressions"""
+    student_ids = {application.student_id for application in candidates}
+    already_approved = set(
+        Application.objects.filter(student_id__in=student_ids, status='Approved')
+        .values_list('student_id', flat=True)
+    )
+
+    approved = []
+    seen_students = set()
+    for application in candidates:
+        if application.student_id in already_approved or application.student_id in seen_students:
+            results[application.id] = {
+                'id': application.id,
+                'result': 'error',
+                'error': 'Student already has an approved internship',
+            }
+            continue
+        seen_students.add(application.student_id)
+        approved.append(application)
+
+    # Grant slots per internship in request order, then take them in one UPDATE each
+    available = {
+        internship_id: slots
+        for internship_id, slots in Internship.objects.select_for_update().filter(
+            id__in={application.internship_id for application in approved}
+        ).values_list('id', 'slots')
+    }
+    granted = []
+    for application in approved:
+        if available.get(application.internship_id, 0) > 0:
+            available[application.internship_id] -= 1
+            granted.append(application)
+        else:
+            results[application.id] = {
+                'id': application.id,
+                'result': 'error',
+                'error': 'No slots available for this internship',
+            }
+
+    for internship_id, count in Counter(application.internship_id for application in granted).items():
+        Internship.objects.filter(id=internship_id, slots__gte=count).update(slots=F('slots') - count)
+
+    return granted
+
+
+def _queue_side_effects(applications, new_status):
+    from .email_notifications import send_application_status_emails
+
+    notification_utils.create_notifications(
+        Notification(
+            user_id=application.student_id,
+            title='Application Status Updated',
+            message=f'Your application for {application.internship.position} at {application.internship.company.name} is now {new_status}.',
+            notification_type='application',
+            related_id=application.id,
+        )
+        for application in applications
+    )
+
+    # Emails are rendered in one pass and inserted into the outbox after commit
+    transaction.on_commit(lambda: send_application_status_emails(applications, new_status))
@@ -0,0 +1,127 @@
+"""
+Authentication classes for the EARIST OJT System
+Loads the user together with their role and profile rows in one select_related
+query, so role checks and hasattr(user, '..._profile') never hit the database.
+Resolved tokens are also kept in the shared cache for a short time; signals in
+signals.py drop them when the user, role or a profile changes. Without a shared
+cache (REDIS_URL) that drop would only reach one worker, so caching is off.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# One-to-one relations views read off request.user
+USER_CONTEXT_RELATIONS = (
+    'user_role',
+    'student_profile',
+    'coordinator_profile',
+    'supervisor_profile',
+    'company_user_profile',
+    'company_user_profile__company',
+)
+
+# Large columns nobody needs for permission checks
+USER_CONTEXT_DEFERRED = (
+    'student_profile__qr_code_image',
+)
+
+
+def token_queryset():
+    """Tokens with the user, role and profiles joined in"""
+    return Token.objects.select_related(
+        'user', *[f'user__{relation}' for relation in USER_CONTEXT_RELATIONS]
+    ).defer(*[f'user__{field}' for field in USER_CONTEXT_DEFERRED])
+
+
+class UserContextTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that loads the whole user context in the token query.
+    DRF memoizes the authenticated user on the request, so every later role or
+    profile check during the request is free.
+    """
+
+    def authenticate_credentials(self, key):
+        try:
+            token = token_queryset().get(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
+
+
+def get_token_cache_ttl():
+    """
+    Seconds a resolved token stays cached; 0 disables the cache. Always 0 on a
+    per-process cache, where logout or a role change in one worker would leave
+    the others accepting the old token.
+    """
+    from .shared_cache import is_shared
+
+    if not is_shared():
+        return 0
+    return getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+
+
+def _token_key(key):
+    # Never put raw tokens in cache keys
+    return f"auth_token_{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def _user_token_key(user_id):
+    return f"auth_token_user_{user_id}"
+
+
+def invalidate_token(key):
+    """Forget a cached token (e.g. after logout deletes it)"""
+    cache.delete(_token_key(key))
+
+
+def invalidate_user_tokens(user_id):
+    """Forget the cached token of user_id so the next request reloads the user"""
+    key = cache.get(_user_token_key(user_id))
+    if key:
+        cache.delete_many([_token_key(key), _user_token_key(user_id)])
+
+
+def invalidate_users_tokens(user_ids):
+    """
+    Forget the cached tokens of many users at once. Call it after any
+    queryset.update() on users, roles or profiles, since update() skips the
+    signals that normally do this.
+    """
+    user_keys = [_user_token_key(user_id) for user_id in user_ids]
+    if not user_keys:
+        return
+    keys = cache.get_many(user_keys)
+    cache.delete_many(user_keys + [_token_key(key) for key in keys.values()])
+
+
+class CachedTokenAuthentication(UserContextTokenAuthentication):
+    """
+    UserContextTokenAuthentication with the resolved (user, token) pair kept in
+    the shared cache, so repeated API calls from one page skip the database.
+    """
+
+    def authenticate_credentials(self, key):
+        ttl = get_token_cache_ttl()
+        if not ttl:
+            return super().authenticate_credentials(key)
+
+        cached = cache.get(_token_key(key))
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        cache.set_many({
+            _token_key(key): (user, token),
+            _user_token_key(user.pk): key,
+        }, ttl)
+        return (user, token)
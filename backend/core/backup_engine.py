@@ -0,0 +1,480 @@
+"""
+Backup engine for the EARIST OJT System
+Plain-Python helpers (no Django imports) shared by backup_system.py,
+restore_system.py and the admin backup views.
+
+Database backups use the sqlite3 online backup API: pages are copied in small
+steps with a pause between them, so the live site keeps writing while the
+backup runs, and the copy is checked with PRAGMA integrity_check before it is
+gzipped to disk. Media backups are incremental: see the section at the end.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Pages copied per step of the online backup; with the default 4 KB page size
+# this is about 1 MB per step
+BACKUP_STEP_PAGES = 256
+# Pause between steps so writers can take the lock
+BACKUP_STEP_SLEEP = 0.005
+# A write from another connection restarts a stepped backup; after this many
+# restarts the copy is finished in one pass instead
+MAX_BACKUP_RESTARTS = 5
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Matches both plain (.sqlite3) and compressed (.sqlite3.gz) database backups
+DB_BACKUP_GLOB = 'db_backup_*.sqlite3*'
+TIMESTAMP_PATTERN = re.compile(r'(\d{8}_\d{6})')
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be created or fails verification"""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def backup_timestamp(filename):
+    """The YYYYmmdd_HHMMSS stamp in a backup file name, or None"""
+    match = TIMESTAMP_PATTERN.search(os.path.basename(str(filename)))
+    return match.group(1) if match else None
+
+
+def _readonly_uri(path):
+    return Path(path).resolve().as_uri() + '?mode=ro'
+
+
+def online_sqlite_backup(source_path, dest_path, compress=True,
+                         step_pages=BACKUP_STEP_PAGES, step_sleep=BACKUP_STEP_SLEEP):
+    """
+    Copy a live SQLite database to dest_path without blocking writers.
+
+    When compress is True dest_path should end in .gz; the verified copy is
+    streamed through gzip and the uncompressed temp file removed.
+    Returns a dict with path, size, pages, restarts and seconds.
+    """
+    started = time.monotonic()
+    dest_path = str(dest_path)
+    temp_path = dest_path[:-3] if compress and dest_path.endswith('.gz') else dest_path
+    temp_path += '.partial'
+
+    progress = {'pages': 0, 'remaining': None, 'restarts': 0}
+
+    def on_step(status, remaining, total):
+        progress['pages'] = total
+        if progress['remaining'] is not None and remaining > progress['remaining']:
+            # Another connection wrote to the database and SQLite started over
+            progress['restarts'] += 1
+            if progress['restarts'] > MAX_BACKUP_RESTARTS:
+                raise _TooManyRestarts()
+        progress['remaining'] = remaining
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    source = sqlite3.connect(_readonly_uri(source_path), uri=True)
+    target = sqlite3.connect(temp_path)
+    try:
+        try:
+            source.backup(target, pages=step_pages, progress=on_step)
+        except _TooManyRestarts:
+            # Busy database: copy everything in one step (a short read lock)
+            source.backup(target, pages=-1)
+        result = target.execute('PRAGMA integrity_check').fetchone()[0]
+        if result != 'ok':
+            raise BackupError(f'Integrity check failed: {result}')
+    except Exception:
+        target.close()
+        _remove_quietly(temp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    try:
+        if compress:
+            with open(temp_path, 'rb') as raw, gzip.open(dest_path, 'wb', compresslevel=6) as packed:
+                shutil.copyfileobj(raw, packed, COPY_CHUNK_SIZE)
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, dest_path)
+    except Exception:
+        _remove_quietly(temp_path)
+        _remove_quietly(dest_path)
+        raise
+
+    return {
+        'path': dest_path,
+        'size': os.path.getsize(dest_path),
+        'pages': progress['pages'],
+        'restarts': progress['restarts'],
+        'seconds': round(time.monotonic() - started, 2),
+    }
+
+
+def restore_sqlite_backup(backup_path, database_path):
+    """
+    Restore a (possibly gzipped) database backup over database_path.
+    The backup is verified first, then copied in with the backup API so
+    open connections see a consistent database.
+    """
+    backup_path = str(backup_path)
+    source_path = backup_path
+    if backup_path.endswith('.gz'):
+        source_path = str(database_path) + '.restore'
+        with gzip.open(backup_path, 'rb') as packed, open(source_path, 'wb') as raw:
+            shutil.copyfileobj(packed, raw, COPY_CHUNK_SIZE)
+
+    try:
+        source = sqlite3.connect(_readonly_uri(source_path), uri=True)
+        try:
+            result = source.execute('PRAGMA integrity_check').fetchone()[0]
+            if result != 'ok':
+                raise BackupError(f'Backup failed integrity check: {result}')
+            target = sqlite3.connect(str(database_path))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    finally:
+        if source_path != backup_path:
+            _remove_quietly(source_path)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ========== INCREMENTAL MEDIA BACKUPS ==========
+#
+# Each media backup writes media_manifest_<ts>.json listing every file with its
+# size, mtime, SHA-256 and the archive volume holding its bytes. Only new or
+# changed files are copied into that run's volumes
+# (media_backup_<ts>_partNNN.zip); unchanged files keep pointing at the volume
+# of an earlier run. Any manifest is therefore a complete point-in-time
+# snapshot that can be restored on its own. Volumes are written in parallel
+# by a process pool, and already-compressed formats are stored, not deflated.
+
+MEDIA_MANIFEST_GLOB = 'media_manifest_*.json'
+MEDIA_ARCHIVE_GLOB = 'media_backup_*.zip'
+MANIFEST_VERSION = 1
+# Start a new full (base) backup after this many incremental runs
+MEDIA_FULL_EVERY = 7
+# Roll over to a new archive volume after about this many bytes of input
+MEDIA_VOLUME_SIZE = 256 * 1024 * 1024
+# Regenerated on demand or temporary, so not worth backing up
+MEDIA_BACKUP_EXCLUDE = ('derivatives', 'blobs/tmp')
+# Volumes are compressed in parallel, one per worker process; small backups
+# are not split below this size since starting workers costs more than it saves
+MEDIA_BACKUP_WORKERS = min(os.cpu_count() or 1, 4)
+MIN_VOLUME_SIZE = 16 * 1024 * 1024
+# Already-compressed formats are stored as-is: deflating them burns CPU for a
+# percent or two at best
+STORED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods',
+    '.zip', '.gz', '.rar', '.7z',
+    '.mp3', '.m4a', '.mp4', '.mov', '.webm',
+}
+
+
+def scan_media(media_dir, exclude=MEDIA_BACKUP_EXCLUDE):
+    """{relative path: (size, mtime_ns)} for every file under media_dir, one stat per file"""
+    media_dir = os.path.normpath(str(media_dir))
+    skip = {os.path.normpath(os.path.join(media_dir, path)) for path in exclude}
+    files = {}
+    pending = [media_dir]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in skip:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat_result = entry.stat(follow_symlinks=False)
+                    relative = os.path.relpath(entry.path, media_dir).replace(os.sep, '/')
+                    files[relative] = (stat_result.st_size, stat_result.st_mtime_ns)
+    return files
+
+
+def compress_type_for(name):
+    """ZIP_STORED for formats that are already compressed, ZIP_DEFLATED otherwise"""
+    ext = os.path.splitext(name)[1].lower()
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def phase_stats(seconds, size=None, **extra):
+    """Timing for one backup phase, with MB/s when a byte count is given"""
+    stats = {'seconds': round(seconds, 2)}
+    if size is not None:
+        stats['bytes'] = size
+        stats['mb_per_s'] = round(size / (1024 * 1024) / seconds, 2) if seconds > 0 else None
+    stats.update(extra)
+    return stats
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def media_manifest_path(backup_dir, timestamp):
+    return Path(backup_dir) / f'media_manifest_{timestamp}.json'
+
+
+def media_backup_files(backup_dir, timestamp):
+    """Archive volumes written by the media backup at timestamp, including old single-zip backups"""
+    backup_dir = Path(backup_dir)
+    legacy = backup_dir / f'media_backup_{timestamp}.zip'
+    parts = sorted(backup_dir.glob(f'media_backup_{timestamp}_part*.zip'))
+    return ([legacy] if legacy.exists() else []) + parts
+
+
+def latest_media_manifest(backup_dir):
+    manifests = sorted(Path(backup_dir).glob(MEDIA_MANIFEST_GLOB), key=lambda path: backup_timestamp(path.name) or '')
+    return manifests[-1] if manifests else None
+
+
+def load_media_manifest(path):
+    with open(path, 'r') as handle:
+        return json.load(handle)
+
+
+def referenced_media_archives(manifest_paths):
+    """Names of every archive volume the given manifests still need"""
+    names = set()
+    for path in manifest_paths:
+        try:
+            manifest = load_media_manifest(path)
+        except (OSError, ValueError):
+            continue
+        names.update(entry['archive'] for entry in manifest['files'].values())
+    return names
+
+
+def _add_member(volume, path, member):
+    """Copy path into an open zip; returns (bytes, sha256) of exactly what was archived"""
+    info = zipfile.ZipInfo.from_file(path, member)
+    info.compress_type = compress_type_for(member)
+    digest = hashlib.sha256()
+    written = 0
+    with open(path, 'rb') as source, volume.open(info, 'w', force_zip64=True) as target:
+        for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            target.write(chunk)
+            written += len(chunk)
+    return written, digest.hexdigest()
+
+
+def _write_volume(volume_path, members):
+    """
+    Write one archive volume from [(path, member)]. Runs in a worker process, so
+    each volume is compressed on its own core.
+    """
+    results = []
+    with zipfile.ZipFile(volume_path, 'w') as volume:
+        for path, member in members:
+            try:
+                written, sha256 = _add_member(volume, path, member)
+            except FileNotFoundError:
+                # Deleted since the scan
+                continue
+            results.append((member, written, sha256))
+    return results
+
+
+def _plan_volumes(items, volume_size, workers):
+    """Split [(path, member, size)] into volumes, enough of them to keep every worker busy"""
+    total = sum(size for _, _, size in items)
+    target = min(volume_size, max(total // workers + 1, MIN_VOLUME_SIZE))
+    volumes = []
+    current, current_size = [], 0
+    for path, member, size in items:
+        if current and current_size + size > target:
+            volumes.append(current)
+            current, current_size = [], 0
+        current.append((path, member))
+        current_size += size
+    if current:
+        volumes.append(current)
+    return volumes
+
+
+def write_volumes(backup_dir, timestamp, items, workers=MEDIA_BACKUP_WORKERS, volume_size=MEDIA_VOLUME_SIZE):
+    """
+    Archive [(path, member, size)] into media_backup_<ts>_partNNN.zip volumes,
+    in a process pool when there is more than one volume.
+
+    Returns (volume names, {member: (volume name, bytes, sha256)}).
+    """
+    volumes = _plan_volumes(items, volume_size, max(workers, 1))
+    names = [f'media_backup_{timestamp}_part{number:03d}.zip' for number in range(1, len(volumes) + 1)]
+    paths = [os.path.join(str(backup_dir), name) for name in names]
+    try:
+        if workers > 1 and len(volumes) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(volumes))) as pool:
+                outputs = list(pool.map(_write_volume, paths, volumes))
+        else:
+            outputs = [_write_volume(path, members) for path, members in zip(paths, volumes)]
+    except BaseException:
+        for path in paths:
+            _remove_quietly(path)
+        raise
+
+    archived = {}
+    for name, results in zip(names, outputs):
+        for member, written, sha256 in results:
+            archived[member] = (name, written, sha256)
+    return names, archived
+
+
+def _previous_manifest(backup_dir):
+    """The manifest to build on, or None when this run should be a full backup"""
+    latest = latest_media_manifest(backup_dir)
+    if latest is None:
+        return None
+    try:
+        manifest = load_media_manifest(latest)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or manifest['sequence'] + 1 >= MEDIA_FULL_EVERY:
+        return None
+    needed = referenced_media_archives([latest])
+    if any(not os.path.exists(os.path.join(str(backup_dir), name)) for name in needed):
+        # A volume was deleted or lost; don't build on a broken chain
+        return None
+    return manifest
+
+
+def backup_media_incremental(media_dir, backup_dir, timestamp, scan=None, full=False,
+                             workers=MEDIA_BACKUP_WORKERS, volume_size=MEDIA_VOLUME_SIZE):
+    """
+    Back up media_dir into backup_dir, copying only files that are new or changed
+    since the latest manifest. A file whose mtime changed but whose size and hash
+    did not is not copied again. Pass full=True to start a new base backup.
+
+    Returns a dict with manifest, kind, archives, size, new, changed, unchanged,
+    removed, seconds and phases (timings and throughput of each step).
+    """
+    started = time.monotonic()
+    media_dir = str(media_dir)
+    phases = {}
+    previous = None if full else _previous_manifest(backup_dir)
+    old_files = previous['files'] if previous else {}
+
+    if scan is None:
+        phase_started = time.monotonic()
+        scan = scan_media(media_dir)
+        phases['scan'] = phase_stats(time.monotonic() - phase_started, files=len(scan))
+
+    # Decide what to copy; only touched files with an unchanged size get re-hashed
+    phase_started = time.monotonic()
+    files = {}
+    to_copy = []
+    hashed_bytes = 0
+    for relative, (size, mtime_ns) in sorted(scan.items()):
+        path = os.path.join(media_dir, *relative.split('/'))
+        old = old_files.get(relative)
+        if old and old['size'] == size:
+            if old['mtime_ns'] != mtime_ns:
+                hashed_bytes += size
+            if old['mtime_ns'] == mtime_ns or file_sha256(path) == old['sha256']:
+                files[relative] = dict(old, mtime_ns=mtime_ns)
+                continue
+        to_copy.append((path, relative, size))
+    phases['check'] = phase_stats(time.monotonic() - phase_started, hashed_bytes, files=len(scan))
+    unchanged = len(files)
+
+    phase_started = time.monotonic()
+    archives, archived = write_volumes(backup_dir, timestamp, to_copy, workers, volume_size)
+    stored = sum(1 for _, member, _ in to_copy if compress_type_for(member) == zipfile.ZIP_STORED)
+    phases['write'] = phase_stats(
+        time.monotonic() - phase_started, sum(written for _, written, _ in archived.values()),
+        files=len(archived), volumes=len(archives), stored=stored, deflated=len(to_copy) - stored,
+    )
+
+    counts = {'new': 0, 'changed': 0}
+    mtimes = {relative: mtime_ns for relative, (_, mtime_ns) in scan.items()}
+    for relative, (archive, written, sha256) in archived.items():
+        files[relative] = {'size': written, 'mtime_ns': mtimes[relative], 'sha256': sha256, 'archive': archive}
+        counts['changed' if relative in old_files else 'new'] += 1
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'timestamp': timestamp,
+        'kind': 'incremental' if previous else 'full',
+        'base': previous['base'] if previous else timestamp,
+        'sequence': previous['sequence'] + 1 if previous else 0,
+        'archives': archives,
+        'files': dict(sorted(files.items())),
+    }
+    manifest_path = media_manifest_path(backup_dir, timestamp)
+    temp_path = str(manifest_path) + '.partial'
+    with open(temp_path, 'w') as handle:
+        json.dump(manifest, handle, separators=(',', ':'))
+    os.replace(temp_path, manifest_path)
+
+    return {
+        'manifest': str(manifest_path),
+        'kind': manifest['kind'],
+        'archives': archives,
+        'size': sum(os.path.getsize(os.path.join(str(backup_dir), name)) for name in archives),
+        'unchanged': unchanged,
+        'removed': len(old_files.keys() - files.keys()),
+        'seconds': round(time.monotonic() - started, 2),
+        'phases': phases,
+        **counts,
+    }
+
+
+def restore_media_snapshot(manifest_path, backup_dir, target_dir):
+    """
+    Rebuild the media folder exactly as it was when manifest_path was written,
+    reading each file from whichever volume holds it. Every file is checked
+    against its SHA-256 and gets its original mtime back, so the next
+    incremental backup sees it as unchanged. Returns the number of files.
+    """
+    manifest = load_media_manifest(manifest_path)
+    by_archive = {}
+    for relative, entry in manifest['files'].items():
+        if relative.startswith('/') or '..' in relative.split('/'):
+            raise BackupError(f'Unsafe path in manifest: {relative}')
+        by_archive.setdefault(entry['archive'], []).append((relative, entry))
+
+    for archive, entries in sorted(by_archive.items()):
+        archive_path = os.path.join(str(backup_dir), archive)
+        if not os.path.exists(archive_path):
+            raise BackupError(f'Missing archive volume: {archive}')
+        with zipfile.ZipFile(archive_path, 'r') as volume:
+            for relative, entry in entries:
+                target = os.path.join(str(target_dir), *relative.split('/'))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                digest = hashlib.sha256()
+                with volume.open(relative) as source, open(target, 'wb') as output:
+                    for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        output.write(chunk)
+                if digest.hexdigest() != entry['sha256']:
+                    raise BackupError(f'Checksum mismatch for {relative} in {archive}')
+                os.utime(target, ns=(entry['mtime_ns'], entry['mtime_ns']))
+    return len(manifest['files'])
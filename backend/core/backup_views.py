@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from .backup_engine import backup_timestamp, DB_BACKUP_GLOB, media_manifest_path, media_backup_files
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_backup_status(request):
@@ -41,7 +43,7 @@ def get_backup_status(request):
         })
     
     # Find all database backups
-    db_backups = sorted(BACKUP_DIR.glob("db_backup_*.sqlite3"), reverse=True)
+    db_backups = sorted(BACKUP_DIR.glob(DB_BACKUP_GLOB), reverse=True)
     
     if not db_backups:
         return Response({
@@ -59,7 +61,7 @@ def get_backup_status(request):
     
     # Extract timestamp from filename
     try:
-        timestamp_str = latest_backup.stem.replace("db_backup_", "")
+        timestamp_str = backup_timestamp(latest_backup.name)
         latest_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
     except:
         latest_date = datetime.fromtimestamp(latest_backup.stat().st_mtime)
@@ -81,7 +83,8 @@ def get_backup_status(request):
         health_message = "Backup is very old - automatic backups may not be running!"
     
     # Get corresponding files
-    media_file = BACKUP_DIR / f"media_backup_{timestamp_str}.zip"
+    media_files = media_backup_files(BACKUP_DIR, timestamp_str)
+    has_media = media_manifest_path(BACKUP_DIR, timestamp_str).exists() or bool(media_files)
     env_file = BACKUP_DIR / f"env_backup_{timestamp_str}.txt"
     info_file = BACKUP_DIR / f"backup_info_{timestamp_str}.json"
     
@@ -96,7 +99,7 @@ def get_backup_status(request):
     
     # Calculate sizes
     db_size_mb = latest_backup.stat().st_size / (1024 * 1024)
-    media_size_mb = media_file.stat().st_size / (1024 * 1024) if media_file.exists() else 0
+    media_size_mb = sum(f.stat().st_size for f in media_files) / (1024 * 1024)
     
     # Calculate total backup directory size
     total_size = sum(f.stat().st_size for f in BACKUP_DIR.iterdir() if f.is_file())
@@ -108,7 +111,7 @@ def get_backup_status(request):
     
     for db_backup in db_backups:
         try:
-            timestamp_str = db_backup.stem.replace("db_backup_", "")
+            timestamp_str = backup_timestamp(db_backup.name)
             backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
             day_key = backup_date.strftime("%Y-%m-%d")
             
@@ -158,9 +161,10 @@ def get_backup_status(request):
             "age_days": age.days,
             "db_size_mb": round(db_size_mb, 2),
             "media_size_mb": round(media_size_mb, 2),
-            "has_media": media_file.exists(),
+            "has_media": has_media,
             "has_env": env_file.exists(),
-            "files_backed_up": metadata.get("files_backed_up", "Unknown")
+            "files_backed_up": metadata.get("files_backed_up", "Unknown"),
+            "phases": metadata.get("phases", {})
         },
         "backup_count": len(db_backups),
         "total_size_mb": round(total_size_mb, 2),
@@ -175,7 +179,7 @@ def get_backup_status(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def trigger_manual_backup(request):
-    """Trigger a manual backup"""
+    """Trigger a manual backup (backup_system.py: parallel media volumes, per-phase timings)"""
     
     # Only admins can trigger backups
     if not request.user.is_staff:
@@ -190,6 +194,7 @@ def trigger_manual_backup(request):
     # Get project root directory
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
     backup_script = BASE_DIR / "backup_system.py"
+    BACKUP_DIR = BASE_DIR / "backups"
     
     if not backup_script.exists():
         return Response({
@@ -208,10 +213,20 @@ def trigger_manual_backup(request):
         )
         
         if result.returncode == 0:
+            # Phase timings saved by this run, so the dashboard can show where the time went
+            phases = {}
+            info_files = sorted(BACKUP_DIR.glob("backup_info_*.json"), key=lambda f: backup_timestamp(f.name) or "")
+            if info_files:
+                try:
+                    with open(info_files[-1], 'r') as f:
+                        phases = json.load(f).get("phases", {})
+                except (OSError, ValueError):
+                    pass
             return Response({
                 "success": True,
                 "message": "Backup completed successfully",
-                "output": result.stdout
+                "output": result.stdout,
+                "phases": phases
             })
         else:
             return Response({
@@ -0,0 +1,203 @@
+"""
+Bulk grade computation for the EARIST OJT System
+Loads approved hours, average evaluation scores and approved required documents
+for a whole set of students with grouped queries, computes every score and grade
+bracket at once with NumPy, and upserts StudentFinalGrade in one statement.
+compute_student_grade uses the same engine for a single student.
+"""
+from decimal import Decimal
+
+import numpy as np
+from django.db.models import Avg, Sum
+
+from .required_hours import required_hours_for, DEFAULT_REQUIRED_HOURS
+
+# Default weights when no GradingCriteria are configured
+DEFAULT_WEIGHTS = {'attendance': 30.0, 'supervisor': 50.0, 'requirements': 20.0}
+
+# Lower bound of each final-score bracket and its grade; anything below 75 is a 5.00
+GRADE_BRACKETS = [
+    (98, 1.00), (95, 1.25), (92, 1.50), (89, 1.75), (86, 2.00),
+    (83, 2.25), (80, 2.50), (77, 2.75), (75, 3.00),
+]
+FAILING_GRADE = 5.00
+PASSING_GRADE_LIMIT = 3.0
+
+GRADE_FIELDS = ['attendance_score', 'supervisor_rating_score', 'requirements_score', 'final_grade', 'remarks']
+
+
+def criteria_weights():
+    """Percentage weight of each component, from GradingCriteria names"""
+    from .models import GradingCriteria
+
+    criteria = list(GradingCriteria.objects.values_list('name', 'weight'))
+    if not criteria:
+        return dict(DEFAULT_WEIGHTS)
+
+    weights = {'attendance': 0.0, 'supervisor': 0.0, 'requirements': 0.0}
+    for name, weight in criteria:
+        if 'Attendance' in name:
+            weights['attendance'] += float(weight)
+        elif 'Supervisor' in name or 'Evaluation' in name:
+            weights['supervisor'] += float(weight)
+        elif 'Requirement' in name or 'Document' in name:
+            weights['requirements'] += float(weight)
+    return weights
+
+
+def load_inputs(student_ids):
+    """
+    Per-student inputs as arrays aligned with student_ids: approved journal
+    hours, required hours, average evaluation total_score (0-100) and how many
+    of their college's required pre-training documents (core.compliance) they
+    have, out of how many are required.
+    """
+    from django.contrib.auth.models import User
+    from .compliance import approved_docs, required_docs_for
+    from .models import HoursLedger, PerformanceEvaluation
+
+    hours = dict(
+        HoursLedger.objects.filter(student_id__in=student_ids).order_by()
+        .values('student_id').annotate(total=Sum('journal_approved_hours')).values_list('student_id', 'total')
+    )
+    ratings = dict(
+        PerformanceEvaluation.objects.filter(student_id__in=student_ids).order_by()
+        .values('student_id').annotate(average=Avg('total_score')).values_list('student_id', 'average')
+    )
+    profiles = {
+        row['id']: row
+        for row in User.objects.filter(id__in=student_ids)
+        .values('id', 'username', 'student_profile__college', 'student_profile__course')
+    }
+
+    # One approved-documents query per college, against that college's required list
+    by_college = {}
+    for student_id in student_ids:
+        by_college.setdefault(profiles.get(student_id, {}).get('student_profile__college'), []).append(student_id)
+    requirements = {}
+    for college, college_students in by_college.items():
+        required_docs = required_docs_for(college)
+        for student_id, approved in approved_docs(college_students, required_docs).items():
+            requirements[student_id] = (len(approved), len(required_docs))
+
+    required = []
+    for student_id in student_ids:
+        profile = profiles.get(student_id, {})
+        configured = required_hours_for(profile.get('student_profile__college'), profile.get('student_profile__course'))
+        required.append(DEFAULT_REQUIRED_HOURS if configured is None else configured)
+
+    return {
+        'usernames': [profiles.get(student_id, {}).get('username', '') for student_id in student_ids],
+        'hours': np.array([float(hours.get(student_id) or 0) for student_id in student_ids]),
+        'required': np.array(required, dtype=float),
+        'rating': np.array([float(ratings.get(student_id) or 0) for student_id in student_ids]),
+        'requirements_approved': np.array([requirements[student_id][0] for student_id in student_ids], dtype=float),
+        'requirements_required': np.array([requirements[student_id][1] for student_id in student_ids], dtype=float),
+    }
+
+
+def compute_scores(inputs, weights):
+    """Component percentages, final score and grade for every student at once"""
+    attendance = np.minimum(
+        np.divide(inputs['hours'] * 100, inputs['required'], out=np.zeros_like(inputs['hours']), where=inputs['required'] > 0),
+        100,
+    )
+    supervisor = np.clip(inputs['rating'], 0, 100)
+    # Nothing required (no college, or none configured) counts as complete
+    requirements = np.divide(
+        inputs['requirements_approved'] * 100, inputs['requirements_required'],
+        out=np.full_like(inputs['requirements_approved'], 100), where=inputs['requirements_required'] > 0,
+    )
+    final_score = (
+        attendance * weights['attendance'] + supervisor * weights['supervisor'] + requirements * weights['requirements']
+    ) / 100
+
+    grade = np.select(
+        [final_score >= threshold for threshold, _ in GRADE_BRACKETS],
+        [value for _, value in GRADE_BRACKETS],
+        default=FAILING_GRADE,
+    )
+    return {
+        'attendance_score': np.round(attendance, 2),
+        'supervisor_rating_score': np.round(supervisor, 2),
+        'requirements_score': np.round(requirements, 2),
+        'final_score': np.round(final_score, 2),
+        'final_grade': grade,
+    }
+
+
+def _as_row(scores, index):
+    grade = float(scores['final_grade'][index])
+    return {
+        'attendance_score': Decimal(f"{scores['attendance_score'][index]:.2f}"),
+        'supervisor_rating_score': Decimal(f"{scores['supervisor_rating_score'][index]:.2f}"),
+        'requirements_score': Decimal(f"{scores['requirements_score'][index]:.2f}"),
+        'final_grade': Decimal(f"{grade:.2f}"),
+        'remarks': 'Passed' if grade <= PASSING_GRADE_LIMIT else 'Failed',
+    }
+
+
+def grade_students(student_ids, dry_run=False):
+    """
+    Grade every student in student_ids. With dry_run nothing is written and the
+    result only describes what would change.
+
+    Returns {'graded', 'created', 'updated', 'unchanged', 'dry_run', 'changes'}
+    where changes lists {student_id, username, final_score, before, after} for
+    each student whose stored grade would be added or modified.
+    """
+    from .models import StudentFinalGrade
+
+    student_ids = list(student_ids)
+    if not student_ids:
+        return {'graded': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'dry_run': dry_run, 'changes': []}
+
+    inputs = load_inputs(student_ids)
+    scores = compute_scores(inputs, criteria_weights())
+    existing = {
+        row['student_id']: row
+        for row in StudentFinalGrade.objects.filter(student_id__in=student_ids).values('student_id', *GRADE_FIELDS)
+    }
+
+    changes = []
+    to_write = []
+    for index, student_id in enumerate(student_ids):
+        after = _as_row(scores, index)
+        before = existing.get(student_id)
+        if before is not None:
+            before = {field: before[field] for field in GRADE_FIELDS}
+            if before == after:
+                continue
+        changes.append({
+            'student_id': student_id,
+            'username': inputs['usernames'][index],
+            'final_score': float(scores['final_score'][index]),
+            'before': _serialize(before),
+            'after': _serialize(after),
+        })
+        to_write.append(StudentFinalGrade(student_id=student_id, **after))
+
+    if to_write and not dry_run:
+        StudentFinalGrade.objects.bulk_create(
+            to_write,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['student'],
+            update_fields=GRADE_FIELDS + ['computed_at'],
+        )
+
+    created = sum(1 for change in changes if change['before'] is None)
+    return {
+        'graded': len(student_ids),
+        'created': created,
+        'updated': len(changes) - created,
+        'unchanged': len(student_ids) - len(changes),
+        'dry_run': dry_run,
+        'changes': changes,
+    }
+
+
+def _serialize(row):
+    if row is None:
+        return None
+    return {field: float(value) if isinstance(value, Decimal) else value for field, value in row.items()}
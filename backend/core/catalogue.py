@@ -0,0 +1,112 @@
+"""
+Internship catalogue for the EARIST OJT System
+Filters internships by full-text match (core.search), company, location,
+position type, required course, target college and open slots, and counts
+each facet with one indexed GROUP BY query. Required courses and target
+colleges are split into InternshipTag rows, kept current by signals.
+"""
+from django.db.models import Count
+
+
+def _split_codes(raw):
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    return {str(code).strip().upper()[:100] for code in raw or [] if str(code).strip()}
+
+
+def sync_tags(internship_ids=None, apps=None):
+    """
+    Rebuild InternshipTag rows for the given internships (all when None).
+    Pass the migration `apps` registry when running from a migration.
+    """
+    if apps is None:
+        from django.apps import apps
+    Internship = apps.get_model('core', 'Internship')
+    InternshipTag = apps.get_model('core', 'InternshipTag')
+
+    internships = Internship.objects.all()
+    tags = InternshipTag.objects.all()
+    if internship_ids is not None:
+        internships = internships.filter(id__in=internship_ids)
+        tags = tags.filter(internship_id__in=internship_ids)
+
+    rows = []
+    for internship_id, courses, colleges in internships.values_list('id', 'required_courses', 'company__target_colleges'):
+        rows.extend(InternshipTag(internship_id=internship_id, kind='course', value=value) for value in _split_codes(courses))
+        rows.extend(InternshipTag(internship_id=internship_id, kind='college', value=value) for value in _split_codes(colleges))
+
+    tags.delete()
+    InternshipTag.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def open_internships(queryset):
+    """
+    Internships a student can still apply to. Internship.slots is the number of
+    places left (approving an application decrements it), so approved
+    applications must not be subtracted again.
+    """
+    return queryset.filter(slots__gt=0)
+
+
+def _tagged(kind, value):
+    from .models import InternshipTag
+    return InternshipTag.objects.filter(kind=kind, value=value.strip().upper()).values('internship_id')
+
+
+def apply_filters(queryset, params, skip=None):
+    """
+    Narrow an Internship queryset by the catalogue parameters, leaving out the
+    `skip` facet so its counts show the alternatives to the current choice.
+    Returns the queryset, or None when ?q= is given but has no searchable words.
+    """
+    from .search import matching_ids
+
+    query = params.get('q', '').strip()
+    if query:
+        matches = matching_ids('internship', query)
+        if matches is None:
+            return None
+        queryset = queryset.filter(id__in=matches)
+
+    if params.get('open', '').lower() in ('true', '1', 'yes'):
+        queryset = open_internships(queryset)
+
+    if skip != 'company' and params.get('company'):
+        queryset = queryset.filter(company_id=params['company'])
+    if skip != 'location' and params.get('location'):
+        queryset = queryset.filter(work_location=params['location'])
+    if skip != 'position_type' and params.get('position_type'):
+        queryset = queryset.filter(position_type=params['position_type'])
+    if skip != 'course' and params.get('course'):
+        queryset = queryset.filter(id__in=_tagged('course', params['course']))
+    if skip != 'college' and params.get('college'):
+        queryset = queryset.filter(id__in=_tagged('college', params['college']))
+    return queryset
+
+
+def facet_counts(base, params):
+    """{facet: [{value, label, count}]} for every catalogue facet, most common first"""
+    from .models import InternshipTag
+
+    def narrowed(facet):
+        return apply_filters(base, params, skip=facet).order_by()
+
+    facets = {
+        'company': [
+            {'value': row['company_id'], 'label': row['company__name'], 'count': row['count']}
+            for row in narrowed('company').values('company_id', 'company__name').annotate(count=Count('id')).order_by('-count', 'company__name')
+        ],
+    }
+    for facet, field in (('location', 'work_location'), ('position_type', 'position_type')):
+        facets[facet] = [
+            {'value': row[field], 'label': row[field], 'count': row['count']}
+            for row in narrowed(facet).exclude(**{field: ''}).values(field).annotate(count=Count('id')).order_by('-count', field)
+        ]
+    for facet in ('course', 'college'):
+        facets[facet] = [
+            {'value': row['value'], 'label': row['value'], 'count': row['count']}
+            for row in InternshipTag.objects.filter(kind=facet, internship_id__in=narrowed(facet).values('id'))
+            .values('value').annotate(count=Count('internship_id')).order_by('-count', 'value')
+        ]
+    return facets
@@ -0,0 +1,84 @@
+"""
+Internship Catalogue API Views
+Searchable, faceted and keyset-paginated internship listing, so students can
+browse without downloading every posting.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from .models import Internship, UserRole
+from .catalogue import apply_filters, facet_counts, open_internships
+from .pagination import ListCursorPagination
+
+DEFAULT_PAGE_SIZE = 20
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def internship_catalogue(request):
+    """
+    Internships newest first, paginated with ?cursor= / ?page_size=.
+    Filters: ?q= (position, description and skills), ?company=, ?location=,
+    ?position_type=, ?course=, ?college=, ?open=true. Facet counts for the
+    current filters are included unless ?facets=false.
+    """
+    try:
+        params = request.query_params
+        role = getattr(getattr(request.user, 'user_role', None), 'role', None)
+        internships = Internship.objects.all()
+
+        if role == UserRole.STUDENT:
+            from .views import check_student_compliance
+            is_compliant, missing_docs = check_student_compliance(request.user)
+            if not is_compliant:
+                return Response({
+                    'error': 'Pre-training requirements incomplete',
+                    'missing_requirements': missing_docs,
+                    'message': 'You cannot search or view internships until all required documents are approved by your coordinator.'
+                }, status=status.HTTP_403_FORBIDDEN)
+            # Students only see postings they can still apply to
+            internships = open_internships(internships)
+        elif role == UserRole.SUPERVISOR:
+            if not hasattr(request.user, 'company_user_profile'):
+                return Response({'error': 'No company profile found'}, status=status.HTTP_404_NOT_FOUND)
+            internships = internships.filter(company_id=request.user.company_user_profile.company_id)
+
+        if params.get('company') and not params['company'].isdigit():
+            return Response({'error': 'company must be a company id'}, status=status.HTTP_400_BAD_REQUEST)
+
+        filtered = apply_filters(internships, params)
+        if filtered is None:
+            return Response({'error': 'q must contain at least one word'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = ListCursorPagination('-id', optional=False)
+        paginator.page_size = DEFAULT_PAGE_SIZE
+        page = paginator.paginate_queryset(filtered.select_related('company'), request)
+
+        data = {
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': [{
+                'id': internship.id,
+                'position': internship.position,
+                'company_id': internship.company_id,
+                'company_name': internship.company.name,
+                'description': internship.description,
+                'slots': internship.slots,
+                'work_location': internship.work_location,
+                'position_type': internship.position_type,
+                'duration_hours': internship.duration_hours,
+                'stipend': internship.stipend,
+                'required_skills': internship.required_skills,
+                'required_courses': internship.required_courses,
+                'target_colleges': internship.company.target_colleges,
+                'created_at': internship.created_at,
+            } for internship in page],
+        }
+        if params.get('facets', '').lower() not in ('false', '0', 'no'):
+            data['facets'] = facet_counts(internships, params)
+        return Response(data)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,137 @@
+"""
+Pre-training compliance for the EARIST OJT System
+Resolves a college's required documents from its coordinator's settings once
+and caches the list, then checks approved PreTrainingRequirement rows for one
+student or a whole cohort with a single grouped query. The list is dropped
+whenever coordinator settings or profiles change (see core.signals).
+"""
+from django.core.cache import cache
+
+from .shared_cache import bounded_ttl
+
+DEFAULT_REQUIRED_DOCS = ['Resume/CV', 'Application Letter', 'Endorsement Letter', 'Waiver', 'Consent Letter']
+# Signals invalidate it; the TTL only bounds edge cases. Capped at
+# LOCAL_CACHE_TTL on a per-process cache, where invalidations stay in one worker.
+DOCS_TTL = 60 * 60
+
+
+def _cache_key(college):
+    return f"required_docs_{college}"
+
+
+def _compile(college):
+    from .models import CoordinatorProfile, CoordinatorSettings
+
+    coordinator_id = CoordinatorProfile.objects.filter(college=college).order_by('id').values_list('user_id', flat=True).first()
+    if not coordinator_id:
+        return list(DEFAULT_REQUIRED_DOCS)
+
+    settings = CoordinatorSettings.objects.filter(coordinator_id=coordinator_id).only('required_docs').first()
+    if not settings or not settings.required_docs:
+        return list(DEFAULT_REQUIRED_DOCS)
+    # An explicitly configured list with nothing marked required means no documents are enforced
+    return [doc['name'] for doc in settings.required_docs if doc.get('required', False)]
+
+
+def required_docs_for(college):
+    """Names of the documents a college's students must have approved"""
+    if not college:
+        return []
+    docs = cache.get(_cache_key(college))
+    if docs is None:
+        docs = _compile(college)
+        cache.set(_cache_key(college), docs, bounded_ttl(DOCS_TTL))
+    return docs
+
+
+def invalidate(*colleges):
+    cache.delete_many([_cache_key(college) for college in colleges if college])
+
+
+def approved_docs(student_ids, required):
+    """{student_id: set of required document names approved}, in one query"""
+    from .models import PreTrainingRequirement
+
+    approved = {student_id: set() for student_id in student_ids}
+    if not required or not student_ids:
+        return approved
+    rows = PreTrainingRequirement.objects.filter(
+        student_id__in=student_ids, status='Approved', requirement_type__in=required,
+    ).order_by().values_list('student_id', 'requirement_type').distinct()
+    for student_id, requirement_type in rows:
+        approved[student_id].add(requirement_type)
+    return approved
+
+
+def student_compliance(user):
+    """
+    Whether a student has every required pre-training document approved.
+    Returns (is_compliant, missing_docs_list); students without a college are compliant.
+    """
+    profile = getattr(user, 'student_profile', None)
+    if profile is None or not profile.college:
+        return True, []
+
+    required = required_docs_for(profile.college)
+    if not required:
+        return True, []
+
+    approved = approved_docs([user.id], required)[user.id]
+    missing = [name for name in required if name not in approved]
+    return not missing, missing
+
+
+def college_matrix(college, missing_only=False):
+    """
+    Student x requirement matrix for a college: one query for the students and
+    one for their approved documents, plus the cached required-docs list.
+
+    Returns {'college', 'requirements', 'students', 'summary'} where each student
+    row has 'documents' ({name: approved}), 'missing' and 'compliant', and the
+    summary counts compliant students and how many students miss each document.
+    """
+    from django.contrib.auth.models import User
+    from .models import UserRole
+
+    required = required_docs_for(college)
+    students = list(
+        User.objects.filter(user_role__role=UserRole.STUDENT, student_profile__college=college)
+        .order_by('last_name', 'first_name', 'id')
+        .values('id', 'username', 'first_name', 'last_name', 'student_profile__student_id', 'student_profile__course')
+    )
+    approved = approved_docs([student['id'] for student in students], required)
+
+    rows = []
+    missing_counts = {name: 0 for name in required}
+    compliant_count = 0
+    for student in students:
+        documents = {name: name in approved[student['id']] for name in required}
+        missing = [name for name, done in documents.items() if not done]
+        for name in missing:
+            missing_counts[name] += 1
+        if not missing:
+            compliant_count += 1
+            if missing_only:
+                continue
+        full_name = f"{student['first_name']} {student['last_name']}".strip()
+        rows.append({
+            'student_id': student['id'],
+            'student_name': full_name or student['username'],
+            'student_id_number': student['student_profile__student_id'] or '',
+            'course': student['student_profile__course'] or '',
+            'documents': documents,
+            'missing': missing,
+            'compliant': not missing,
+        })
+
+    return {
+        'college': college,
+        'requirements': required,
+        'students': rows,
+        'summary': {
+            'total_students': len(students),
+            'compliant': compliant_count,
+            'non_compliant': len(students) - compliant_count,
+            'missing_counts': missing_counts,
+        },
+    }
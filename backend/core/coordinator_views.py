@@ -9,7 +9,7 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db.models import Q
 from .models import UserRole, StudentProfile, Company, Internship, Application, DocumentTemplate, CoordinatorProfile, Message, DailyJournal, DocumentTypeConfig
-from .serializers import ApplicationSerializer, CompanySerializer, UserSerializer, DailyJournalSerializer
+from .serializers import ApplicationSerializer, CompanySerializer, UserSerializer, DailyJournalSerializer, annotate_user_profiles
 from .permissions import role_required
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -254,50 +254,13 @@ def fill_pdf_template(pdf_path, context):
 
 def get_required_hours_for_student(student_user):
     """Get the required internship hours for a student based on their course"""
+    from core.required_hours import student_required_hours, DEFAULT_REQUIRED_HOURS
     try:
-        from core.models import CoordinatorSettings
-        
-        # Get student's course
-        if not hasattr(student_user, 'student_profile'):
-            return 486  # Default fallback
-        
-        student_course = student_user.student_profile.course
-        
-        # Get coordinator settings for the student's college
-        # Find a coordinator from the same college
-        coordinator = User.objects.filter(
-            user_role__role=UserRole.COORDINATOR,
-            coordinator_profile__college=student_user.student_profile.college
-        ).first()
-        
-        if not coordinator:
-            return 486  # Default fallback
-        
-        # Get coordinator settings
-        settings = CoordinatorSettings.objects.filter(coordinator=coordinator).first()
-        
-        if not settings or not settings.hours_config:
-            return 486  # Default fallback
-        
-        # Find matching course in hours_config
-        # Find matching course in hours_config
-        normalized_student_course = student_course.upper().replace('.', '').replace(' ', '')
-        
-        for config in settings.hours_config:
-            program = config.get('program', '').upper()
-            normalized_program = program.replace('.', '').replace(' ', '')
-            
-            # Check for exact match, containment, or common variations
-            if (program == student_course.upper() or 
-                program in student_course.upper() or 
-                student_course.upper() in program or
-                normalized_program in normalized_student_course):
-                return config.get('requiredHours', 486)
-        
-        return 486  # Default fallback
+        # Cached per-college table compiled from the coordinator's hours_config
+        return student_required_hours(getattr(student_user, 'student_profile', None))
     except Exception as e:
         print(f"Error getting required hours: {e}")
-        return 486  # Default fallback
+        return DEFAULT_REQUIRED_HOURS
 
 def convert_docx_to_pdf(docx_bytes):
     """
@@ -1296,32 +1259,30 @@ def coordinator_bulk_approve_students(request):
         if not student_ids:
             return Response({'error': 'No student IDs provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        approved_count = 0
-        for student_id in student_ids:
-            try:
-                user = User.objects.get(id=student_id)
-                user.is_active = True
-                user.save()
-                
-                # Approve all pre-training requirements
-                from .models import PreTrainingRequirement
-                requirements = PreTrainingRequirement.objects.filter(student=user)
-                for req in requirements:
-                    req.status = 'Approved'
-                    req.reviewed_at = timezone.now()
-                    req.admin_comment = 'Your document has been verified'
-                    req.save()
-                
-                if hasattr(user, 'student_profile'):
-                    profile = user.student_profile
-                    profile.is_approved = True
-                    profile.cor_verified = True  # Also verify COR
-                    profile.approved_by = request.user
-                    profile.approved_at = timezone.now()
-                    profile.save()
-                approved_count += 1
-            except User.DoesNotExist:
-                continue
+        from django.db import transaction
+        from .models import PreTrainingRequirement
+        
+        students = User.objects.filter(id__in=student_ids)
+        if hasattr(request.user, 'user_role') and request.user.user_role.role == 'coordinator':
+            if hasattr(request.user, 'coordinator_profile') and request.user.coordinator_profile.college:
+                students = students.filter(student_profile__college=request.user.coordinator_profile.college)
+        approved_ids = list(students.values_list('id', flat=True))
+        
+        # One UPDATE per table instead of a save() per student and per requirement
+        with transaction.atomic():
+            User.objects.filter(id__in=approved_ids).update(is_active=True)
+            PreTrainingRequirement.objects.filter(student_id__in=approved_ids).update(
+                status='Approved',
+                reviewed_at=timezone.now(),
+                admin_comment='Your document has been verified'
+            )
+            StudentProfile.objects.filter(user_id__in=approved_ids).update(cor_verified=True)
+        
+        # update() skips signals; drop the cached users so the next request sees the change
+        from .authentication import invalidate_users_tokens
+        invalidate_users_tokens(approved_ids)
+        
+        approved_count = len(approved_ids)
         return Response({'message': f'Approved {approved_count} students', 'approved_count': approved_count})
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -1337,7 +1298,7 @@ def coordinator_users_list(request):
                 college = request.user.coordinator_profile.college
                 if college:
                     students = students.filter(student_profile__college=college)
-        serializer = UserSerializer(students, many=True)
+        serializer = UserSerializer(annotate_user_profiles(students), many=True)
         return Response(serializer.data)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1385,6 +1346,64 @@ def coordinator_student_grades(request):
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.COORDINATOR, UserRole.ADMIN])
+def coordinator_bulk_compute_grades(request):
+    """
+    Compute final grades for every deployed student (approved application) of the
+    coordinator's college in one pass. Send {"dry_run": true} to preview the
+    changes without saving; admins pass "college".
+    """
+    try:
+        from .bulk_grading import grade_students
+        
+        college = None
+        if hasattr(request.user, 'coordinator_profile'):
+            college = request.user.coordinator_profile.college
+        if request.user.user_role.role == UserRole.ADMIN:
+            college = request.data.get('college') or college
+        if not college:
+            return Response({'error': 'College is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        dry_run = str(request.data.get('dry_run', False)).lower() in ('true', '1', 'yes')
+        student_ids = User.objects.filter(
+            user_role__role=UserRole.STUDENT,
+            student_profile__college=college,
+            id__in=Application.objects.filter(status='Approved').values('student_id'),
+        ).order_by('id').values_list('id', flat=True)
+        
+        result = grade_students(student_ids, dry_run=dry_run)
+        result['college'] = college
+        return Response(result)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.COORDINATOR, UserRole.ADMIN])
+def coordinator_compliance_matrix(request):
+    """
+    Which pre-training documents each student of the coordinator's college is
+    still missing. ?missing_only=true lists non-compliant students only;
+    admins pass ?college=.
+    """
+    try:
+        from .compliance import college_matrix
+        
+        college = None
+        if hasattr(request.user, 'coordinator_profile'):
+            college = request.user.coordinator_profile.college
+        if request.user.user_role.role == UserRole.ADMIN:
+            college = request.query_params.get('college') or college
+        if not college:
+            return Response({'error': 'College is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        missing_only = request.query_params.get('missing_only', '').lower() in ('true', '1', 'yes')
+        return Response(college_matrix(college, missing_only=missing_only))
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET', 'PUT'])
 @permission_classes([IsAuthenticated])
 @role_required([UserRole.COORDINATOR, UserRole.ADMIN])
@@ -1426,6 +1445,7 @@ def coordinator_settings(request):
             
             if hasattr(user, 'coordinator_profile'):
                 profile = user.coordinator_profile
+                previous_college = profile.college
                 profile.college = request.data.get('college', profile.college)
                 profile.department = request.data.get('department', profile.department)
                 profile.phone = request.data.get('phone', profile.phone)
@@ -1447,6 +1467,13 @@ def coordinator_settings(request):
             
             settings.save()
             
+            # Signals drop the cached tables for the current college; a coordinator
+            # moving colleges also changes who configures the old one
+            if hasattr(user, 'coordinator_profile'):
+                from core import compliance, required_hours
+                required_hours.invalidate(previous_college, user.coordinator_profile.college)
+                compliance.invalidate(previous_college, user.coordinator_profile.college)
+            
             return Response({'message': 'Settings updated successfully'})
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -3,7 +3,6 @@ import json
 import shutil
 import os
 import sys
-from io import StringIO
 from datetime import timedelta
 from django.conf import settings
 from django.utils import timezone
@@ -57,12 +56,25 @@ def get_activity_logs(request):
 def backup_database(request):
     """Download system backup as JSON"""
     try:
-        # Capture stdout
-        out = StringIO()
+        import tempfile
+        from django.http import FileResponse
+        
+        # dumpdata gzips straight to a temp file instead of building the JSON in memory
+        handle, temp_path = tempfile.mkstemp(suffix='.json.gz')
+        os.close(handle)
         # Dump only the 'core' app data to avoid auth permissions clutter or huge content
-        call_command('dumpdata', 'core', indent=2, stdout=out)
+        call_command('dumpdata', 'core', indent=2, output=temp_path)
+        
+        backup_file = open(temp_path, 'rb')
+        # Unlinking the open file lets the OS reclaim it once the download finishes (POSIX)
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
         
-        response = HttpResponse(out.getvalue(), content_type='application/json')
+        # Sent gzip-encoded; the browser decompresses it back to plain JSON
+        response = FileResponse(backup_file, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
         response['Content-Disposition'] = f'attachment; filename="earist_ojt_backup_{timezone.now().strftime("%Y%m%d_%H%M%S")}.json"'
         return response
     except Exception as e:
@@ -110,7 +122,12 @@ def perform_maintenance(request):
             for doc in DocumentTemplate.objects.all():
                 if doc.file: referenced_files.add(os.path.basename(doc.file.name))
             
-            # 2. Scan folders
+            # 2. Student document uploads live in the content-addressed store; their
+            #    orphans come from a reference-count sweep instead of a directory walk
+            from .storage import sweep_blobs
+            orphaned_blobs = sweep_blobs(dry_run=(mode == 'preview'))
+            
+            # 3. Scan the remaining folders (and files uploaded before the blob store)
             target_folders = ['resumes', 'profile_pictures', 'document_templates']
             for folder in target_folders:
                 folder_path = os.path.join(media_root, folder)
@@ -121,11 +138,11 @@ def perform_maintenance(request):
                             if os.path.isfile(file_path):
                                 orphaned_files.append((filename, file_path))
             
-            count = len(orphaned_files)
+            count = len(orphaned_files) + len(orphaned_blobs)
             
             if mode == 'preview':
                 if count > 0:
-                    names = ", ".join([f[0] for f in orphaned_files[:5]])
+                    names = ", ".join(([f[0] for f in orphaned_files] + orphaned_blobs)[:5])
                     if count > 5: names += f", +{count-5} more"
                     details = f"Found {count} orphaned files to delete: {names}"
                 else:
@@ -133,8 +150,9 @@ def perform_maintenance(request):
                 status_label = 'Pending' if count > 0 else 'Pass'
                 
             else:
-                deleted_count = 0
-                deleted_names = []
+                # sweep_blobs() has already removed the orphaned blobs
+                deleted_count = len(orphaned_blobs)
+                deleted_names = list(orphaned_blobs)
                 for fname, fpath in orphaned_files:
                     try:
                         os.remove(fpath)
@@ -175,7 +193,11 @@ def perform_maintenance(request):
                 
             else:
                 archived_names = [u.username for u in candidates[:5]]
+                archived_ids = list(candidates.values_list('id', flat=True))
                 candidates.update(is_active=False)
+                # update() skips signals, so drop cached tokens by hand
+                from .authentication import invalidate_users_tokens
+                invalidate_users_tokens(archived_ids)
                 
                 if count > 0:
                     names = ", ".join(archived_names)
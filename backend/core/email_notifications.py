@@ -3,181 +3,95 @@ Email notification utilities for EARIST OJT System
 Sends professional HTML notifications to students
 """
 
-from django.core.mail import send_mail
-from django.conf import settings
 from django.utils.html import strip_tags
 
+from . import email_templates
+from .email_outbox import enqueue_email, enqueue_emails
+
 def get_email_template(recipient_name, title, content_html, action_url=None, action_text="View Details"):
     """
-    Generates a professional HTML email template similar to Loom's design
+    Generates a professional HTML email template similar to Loom's design.
+    The shell is precompiled in email_templates; only the slots are filled here.
     """
-    # EARIST Maroon: #800000
-    # Gold/Yellow: #FFD700
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <style>
-            body {{
-                font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
-                line-height: 1.6;
-                color: #333333;
-                margin: 0;
-                padding: 0;
-                -webkit-font-smoothing: antialiased;
-                background-color: #f9f9f9;
-            }}
-            .wrapper {{
-                width: 100%;
-                background-color: #f9f9f9;
-                padding: 40px 0;
-            }}
-            .container {{
-                max-width: 600px;
-                margin: 0 auto;
-                background-color: #ffffff;
-                padding: 40px;
-                border-radius: 8px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-            }}
-            .logo {{
-                margin-bottom: 30px;
-            }}
-            .logo-text {{
-                font-size: 24px;
-                font-weight: 800;
-                color: #800000;
-                text-decoration: none;
-                letter-spacing: -0.5px;
-            }}
-            .logo-sub {{
-                color: #333;
-            }}
-            .greeting {{
-                font-size: 18px;
-                font-weight: 600;
-                margin-bottom: 20px;
-                color: #111;
-            }}
-            .content {{
-                font-size: 16px;
-                color: #444;
-                margin-bottom: 30px;
-            }}
-            .highlight-box {{
-                background-color: #f8f9fa;
-                border-left: 4px solid #800000;
-                padding: 15px 20px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-            .info-row {{
-                margin-bottom: 8px;
-            }}
-            .info-label {{
-                font-weight: 600;
-                color: #555;
-                min-width: 100px;
-                display: inline-block;
-            }}
-            .status-badge {{
-                display: inline-block;
-                padding: 4px 12px;
-                border-radius: 20px;
-                font-size: 14px;
-                font-weight: 600;
-            }}
-            .status-approved {{ background-color: #e6f4ea; color: #1e7e34; }}
-            .status-rejected {{ background-color: #fce8e6; color: #c5221f; }}
-            .status-pending {{ background-color: #fef7e0; color: #b06000; }}
-            
-            .button {{
-                display: inline-block;
-                padding: 12px 24px;
-                background-color: #800000;
-                color: #ffffff !important;
-                text-decoration: none;
-                border-radius: 6px;
-                font-weight: 600;
-                font-size: 16px;
-                margin-top: 10px;
-                text-align: center;
-            }}
-            .button:hover {{
-                background-color: #600000;
-            }}
-            ul {{
-                padding-left: 20px;
-                margin-top: 10px;
-            }}
-            li {{
-                margin-bottom: 8px;
-            }}
-            .footer {{
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 1px solid #eaeaea;
-                font-size: 13px;
-                color: #888;
-                text-align: center;
-            }}
-            .footer a {{
-                color: #888;
-                text-decoration: underline;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="wrapper">
-            <div class="container">
-                <div class="logo">
-                    <div class="logo-text">EARIST <span class="logo-sub">OJT System</span></div>
-                </div>
-                
-                <div class="greeting">Hi {recipient_name} 👋</div>
-                
-                <div class="content">
-                    {content_html}
-                </div>
-                
-                {f'<a href="{action_url}" class="button">{action_text}</a>' if action_url else ''}
-                
-                <div class="footer">
-                    <p>This email was sent to you by the EARIST OJT Management System.</p>
-                    <p>Eulogio "Amang" Rodriguez Institute of Science and Technology<br>
-                    Naguahan, Sampaloc, Manila</p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
+    return email_templates.registry.get('notification').render_html(
+        recipient_name=recipient_name,
+        content=content_html,
+        action=_action_button(action_url, action_text),
+    )
+
+
+def _action_button(action_url, action_text):
+    return f'<a href="{action_url}" class="button">{action_text}</a>' if action_url else ''
+
+
+def build_notification_email(recipient_email, subject, recipient_name, content_html, action_url=None, action_text="View Details"):
+    """Render the notification template for one recipient into an outbox message dict"""
+    html, text = email_templates.registry.get('notification').render(
+        text_overrides={'action': f"{action_text}: {action_url}" if action_url else ''},
+        recipient_name=recipient_name,
+        content=content_html,
+        action=_action_button(action_url, action_text),
+    )
+    return {
+        'subject': subject,
+        'to_email': recipient_email,
+        'body_html': html,
+        'body_text': text,
+    }
+
+
+def send_notification_email(recipient_email, subject, recipient_name, content_html, action_url=None, action_text="View Details"):
+    """Queue one notification email using the precompiled template"""
+    message = build_notification_email(recipient_email, subject, recipient_name, content_html, action_url, action_text)
+    try:
+        enqueue_email(
+            subject=message['subject'],
+            to_email=message['to_email'],
+            body_text=message['body_text'],
+            body_html=message['body_html'],
+        )
+        print(f"✅ HTML Email queued for {recipient_email}: {subject}")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to send email to {recipient_email}: {str(e)}")
+        return False
+
+
+def send_bulk_emails(messages):
+    """
+    Queue many pre-rendered messages in one INSERT.
+    messages: list of dicts from build_notification_email (None entries are skipped)
+    Returns the number of emails queued.
     """
-    return html_content
+    messages = [m for m in messages if m]
+    if not messages:
+        return 0
+    try:
+        return len(enqueue_emails(messages))
+    except Exception as e:
+        print(f"❌ Failed to queue {len(messages)} emails: {str(e)}")
+        return 0
 
 def send_html_email(subject, recipient_email, html_content):
-    """Helper to send HTML email with plain text fallback"""
+    """Helper to queue HTML email with plain text fallback (delivered by send_queued_emails)"""
     try:
         plain_message = strip_tags(html_content)
-        send_mail(
+        enqueue_email(
             subject=subject,
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient_email],
-            html_message=html_content,
-            fail_silently=False,
+            to_email=recipient_email,
+            body_text=plain_message,
+            body_html=html_content,
         )
-        print(f"✅ HTML Email sent to {recipient_email}: {subject}")
+        print(f"✅ HTML Email queued for {recipient_email}: {subject}")
         return True
     except Exception as e:
         print(f"❌ Failed to send email to {recipient_email}: {str(e)}")
         return False
 
-def send_application_status_email(application, old_status, new_status):
+def build_application_status_email(application, new_status):
+    """Render the status-change email for one application, or None if the student has no email"""
     student = application.student
-    if not student.email: return
+    if not student.email: return None
     
     student_name = student.get_full_name() or student.username
     internship = application.internship
@@ -244,8 +158,16 @@ def send_application_status_email(application, old_status, new_status):
         </div>
         """
 
-    html_email = get_email_template(student_name, subject, content, login_url, "Go to Dashboard")
-    return send_html_email(subject, student.email, html_email)
+    return build_notification_email(student.email, subject, student_name, content, login_url, "Go to Dashboard")
+
+def send_application_status_email(application, old_status, new_status):
+    message = build_application_status_email(application, new_status)
+    if not message: return
+    return send_bulk_emails([message]) == 1
+
+def send_application_status_emails(applications, new_status):
+    """Render and queue status-change emails for a batch of applications in one pass"""
+    return send_bulk_emails([build_application_status_email(app, new_status) for app in applications])
 
 def send_task_assignment_email(task):
     student = task.student
@@ -267,8 +189,7 @@ def send_task_assignment_email(task):
     <p><strong>Description:</strong><br>{task.description}</p>
     """
     
-    html_email = get_email_template(student_name, subject, content, "http://localhost:3000/student/tasks", "View Task")
-    return send_html_email(subject, student.email, html_email)
+    return send_notification_email(student.email, subject, student_name, content, "http://localhost:3000/student/tasks", "View Task")
 
 def send_evaluation_notification_email(evaluation):
     student = evaluation.student
@@ -288,8 +209,7 @@ def send_evaluation_notification_email(evaluation):
     <p>Log in to your dashboard to view the detailed breakdown of your evaluation and any feedback provided.</p>
     """
     
-    html_email = get_email_template(student_name, subject, content, "http://localhost:3000/student/evaluation", "View Evaluation")
-    return send_html_email(subject, student.email, html_email)
+    return send_notification_email(student.email, subject, student_name, content, "http://localhost:3000/student/evaluation", "View Evaluation")
 
 def send_journal_feedback_email(journal):
     student = journal.student
@@ -317,5 +237,4 @@ def send_journal_feedback_email(journal):
         <em>"{journal.supervisor_comment}"</em></p>
         """
     
-    html_email = get_email_template(student_name, subject, content, "http://localhost:3000/student/journals", "View Journal")
-    return send_html_email(subject, student.email, html_email)
+    return send_notification_email(student.email, subject, student_name, content, "http://localhost:3000/student/journals", "View Journal")
@@ -0,0 +1,197 @@
+"""
+Email outbox for the EARIST OJT System
+Views enqueue messages and return immediately; the send_queued_emails
+worker delivers them in batches over one reused SMTP connection.
+Messages carry verification codes and temporary passwords, so bodies are
+blanked once a message is sent or given up on, and finished rows are purged
+after EMAIL_OUTBOX_RETENTION_DAYS.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def outbox_enabled():
+    """When disabled, enqueue_email delivers synchronously (useful for local testing)"""
+    return getattr(settings, 'EMAIL_USE_OUTBOX', True)
+
+
+def enqueue_email(subject, to_email, body_text, body_html='', from_email=None):
+    """
+    Queue an email for background delivery and return the OutboxEmail row.
+    If the outbox is disabled the message is sent right away and errors are raised.
+    """
+    message = OutboxEmail(
+        subject=subject,
+        to_email=to_email,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        body_text=body_text,
+        body_html=body_html or '',
+    )
+
+    if not outbox_enabled():
+        _build_message(message).send(fail_silently=False)
+        message.status = 'Sent'
+        message.attempts = 1
+        message.sent_at = timezone.now()
+        message.body_text = message.body_html = ''
+
+    message.save()
+    return message
+
+
+def enqueue_emails(messages):
+    """
+    Queue many emails in one INSERT.
+    messages: iterable of dicts with subject, to_email, body_text and optional body_html/from_email
+    """
+    rows = [
+        OutboxEmail(
+            subject=m['subject'],
+            to_email=m['to_email'],
+            from_email=m.get('from_email') or settings.DEFAULT_FROM_EMAIL,
+            body_text=m.get('body_text', ''),
+            body_html=m.get('body_html', '') or '',
+        )
+        for m in messages
+    ]
+    if not outbox_enabled():
+        delivered = []
+        for row in rows:
+            try:
+                delivered.append(enqueue_email(row.subject, row.to_email, row.body_text, row.body_html, row.from_email))
+            except Exception as e:
+                print(f"❌ Failed to send email to {row.to_email}: {str(e)}")
+        return delivered
+    return OutboxEmail.objects.bulk_create(rows)
+
+
+def _build_message(outbox_email, connection=None):
+    msg = EmailMultiAlternatives(
+        subject=outbox_email.subject,
+        body=outbox_email.body_text,
+        from_email=outbox_email.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[outbox_email.to_email],
+        connection=connection,
+    )
+    if outbox_email.body_html:
+        msg.attach_alternative(outbox_email.body_html, "text/html")
+    return msg
+
+
+def _retry_delay(attempts):
+    """Exponential backoff: 30s, 60s, 120s, ... capped at one hour"""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 30)
+    return timedelta(seconds=min(base * (2 ** max(attempts - 1, 0)), 3600))
+
+
+def _claim_batch(batch_size):
+    """
+    Mark a batch of due messages as Sending and return only the rows this
+    worker claimed, so concurrent workers never deliver the same message.
+    """
+    now = timezone.now()
+    due = (
+        OutboxEmail.objects.filter(status='Queued', next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+    )
+    with transaction.atomic():
+        if db_connection.features.has_select_for_update_skip_locked:
+            # Rows locked by another worker's claim are skipped, not waited on
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch_size])
+            # next_attempt_at doubles as the claim time for requeue_stale()
+            claimed = OutboxEmail.objects.filter(id__in=ids, status='Queued').update(status='Sending', next_attempt_at=now)
+            if claimed != len(ids):
+                ids = []
+                transaction.set_rollback(True)
+        else:
+            # No row locks (e.g. SQLite): claim row by row and keep only the
+            # rows whose conditional UPDATE actually matched
+            ids = [
+                outbox_id for outbox_id in due.values_list('id', flat=True)[:batch_size]
+                if OutboxEmail.objects.filter(id=outbox_id, status='Queued').update(status='Sending', next_attempt_at=now)
+            ]
+    if not ids:
+        return []
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('next_attempt_at', 'id'))
+
+
+def send_queued_emails(batch_size=50):
+    """
+    Deliver one batch of queued emails over a single SMTP connection.
+    Returns a (sent, failed) tuple.
+    """
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = failed = 0
+
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        # Could not reach the SMTP server at all; requeue the whole batch
+        for outbox_email in batch:
+            _record_failure(outbox_email, e, max_attempts)
+        return 0, len(batch)
+
+    try:
+        for outbox_email in batch:
+            try:
+                _build_message(outbox_email, connection).send(fail_silently=False)
+            except Exception as e:
+                _record_failure(outbox_email, e, max_attempts)
+                failed += 1
+                continue
+
+            OutboxEmail.objects.filter(id=outbox_email.id).update(
+                status='Sent',
+                attempts=outbox_email.attempts + 1,
+                sent_at=timezone.now(),
+                last_error='',
+                body_text='',
+                body_html='',
+            )
+            sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def _record_failure(outbox_email, error, max_attempts):
+    attempts = outbox_email.attempts + 1
+    give_up = attempts >= max_attempts
+    fields = {
+        'status': 'Failed' if give_up else 'Queued',
+        'attempts': attempts,
+        'last_error': str(error),
+        'next_attempt_at': timezone.now() + _retry_delay(attempts),
+    }
+    if give_up:
+        # Never retried again, so there is no reason to keep the contents
+        fields.update(body_text='', body_html='')
+    OutboxEmail.objects.filter(id=outbox_email.id).update(**fields)
+    print(f"❌ Failed to send email to {outbox_email.to_email} (attempt {attempts}): {str(error)}")
+
+
+def requeue_stale(minutes=15):
+    """Return messages stuck in Sending (e.g. worker crashed mid-batch) to the queue"""
+    cutoff = timezone.now() - timedelta(minutes=minutes)
+    return OutboxEmail.objects.filter(status='Sending', next_attempt_at__lt=cutoff).update(status='Queued')
+
+
+def purge_finished(days=None):
+    """Delete Sent and Failed messages older than the retention period; returns the count"""
+    if days is None:
+        days = getattr(settings, 'EMAIL_OUTBOX_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxEmail.objects.filter(status__in=['Sent', 'Failed'], created_at__lt=cutoff).delete()
+    return deleted
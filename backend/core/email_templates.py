@@ -0,0 +1,616 @@
+"""
+Precompiled email templates for the EARIST OJT System
+Each template's static HTML shell is split into literal chunks once at import;
+rendering a recipient is just joining those chunks with the slot values.
+"""
+import re
+
+from django.utils.html import strip_tags
+
+SLOT_PATTERN = re.compile(r'\$\{(\w+)\}')
+
+
+class EmailTemplate:
+    """
+    A static HTML shell with ${slot} markers.
+
+    html_slots lists slots whose values are HTML; they are tag-stripped for the
+    plain-text alternate. If no text shell is given, one is derived from the HTML
+    body the first time it is needed and cached for this template version.
+    """
+
+    def __init__(self, name, html, text=None, version=1, html_slots=()):
+        self.name = name
+        self.version = version
+        self.html_slots = set(html_slots)
+        self._html_parts = self._compile(html)
+        self._text_source = text
+        self._text_parts = None
+
+    @staticmethod
+    def _compile(shell):
+        # re.split with one group alternates literal, slot, literal, slot, ...
+        return SLOT_PATTERN.split(shell)
+
+    @staticmethod
+    def _fill(parts, slots):
+        out = list(parts)
+        for i in range(1, len(out), 2):
+            out[i] = str(slots.get(out[i], ''))
+        return ''.join(out)
+
+    @property
+    def text_parts(self):
+        cache_key = (self.name, self.version)
+        parts = _text_cache.get(cache_key)
+        if parts is None:
+            text = self._text_source
+            if text is None:
+                text = _html_to_text(''.join(
+                    p if i % 2 == 0 else '${%s}' % p for i, p in enumerate(self._html_parts)
+                ))
+            parts = self._compile(text)
+            _text_cache[cache_key] = parts
+        return parts
+
+    def render_html(self, **slots):
+        return self._fill(self._html_parts, slots)
+
+    def render_text(self, text_overrides=None, **slots):
+        text_slots = {
+            key: (strip_tags(value).strip() if key in self.html_slots else value)
+            for key, value in slots.items()
+        }
+        if text_overrides:
+            text_slots.update(text_overrides)
+        return self._fill(self.text_parts, text_slots)
+
+    def render(self, text_overrides=None, **slots):
+        """Return (html, text) for one recipient"""
+        return self.render_html(**slots), self.render_text(text_overrides, **slots)
+
+    def render_many(self, slot_list):
+        """Render a batch of recipients in one pass; slot_list is a list of slot dicts"""
+        return [self.render(**slots) for slots in slot_list]
+
+
+# Plain-text shells derived from HTML, keyed by (template name, version)
+_text_cache = {}
+
+_HEAD_PATTERN = re.compile(r'<head>.*?</head>', re.S | re.I)
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+def _html_to_text(html):
+    text = strip_tags(_HEAD_PATTERN.sub('', html))
+    lines = [line.strip() for line in text.splitlines()]
+    return _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+class TemplateRegistry:
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, template):
+        existing = self._templates.get(template.name)
+        if existing and existing.version != template.version:
+            _text_cache.pop((existing.name, existing.version), None)
+        self._templates[template.name] = template
+        return template
+
+    def get(self, name):
+        return self._templates[name]
+
+
+registry = TemplateRegistry()
+
+
+def render(template_name, text_overrides=None, **slots):
+    """Render a registered template; returns (html, text)"""
+    return registry.get(template_name).render(text_overrides, **slots)
+
+
+def render_many(template_name, slot_list):
+    return registry.get(template_name).render_many(slot_list)
+
+
+# ========== TEMPLATES ==========
+
+NOTIFICATION_HTML = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body {
+            font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif;
+            line-height: 1.6;
+            color: #333333;
+            margin: 0;
+            padding: 0;
+            -webkit-font-smoothing: antialiased;
+            background-color: #f9f9f9;
+        }
+        .wrapper {
+            width: 100%;
+            background-color: #f9f9f9;
+            padding: 40px 0;
+        }
+        .container {
+            max-width: 600px;
+            margin: 0 auto;
+            background-color: #ffffff;
+            padding: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.05);
+        }
+        .logo {
+            margin-bottom: 30px;
+        }
+        .logo-text {
+            font-size: 24px;
+            font-weight: 800;
+            color: #800000;
+            text-decoration: none;
+            letter-spacing: -0.5px;
+        }
+        .logo-sub {
+            color: #333;
+        }
+        .greeting {
+            font-size: 18px;
+            font-weight: 600;
+            margin-bottom: 20px;
+            color: #111;
+        }
+        .content {
+            font-size: 16px;
+            color: #444;
+            margin-bottom: 30px;
+        }
+        .highlight-box {
+            background-color: #f8f9fa;
+            border-left: 4px solid #800000;
+            padding: 15px 20px;
+            margin: 20px 0;
+            border-radius: 4px;
+        }
+        .info-row {
+            margin-bottom: 8px;
+        }
+        .info-label {
+            font-weight: 600;
+            color: #555;
+            min-width: 100px;
+            display: inline-block;
+        }
+        .status-badge {
+            display: inline-block;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 14px;
+            font-weight: 600;
+        }
+        .status-approved { background-color: #e6f4ea; color: #1e7e34; }
+        .status-rejected { background-color: #fce8e6; color: #c5221f; }
+        .status-pending { background-color: #fef7e0; color: #b06000; }
+
+        .button {
+            display: inline-block;
+            padding: 12px 24px;
+            background-color: #800000;
+            color: #ffffff !important;
+            text-decoration: none;
+            border-radius: 6px;
+            font-weight: 600;
+            font-size: 16px;
+            margin-top: 10px;
+            text-align: center;
+        }
+        .button:hover {
+            background-color: #600000;
+        }
+        ul {
+            padding-left: 20px;
+            margin-top: 10px;
+        }
+        li {
+            margin-bottom: 8px;
+        }
+        .footer {
+            margin-top: 40px;
+            padding-top: 20px;
+            border-top: 1px solid #eaeaea;
+            font-size: 13px;
+            color: #888;
+            text-align: center;
+        }
+        .footer a {
+            color: #888;
+            text-decoration: underline;
+        }
+    </style>
+</head>
+<body>
+    <div class="wrapper">
+        <div class="container">
+            <div class="logo">
+                <div class="logo-text">EARIST <span class="logo-sub">OJT System</span></div>
+            </div>
+
+            <div class="greeting">Hi ${recipient_name} 👋</div>
+
+            <div class="content">
+                ${content}
+            </div>
+
+            ${action}
+
+            <div class="footer">
+                <p>This email was sent to you by the EARIST OJT Management System.</p>
+                <p>Eulogio "Amang" Rodriguez Institute of Science and Technology<br>
+                Naguahan, Sampaloc, Manila</p>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+'''
+
+NOTIFICATION_TEXT = '''Hi ${recipient_name},
+
+${content}
+
+${action}
+
+This email was sent to you by the EARIST OJT Management System.
+Eulogio "Amang" Rodriguez Institute of Science and Technology
+Naguahan, Sampaloc, Manila'''
+
+VERIFICATION_CODE_HTML = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
+        <tr>
+            <td align="center">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                    <!-- Header -->
+                    <tr>
+                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
+                            <div style="font-size: 32px; margin-bottom: 10px;">✉️</div>
+                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
+                        </td>
+                    </tr>
+                    
+                    <!-- Content -->
+                    <tr>
+                        <td style="padding: 40px;">
+                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
+                                Email Verification
+                            </h2>
+                            
+                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
+                                Thank you for registering!<br>
+                                Please use the code below to verify your email address.
+                            </p>
+                            
+                            <!-- Code Box -->
+                            <table width="100%" cellpadding="0" cellspacing="0">
+                                <tr>
+                                    <td align="center" style="padding: 20px 0;">
+                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
+                                            <div style="background: #ffffff; padding: 25px 60px; border-radius: 10px;">
+                                                <div style="font-size: 42px; font-weight: 700; letter-spacing: 12px; color: #667eea; font-family: 'Courier New', monospace;">
+                                                    ${code}
+                                                </div>
+                                            </div>
+                                        </div>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <p style="margin: 30px 0 0; font-size: 14px; line-height: 1.6; color: #666; text-align: center;">
+                                This code will expire in <strong>1 hour</strong>.
+                            </p>
+                            
+                            <!-- Info Box -->
+                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
+                                <tr>
+                                    <td style="background-color: #e3f2fd; border-left: 4px solid #2196f3; padding: 15px; border-radius: 4px;">
+                                        <p style="margin: 0; font-size: 13px; color: #1565c0; line-height: 1.5;">
+                                            <strong>ℹ️ Note:</strong><br>
+                                            If you didn't request this code, please ignore this email.
+                                        </p>
+                                    </td>
+                                </tr>
+                            </table>
+                        </td>
+                    </tr>
+                    
+                    <!-- Footer -->
+                    <tr>
+                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
+                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
+                                Best regards,<br>
+                                <strong>EARIST OJT System Team</strong>
+                            </p>
+                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
+                                This is an automated message, please do not reply to this email.
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+                
+                <!-- Footer Note -->
+                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
+                    <tr>
+                        <td style="text-align: center; padding: 0 40px;">
+                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
+                                © 2025 EARIST OJT System. All rights reserved.<br>
+                                This message was sent to ${email}
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>
+'''
+
+VERIFICATION_CODE_TEXT = '''Your verification code is: ${code}
+
+This code will expire in 1 hour.
+
+If you did not request this code, please ignore this email.
+
+Best regards,
+EARIST OJT System'''
+
+TWO_FACTOR_CODE_HTML = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
+        <tr>
+            <td align="center">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                    <!-- Header -->
+                    <tr>
+                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
+                            <div style="font-size: 32px; margin-bottom: 10px;">🔐</div>
+                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
+                        </td>
+                    </tr>
+                    
+                    <!-- Content -->
+                    <tr>
+                        <td style="padding: 40px;">
+                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
+                                Security Verification Code
+                            </h2>
+                            
+                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
+                                Hello <strong>${name}</strong>,<br>
+                                We received a request to verify your identity.
+                            </p>
+                            
+                            <!-- Code Box -->
+                            <table width="100%" cellpadding="0" cellspacing="0">
+                                <tr>
+                                    <td align="center" style="padding: 20px 0;">
+                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
+                                            <div style="background: #ffffff; padding: 25px 50px; border-radius: 10px;">
+                                                <div style="font-size: 36px; font-weight: 700; letter-spacing: 8px; color: #667eea; font-family: 'Courier New', monospace;">
+                                                    ${code}
+                                                </div>
+                                            </div>
+                                        </div>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <p style="margin: 30px 0 0; font-size: 14px; line-height: 1.6; color: #666; text-align: center;">
+                                This code will expire in <strong>10 minutes</strong>.
+                            </p>
+                            
+                            <!-- Warning Box -->
+                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
+                                <tr>
+                                    <td style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; border-radius: 4px;">
+                                        <p style="margin: 0; font-size: 13px; color: #856404; line-height: 1.5;">
+                                            <strong>⚠️ Security Notice:</strong><br>
+                                            If you didn't request this code, please ignore this email or contact your administrator immediately.
+                                        </p>
+                                    </td>
+                                </tr>
+                            </table>
+                        </td>
+                    </tr>
+                    
+                    <!-- Footer -->
+                    <tr>
+                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
+                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
+                                Best regards,<br>
+                                <strong>EARIST OJT System Team</strong>
+                            </p>
+                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
+                                This is an automated message, please do not reply to this email.
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+                
+                <!-- Footer Note -->
+                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
+                    <tr>
+                        <td style="text-align: center; padding: 0 40px;">
+                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
+                                © 2025 EARIST OJT System. All rights reserved.<br>
+                                This message was sent to ${email}
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>
+'''
+
+TWO_FACTOR_CODE_TEXT = '''Hello ${name},
+
+Your 2FA verification code is: ${code}
+
+This code will expire in 10 minutes.
+
+If you did not request this code, please ignore this email or contact your administrator.
+
+Best regards,
+EARIST OJT System'''
+
+PASSWORD_RESET_HTML = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
+        <tr>
+            <td align="center">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                    <!-- Header -->
+                    <tr>
+                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
+                            <div style="font-size: 32px; margin-bottom: 10px;">🔒</div>
+                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
+                        </td>
+                    </tr>
+                    
+                    <!-- Content -->
+                    <tr>
+                        <td style="padding: 40px;">
+                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
+                                Password Reset Request
+                            </h2>
+                            
+                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
+                                Hello <strong>${name}</strong>,<br>
+                                We received a request to reset your password.
+                            </p>
+                            
+                            <!-- Password Box -->
+                            <table width="100%" cellpadding="0" cellspacing="0">
+                                <tr>
+                                    <td align="center" style="padding: 20px 0;">
+                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
+                                            <div style="background: #ffffff; padding: 25px 50px; border-radius: 10px;">
+                                                <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">Your New Password</p>
+                                                <div style="font-size: 28px; font-weight: 700; letter-spacing: 3px; color: #667eea; font-family: 'Courier New', monospace;">
+                                                    ${new_password}
+                                                </div>
+                                            </div>
+                                        </div>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <!-- Important Info -->
+                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
+                                <tr>
+                                    <td style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; border-radius: 4px;">
+                                        <p style="margin: 0 0 10px; font-size: 13px; color: #856404; line-height: 1.5;">
+                                            <strong>⚠️ Important:</strong>
+                                        </p>
+                                        <ul style="margin: 0; padding-left: 20px; font-size: 13px; color: #856404; line-height: 1.6;">
+                                            <li>Use this password to log in immediately</li>
+                                            <li>Change this password after logging in for security</li>
+                                            <li>If you didn't request this, contact admin immediately</li>
+                                        </ul>
+                                    </td>
+                                </tr>
+                            </table>
+                            
+                            <!-- Login Button -->
+                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
+                                <tr>
+                                    <td align="center">
+                                        <a href="http://localhost:3000/login" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: #ffffff; text-decoration: none; padding: 15px 40px; border-radius: 8px; font-weight: 600; font-size: 16px;">
+                                            Log In Now
+                                        </a>
+                                    </td>
+                                </tr>
+                            </table>
+                        </td>
+                    </tr>
+                    
+                    <!-- Footer -->
+                    <tr>
+                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
+                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
+                                Best regards,<br>
+                                <strong>EARIST OJT System Team</strong>
+                            </p>
+                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
+                                This is an automated message, please do not reply to this email.
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+                
+                <!-- Footer Note -->
+                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
+                    <tr>
+                        <td style="text-align: center; padding: 0 40px;">
+                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
+                                © 2025 EARIST OJT System. All rights reserved.<br>
+                                This message was sent to ${email}
+                            </p>
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>
+'''
+
+PASSWORD_RESET_TEXT = '''Password Reset Request
+
+Hello ${name},
+
+We received a request to reset your password.
+
+Your new password is: ${new_password}
+
+Important:
+- Use this password to log in immediately
+- Change this password after logging in for security
+- If you didn't request this, contact admin immediately
+
+Log in at: http://localhost:3000/login
+
+Best regards,
+EARIST OJT System'''
+
+
+registry.register(EmailTemplate('notification', NOTIFICATION_HTML, NOTIFICATION_TEXT, html_slots=['content']))
+registry.register(EmailTemplate('verification_code', VERIFICATION_CODE_HTML, VERIFICATION_CODE_TEXT))
+registry.register(EmailTemplate('two_factor_code', TWO_FACTOR_CODE_HTML, TWO_FACTOR_CODE_TEXT))
+registry.register(EmailTemplate('password_reset', PASSWORD_RESET_HTML, PASSWORD_RESET_TEXT))
@@ -0,0 +1,133 @@
+"""
+Hours ledger for the EARIST OJT System
+Keeps one HoursLedger row per student and application with attendance and
+journal hours and counts. The Attendance/DailyJournal signals in core.signals
+call refresh_student() whenever a record is saved, deleted or changes status,
+so progress, grading and analytics views read a few ledger rows instead of
+summing every record.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+HOURS_FIELD = DecimalField(max_digits=8, decimal_places=2)
+
+
+def _hours(condition=None):
+    return Coalesce(Sum('hours_rendered', filter=condition), Value(Decimal('0')), output_field=HOURS_FIELD)
+
+
+def _count(condition=None):
+    return Count('id', filter=condition)
+
+
+def attendance_totals():
+    """Pending attendance still awaits the supervisor; every other status counts as approved"""
+    return {
+        'attendance_hours': _hours(),
+        'attendance_approved_hours': _hours(~Q(status='Pending')),
+        'attendance_pending_hours': _hours(Q(status='Pending')),
+        'late_hours': _hours(Q(status='Late')),
+        'attendance_count': _count(),
+        'present_count': _count(Q(status='Present')),
+        'late_count': _count(Q(status='Late')),
+        'absent_count': _count(Q(status='Absent')),
+        'pending_count': _count(Q(status='Pending')),
+    }
+
+
+def journal_totals():
+    return {
+        'journal_hours': _hours(),
+        'journal_approved_hours': _hours(Q(status='Approved')),
+        'journal_pending_hours': _hours(Q(status='Submitted')),
+        'journal_count': _count(),
+    }
+
+
+HOURS_FIELDS = [
+    'attendance_hours', 'attendance_approved_hours', 'attendance_pending_hours', 'late_hours',
+    'journal_hours', 'journal_approved_hours', 'journal_pending_hours',
+]
+COUNT_FIELDS = [
+    'attendance_count', 'present_count', 'late_count', 'absent_count', 'pending_count', 'journal_count',
+]
+LEDGER_FIELDS = HOURS_FIELDS + COUNT_FIELDS
+
+
+def _ledger_models(apps=None):
+    """(Attendance, DailyJournal, HoursLedger); apps is the migration registry during backfill"""
+    if apps is None:
+        from django.apps import apps
+    return tuple(apps.get_model('core', name) for name in ('Attendance', 'DailyJournal', 'HoursLedger'))
+
+
+def _compute(student_id, Attendance, DailyJournal):
+    """{application_id: totals} from one grouped aggregate per source table"""
+    rows = {}
+    for model, totals in ((Attendance, attendance_totals()), (DailyJournal, journal_totals())):
+        grouped = model.objects.filter(student_id=student_id).order_by().values('application_id').annotate(**totals)
+        for values in grouped:
+            rows.setdefault(values.pop('application_id'), {}).update(values)
+    return rows
+
+
+def refresh_student(student_id, apps=None):
+    """Recompute every ledger row of one student from their attendance and journals"""
+    Attendance, DailyJournal, HoursLedger = _ledger_models(apps)
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                _write_rows(HoursLedger, student_id, _compute(student_id, Attendance, DailyJournal))
+            return
+        except IntegrityError:
+            # A concurrent refresh created the same row first; recompute against it
+            if attempt:
+                raise
+
+
+def _write_rows(HoursLedger, student_id, rows):
+    existing = {ledger.application_id: ledger for ledger in HoursLedger.objects.filter(student_id=student_id)}
+    for application_id, totals in rows.items():
+        ledger = existing.pop(application_id, None) or HoursLedger(student_id=student_id, application_id=application_id)
+        for field in LEDGER_FIELDS:
+            setattr(ledger, field, totals.get(field, 0))
+        ledger.save()
+    if existing:
+        # Every record of these applications is gone
+        HoursLedger.objects.filter(pk__in=[ledger.pk for ledger in existing.values()]).delete()
+
+
+def rebuild_all(apps=None):
+    """Recompute the ledger for every student with attendance or journals; returns the student count"""
+    Attendance, DailyJournal, HoursLedger = _ledger_models(apps)
+    student_ids = set(Attendance.objects.values_list('student_id', flat=True).distinct())
+    student_ids.update(DailyJournal.objects.values_list('student_id', flat=True).distinct())
+    HoursLedger.objects.exclude(student_id__in=student_ids).delete()
+    for student_id in sorted(student_ids):
+        refresh_student(student_id, apps)
+    return len(student_ids)
+
+
+def rendered_hours(totals):
+    """
+    Hours counted toward the requirement from student_totals() (or a ledger
+    aggregate with the same keys). Attendance is the record of time on site;
+    journals describe the same days, so their hours are not added on top.
+    """
+    return float(totals.get('attendance_hours') or 0)
+
+
+def student_totals(student_id):
+    """
+    Ledger totals across all of a student's applications, hours as floats and
+    counts as ints. One query over a handful of rows.
+    """
+    from .models import HoursLedger
+
+    aggregates = {field: Coalesce(Sum(field), Value(Decimal('0')), output_field=HOURS_FIELD) for field in HOURS_FIELDS}
+    aggregates.update({field: Coalesce(Sum(field), Value(0), output_field=IntegerField()) for field in COUNT_FIELDS})
+    totals = HoursLedger.objects.filter(student_id=student_id).aggregate(**aggregates)
+    return {field: float(totals[field]) if field in HOURS_FIELDS else int(totals[field]) for field in LEDGER_FIELDS}
@@ -0,0 +1,278 @@
+"""
+Login throttling for the EARIST OJT System
+Counts failed logins per username and per IP in the "shared" cache alias
+(Redis, or the database cache table without it) over an exact sliding window, so failed attempts never write to the database. A
+locked username is refused outright; a locked IP only changes how further
+failures are answered, so correct credentials from a busy shared network
+still log in. Lockouts are queued in the cache and written to LoginAttempt
+by the persist_login_lockouts job for auditing.
+"""
+import hashlib
+import math
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .shared_cache import SHARED_ALIAS, is_shared, shared_cache as cache
+
+LOCKOUT_EVENT_TTL = 60 * 60 * 24  # queued lockouts survive a day without the job running
+SEQUENCE_TTL = 60 * 60 * 24  # failure sequence numbers; stamps themselves expire with the window
+MAX_SLOT_TRIES = 10
+
+
+def require_shared_cache():
+    """Raise ImproperlyConfigured unless every process sees the same throttle state"""
+    if not is_shared(SHARED_ALIAS):
+        raise ImproperlyConfigured(
+            f'CACHES["{SHARED_ALIAS}"] is per process; login lockouts need Redis or the database cache.'
+        )
+
+
+def get_max_attempts():
+    return getattr(settings, 'LOGIN_MAX_ATTEMPTS', 3)
+
+
+def get_ip_max_attempts():
+    """IPs get a larger budget since many students share the campus network"""
+    return getattr(settings, 'LOGIN_IP_MAX_ATTEMPTS', 20)
+
+
+def get_trusted_proxies():
+    """How many reverse proxies in front of Django append to X-Forwarded-For"""
+    return getattr(settings, 'LOGIN_TRUSTED_PROXIES', 0)
+
+
+def get_window():
+    """Seconds failures are counted over; also how long a lockout lasts"""
+    return getattr(settings, 'LOGIN_LOCKOUT_SECONDS', 120)
+
+
+def client_ip(request):
+    """
+    Client address for throttling. X-Forwarded-For is client controlled, so it
+    is only read when LOGIN_TRUSTED_PROXIES says how many hops to trust, and
+    then only the entry the outermost trusted proxy appended.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    proxies = get_trusted_proxies()
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if not proxies or not forwarded:
+        return remote_addr
+    addresses = [address.strip() for address in forwarded.split(',') if address.strip()]
+    if not addresses:
+        return remote_addr
+    return addresses[-min(proxies, len(addresses))]
+
+
+_GENERATION_KEY = 'login_throttle_generation'
+
+
+def _generation():
+    # Bumped by clear_all() to orphan every counter and lock at once
+    return cache.get(_GENERATION_KEY) or 0
+
+
+def _scope_id(value):
+    # Hash so any username/IP is a safe cache key
+    return hashlib.sha256(str(value).encode('utf-8')).hexdigest()[:32]
+
+
+def _sequence_key(scope, value, generation):
+    return f"login_fail_seq_{generation}_{scope}_{_scope_id(value)}"
+
+
+def _stamp_key(scope, value, sequence, generation):
+    return f"login_fail_{generation}_{scope}_{_scope_id(value)}_{sequence}"
+
+
+def _reset_key(scope, value, generation):
+    return f"login_fail_reset_{generation}_{scope}_{_scope_id(value)}"
+
+
+def _lock_key(scope, value, generation):
+    return f"login_lock_{generation}_{scope}_{_scope_id(value)}"
+
+
+def _claim_slot(sequence_key, sequence_ttl, slot_key, value, timeout):
+    """
+    Store value under slot_key(n) for the next free sequence number n and
+    return n. incr() is not atomic on every backend (DatabaseCache reads then
+    writes), so the slot is taken with add() and a lost race moves on to the
+    next number instead of overwriting another request's value.
+    """
+    for _ in range(MAX_SLOT_TRIES):
+        # add() is a no-op if another request already started the sequence
+        cache.add(sequence_key, 0, sequence_ttl)
+        try:
+            sequence = cache.incr(sequence_key)
+        except ValueError:
+            # Sequence expired between add() and incr()
+            continue
+        if cache.add(slot_key(sequence), value, timeout):
+            return sequence
+    return None
+
+
+def _record_failure(scope, value, now, limit, generation):
+    """
+    Store the failure's timestamp and return how many of the last `limit`
+    failures fall inside the window since the last reset. Exact, so a lockout
+    always means `limit` real failures within the window.
+    """
+    window = get_window()
+    sequence = _claim_slot(
+        _sequence_key(scope, value, generation), SEQUENCE_TTL,
+        lambda n: _stamp_key(scope, value, n, generation), now, window,
+    )
+    if sequence is None:
+        return 0
+
+    reset_key = _reset_key(scope, value, generation)
+    keys = [_stamp_key(scope, value, n, generation) for n in range(max(sequence - limit + 1, 1), sequence + 1)]
+    values = cache.get_many(keys + [reset_key])
+    since = max(now - window, values.pop(reset_key, 0))
+    return sum(1 for stamp in values.values() if stamp > since)
+
+
+def _clear_counters(scope, value, generation, now=None):
+    # Failures stamped before the reset no longer count; they expire on their own
+    cache.set(_reset_key(scope, value, generation), now or time.time(), get_window())
+
+
+def _lock_seconds_left(scope, value, generation):
+    locked_until = cache.get(_lock_key(scope, value, generation))
+    if locked_until is None:
+        return 0
+    return max(locked_until - time.time(), 0)
+
+
+def lockout_remaining(username):
+    """Seconds left on the username's lockout, or 0 when it may log in"""
+    require_shared_cache()
+    if not username:
+        return 0
+    return _lock_seconds_left('user', username, _generation())
+
+
+def minutes_left(seconds):
+    return max(int(math.ceil(seconds / 60)), 1)
+
+
+def register_failure(username, ip=None):
+    """
+    Record a failed login. Returns (attempts, locked) where attempts is the
+    username's failures inside the window and locked is None, 'user' when
+    the username is now locked, or 'ip' when the address is over its budget.
+    """
+    now = time.time()
+    generation = _generation()
+    attempts = 0
+    locked = None
+
+    if ip:
+        ip_attempts = _record_failure('ip', ip, now, get_ip_max_attempts(), generation)
+        if ip_attempts >= get_ip_max_attempts():
+            _lock('ip', ip, ip, ip_attempts, now, generation)
+        if _lock_seconds_left('ip', ip, generation):
+            locked = 'ip'
+
+    if username:
+        attempts = _record_failure('user', username, now, get_max_attempts(), generation)
+        if attempts >= get_max_attempts():
+            _lock('user', username, ip, attempts, now, generation)
+            locked = 'user'
+
+    return attempts, locked
+
+
+def _lock(scope, value, ip, attempts, now, generation):
+    """Set the lockout; only the request that creates it queues an audit event"""
+    locked_until = now + get_window()
+    if not cache.add(_lock_key(scope, value, generation), locked_until, get_window()):
+        return False
+    # The lock carries the block now; start from a clean window once it expires
+    _clear_counters(scope, value, generation, now)
+    _queue_lockout_event({
+        'username': value if scope == 'user' else '',
+        'ip_address': ip,
+        'attempts': attempts,
+        'locked_until': locked_until,
+    })
+    return True
+
+
+def reset(username):
+    """Forget failures and lockouts for username after a successful login"""
+    generation = _generation()
+    # Most logins follow no failures at all; skip the writes then
+    if cache.get(_sequence_key('user', username, generation)) is None:
+        return
+    _clear_counters('user', username, generation)
+    cache.delete(_lock_key('user', username, generation))
+
+
+def reset_ip(ip):
+    """Forget failures and lockouts for an address"""
+    generation = _generation()
+    _clear_counters('ip', ip, generation)
+    cache.delete(_lock_key('ip', ip, generation))
+
+
+def clear_all():
+    """Unlock every username and address at once"""
+    cache.add(_GENERATION_KEY, 0, None)
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        cache.set(_GENERATION_KEY, 1, None)
+
+
+# ========== LOCKOUT AUDIT QUEUE ==========
+
+_SEQUENCE_KEY = 'login_lockout_seq'
+_PERSISTED_KEY = 'login_lockout_persisted'
+
+
+def _event_key(sequence):
+    return f"login_lockout_event_{sequence}"
+
+
+def _queue_lockout_event(event):
+    _claim_slot(_SEQUENCE_KEY, None, _event_key, event, LOCKOUT_EVENT_TTL)
+
+
+def persist_lockouts(batch_size=500):
+    """
+    Write queued lockout events to LoginAttempt and return how many were saved.
+    Meant to run periodically (see the persist_login_lockouts command).
+    """
+    from .models import LoginAttempt
+
+    latest = cache.get(_SEQUENCE_KEY) or 0
+    persisted = cache.get(_PERSISTED_KEY) or 0
+    if latest <= persisted:
+        return 0
+
+    saved = 0
+    start = persisted + 1
+    while start <= latest:
+        end = min(start + batch_size - 1, latest)
+        keys = [_event_key(sequence) for sequence in range(start, end + 1)]
+        events = cache.get_many(keys)
+        rows = [
+            LoginAttempt(
+                username=event['username'],
+                ip_address=event['ip_address'] or None,
+                attempts=event['attempts'],
+                locked_until=datetime.fromtimestamp(event['locked_until'], tz=dt_timezone.utc),
+            )
+            for event in (events[key] for key in keys if key in events)
+        ]
+        LoginAttempt.objects.bulk_create(rows)
+        cache.delete_many(keys)
+        cache.set(_PERSISTED_KEY, end, None)
+        saved += len(rows)
+        start = end + 1
+    return saved
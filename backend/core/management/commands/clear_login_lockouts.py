@@ -0,0 +1,34 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core import login_throttle
+
+
+class Command(BaseCommand):
+    help = 'Clear cached login failures and lockouts for usernames, IP addresses or everyone'
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help='Usernames to unlock (students use their username, not Student ID)')
+        parser.add_argument('--ip', action='append', default=[], help='IP address to unlock; may be repeated')
+        parser.add_argument('--all', action='store_true', help='Unlock every username and IP address')
+
+    def handle(self, *args, **options):
+        try:
+            login_throttle.require_shared_cache()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        if options['all']:
+            login_throttle.clear_all()
+            self.stdout.write(self.style.SUCCESS('Cleared all login lockouts'))
+            return
+
+        if not options['usernames'] and not options['ip']:
+            raise CommandError('Give usernames, --ip or --all')
+
+        for username in options['usernames']:
+            login_throttle.reset(username)
+            self.stdout.write(self.style.SUCCESS(f'Unlocked {username}'))
+        for ip in options['ip']:
+            login_throttle.reset_ip(ip)
+            self.stdout.write(self.style.SUCCESS(f'Unlocked {ip}'))
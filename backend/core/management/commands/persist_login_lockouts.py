@@ -0,0 +1,29 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core import login_throttle
+
+
+class Command(BaseCommand):
+    help = 'Write login lockouts queued in the cache to LoginAttempt for auditing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and flush periodically')
+        parser.add_argument('--interval', type=float, default=60.0, help='Seconds between flushes')
+
+    def handle(self, *args, **options):
+        try:
+            login_throttle.require_shared_cache()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        while True:
+            saved = login_throttle.persist_lockouts()
+            if saved:
+                self.stdout.write(self.style.SUCCESS(f'Persisted {saved} login lockout(s)'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.hours_ledger import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute every HoursLedger row from Attendance and DailyJournal records'
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the hours ledger for {count} student(s)'))
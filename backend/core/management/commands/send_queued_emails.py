@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.email_outbox import purge_finished, send_queued_emails, requeue_stale
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails over a pooled SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Messages sent per SMTP connection')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the outbox')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        while True:
+            requeue_stale()
+            purged = purge_finished()
+            if purged:
+                self.stdout.write(f'Purged {purged} finished email(s)')
+
+            # Drain everything that is due before sleeping
+            total_sent = total_failed = 0
+            while True:
+                sent, failed = send_queued_emails(batch_size=batch_size)
+                total_sent += sent
+                total_failed += failed
+                if sent + failed < batch_size:
+                    break
+
+            if total_sent or total_failed:
+                self.stdout.write(self.style.SUCCESS(f'Sent {total_sent} email(s), {total_failed} failed'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
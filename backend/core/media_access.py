@@ -0,0 +1,118 @@
+"""
+Media access control for the EARIST OJT System
+Maps a MEDIA_ROOT path back to the rows whose FileFields hold it and decides
+whether the requesting user may read it. Admins read everything; everyone else
+needs a referencing row they are allowed to see: their own student files, files
+of students in a coordinator's college, files of students who applied to a
+supervisor's company, messages they sent or received, and shared documents
+(templates, notices).
+"""
+from django.apps import apps
+from django.db import models
+from rest_framework import exceptions
+
+from .models import Application, CompanyUser, CoordinatorProfile, StudentProfile, UserRole
+from .storage import ContentAddressedStorage, is_blob_name
+
+# Files everyone who is signed in may read
+SHARED_MODELS = {'DocumentTemplate', 'DocumentTypeConfig', 'Notice'}
+
+# User foreign keys that make the referenced user the file's uploader or reviewer
+AUTHOR_FIELDS = ('uploaded_by', 'created_by', 'assigned_by', 'evaluated_by', 'sender', 'recipient')
+
+
+def media_user(request):
+    """
+    The signed-in user of a plain Django media request, or None.
+
+    Accepts the session, an "Authorization: Token ..." header, or a ?token=
+    query parameter for <img>/<iframe> sources that cannot set headers.
+    """
+    if request.user.is_authenticated:
+        return request.user
+
+    from .authentication import CachedTokenAuthentication
+
+    authenticator = CachedTokenAuthentication()
+    try:
+        result = authenticator.authenticate(request)
+        if result is None and request.GET.get('token'):
+            result = authenticator.authenticate_credentials(request.GET['token'])
+    except exceptions.AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+def file_fields(file_path):
+    """(model, field) pairs whose values could equal file_path"""
+    blob = is_blob_name(file_path)
+    pairs = []
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if not isinstance(field, models.FileField):
+                continue
+            if isinstance(field.storage, ContentAddressedStorage):
+                if blob:
+                    pairs.append((model, field))
+            elif not blob and (callable(field.upload_to) or file_path.startswith(field.upload_to)):
+                pairs.append((model, field))
+    return pairs
+
+
+def referencing_rows(file_path):
+    for model, field in file_fields(file_path):
+        yield from model.objects.filter(**{field.name: file_path})
+
+
+def _role(user):
+    user_role = getattr(user, 'user_role', None)
+    return user_role.role if user_role else None
+
+
+def _row_student_id(row):
+    if isinstance(row, StudentProfile):
+        return row.user_id
+    return getattr(row, 'student_id', None)
+
+
+def can_view_student(user, student_id):
+    """Whether user may read files belonging to the student with this user id"""
+    if user.id == student_id:
+        return True
+    role = _role(user)
+    if role == UserRole.COORDINATOR:
+        college = CoordinatorProfile.objects.filter(user=user).values_list('college', flat=True).first()
+        return bool(college) and StudentProfile.objects.filter(user_id=student_id, college=college).exists()
+    if role == UserRole.SUPERVISOR:
+        company_id = CompanyUser.objects.filter(user=user).values_list('company_id', flat=True).first()
+        return bool(company_id) and Application.objects.filter(
+            student_id=student_id, internship__company_id=company_id,
+        ).exists()
+    return False
+
+
+def can_view_row(user, row):
+    if type(row).__name__ in SHARED_MODELS:
+        return True
+    if any(getattr(row, f'{name}_id', None) == user.id for name in AUTHOR_FIELDS):
+        return True
+    if type(row).__name__ == 'Message':
+        # Private between sender and recipient, already checked above
+        return False
+    if type(row).__name__ == 'Company':
+        # MOAs: coordinators and the company's own supervisors
+        role = _role(user)
+        return role == UserRole.COORDINATOR or (
+            role == UserRole.SUPERVISOR and CompanyUser.objects.filter(user=user, company=row).exists()
+        )
+    student_id = _row_student_id(row)
+    return student_id is not None and can_view_student(user, student_id)
+
+
+def can_view_media(user, file_path):
+    """Whether user may read the MEDIA_ROOT file at file_path"""
+    if user is None or not user.is_authenticated:
+        return False
+    if user.is_staff or user.is_superuser or _role(user) == UserRole.ADMIN:
+        return True
+    return any(can_view_row(user, row) for row in referencing_rows(file_path))
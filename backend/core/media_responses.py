@@ -0,0 +1,144 @@
+"""
+File responses for the EARIST OJT System media viewer
+Adds conditional GET (ETag / Last-Modified), single byte-range requests and an
+optional offload mode where nginx (X-Accel-Redirect) or Apache (X-Sendfile)
+sends the bytes after Django has resolved and checked the path.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def get_offload_mode():
+    """'' (Django streams the file), 'x-accel' (nginx) or 'x-sendfile' (Apache/lighttpd)"""
+    return getattr(settings, 'MEDIA_OFFLOAD_MODE', '')
+
+
+def resolve_media_path(file_path):
+    """Absolute path of file_path inside MEDIA_ROOT, or None if it escapes it or is missing"""
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    try:
+        full_path = os.path.realpath(os.path.join(media_root, file_path))
+    except ValueError:
+        # e.g. an embedded null byte
+        return None
+    if os.path.commonpath([media_root, full_path]) != media_root:
+        return None
+    if not os.path.isfile(full_path):
+        return None
+    return full_path
+
+
+def file_etag(stat_result):
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single satisfiable byte range, None when the header
+    should be ignored, or False when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        # Malformed or multi-range: serving the whole file is allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        # Strong comparison only
+        return not if_range.startswith('W/') and parse_etags(if_range) == [etag]
+    return parse_http_date_safe(if_range) == int(last_modified)
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _offload_response(full_path, content_type):
+    response = HttpResponse(content_type=content_type)
+    if get_offload_mode() == 'x-accel':
+        # nginx maps this internal location onto MEDIA_ROOT and handles Range itself
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        relative = os.path.relpath(full_path, os.path.realpath(settings.MEDIA_ROOT))
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + relative.replace(os.sep, '/')
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+def file_response(request, full_path):
+    """
+    Build the response for a file already resolved by resolve_media_path().
+    Answers 304/412 for conditional requests and 206/416 for Range requests.
+    """
+    stat_result = os.stat(full_path)
+    etag = file_etag(stat_result)
+    last_modified = stat_result.st_mtime
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    if content_type is None:
+        content_type = 'application/octet-stream'
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if conditional is not None:
+        response = conditional
+    elif get_offload_mode():
+        response = _offload_response(full_path, content_type)
+    else:
+        size = stat_result.st_size
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if range_header and request.method == 'GET' and _if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(range_header, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(full_path, start, end), status=206, content_type=content_type)
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Let the browser keep its copy but revalidate it (cheap 304) on every open
+    response['Cache-Control'] = 'private, no-cache'
+    return response
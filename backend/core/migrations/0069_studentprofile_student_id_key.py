@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+
+def populate_student_id_key(apps, schema_editor):
+    StudentProfile = apps.get_model('core', 'StudentProfile')
+    profiles = list(StudentProfile.objects.only('id', 'student_id'))
+    for profile in profiles:
+        profile.student_id_key = (profile.student_id or '').strip().upper()
+    StudentProfile.objects.bulk_update(profiles, ['student_id_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0068_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='student_id_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Case-folded Student ID used for indexed login lookups', max_length=255),
+        ),
+        migrations.RunPython(populate_student_id_key, migrations.RunPython.noop),
+    ]
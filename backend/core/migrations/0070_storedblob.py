@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:10
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0069_studentprofile_student_id_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(help_text='Storage name, e.g. blobs/ab/cd/<sha256>.pdf', max_length=255)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='FileField values pointing at this blob')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_referenced_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Stored Blob',
+                'verbose_name_plural': 'Stored Blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='internship_contract',
+            field=models.FileField(blank=True, help_text='Internship Contract (PDF, Doc, Image)', null=True, storage=core.storage.content_addressed_storage, upload_to='application_contracts/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='parents_consent',
+            field=models.FileField(blank=True, help_text="Parent's consent letter (PDF, Doc, Image)", null=True, storage=core.storage.content_addressed_storage, upload_to='application_consents/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='resume_file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.content_addressed_storage, upload_to='application_resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='student_health_record',
+            field=models.FileField(blank=True, help_text='Student health record (PDF, Doc, Image)', null=True, storage=core.storage.content_addressed_storage, upload_to='application_health_records/'),
+        ),
+        migrations.AlterField(
+            model_name='pretrainingrequirement',
+            name='document_file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.content_addressed_storage, upload_to='pre_training_docs/'),
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='certificate_of_registration',
+            field=models.FileField(blank=True, help_text='Certificate of Registration (COR) document', null=True, storage=core.storage.content_addressed_storage, upload_to='certificates_of_registration/'),
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='certification_file',
+            field=models.FileField(blank=True, null=True, storage=core.storage.content_addressed_storage, upload_to='certifications/'),
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=core.storage.content_addressed_storage, upload_to='resumes/'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_hours_ledger(apps, schema_editor):
+    from core.hours_ledger import rebuild_all
+    rebuild_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0070_storedblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HoursLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attendance_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('attendance_approved_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('attendance_pending_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('late_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('attendance_count', models.PositiveIntegerField(default=0)),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('late_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('journal_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('journal_approved_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('journal_pending_hours', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('journal_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='hours_ledgers', to='core.application')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours_ledgers', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='hoursledger',
+            constraint=models.UniqueConstraint(fields=('student', 'application'), name='hours_ledger_unique_application'),
+        ),
+        migrations.AddConstraint(
+            model_name='hoursledger',
+            constraint=models.UniqueConstraint(condition=models.Q(('application__isnull', True)), fields=('student',), name='hours_ledger_unique_unassigned'),
+        ),
+        migrations.RunPython(backfill_hours_ledger, migrations.RunPython.noop),
+    ]
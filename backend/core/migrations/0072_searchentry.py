@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_index(apps, schema_editor):
+    from core.search import create_index, rebuild_index
+    create_index(schema_editor)
+    rebuild_index(apps)
+
+
+def drop_search_index(apps, schema_editor):
+    from core.search import drop_index
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0071_hoursledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('journal', 'Daily Journal'), ('task', 'Task'), ('message', 'Message'), ('ticket', 'Support Ticket')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(help_text='Creation time of the indexed record')),
+                ('student', models.ForeignKey(blank=True, help_text='Student the record belongs to (empty for messages)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_unique_object'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_catalogue(apps, schema_editor):
+    from core.catalogue import sync_tags
+    from core.search import rebuild_index
+    sync_tags(apps=apps)
+    rebuild_index(apps, kinds=['internship'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0072_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InternshipTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Required Course'), ('college', 'Target College')], max_length=20)),
+                ('value', models.CharField(help_text='Upper-cased course or college code', max_length=100)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='searchentry',
+            name='kind',
+            field=models.CharField(choices=[('journal', 'Daily Journal'), ('task', 'Task'), ('message', 'Message'), ('ticket', 'Support Ticket'), ('internship', 'Internship')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['slots'], name='internship_slots_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['position_type'], name='internship_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['work_location'], name='internship_location_idx'),
+        ),
+        migrations.AddField(
+            model_name='internshiptag',
+            name='internship',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='core.internship'),
+        ),
+        migrations.AddIndex(
+            model_name='internshiptag',
+            index=models.Index(fields=['kind', 'value'], name='internship_tag_value_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='internshiptag',
+            constraint=models.UniqueConstraint(fields=('internship', 'kind', 'value'), name='internship_tag_unique'),
+        ),
+        migrations.RunPython(backfill_catalogue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0073_internship_catalogue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyjournal',
+            name='reviewed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailyjournal',
+            name='reviewed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_journals', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0074_journal_reviewer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='storedblob',
+            name='name',
+            field=models.CharField(help_text='Storage name, e.g. blobs/ab/cd/<sha256>.pdf', max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='storedblob',
+            name='sha256',
+            field=models.CharField(db_index=True, max_length=64),
+        ),
+    ]
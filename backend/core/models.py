@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .storage import content_addressed_storage
 
 # Role-based Access Control
 class UserRole(models.Model):
@@ -51,10 +54,10 @@ class StudentProfile(models.Model):
     address = models.TextField(blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
     certifications = models.TextField(blank=True, help_text="Comma-separated certifications")
-    certification_file = models.FileField(upload_to='certifications/', blank=True, null=True)
+    certification_file = models.FileField(upload_to='certifications/', storage=content_addressed_storage, blank=True, null=True)
     career_interests = models.TextField(blank=True)
     resume_url = models.URLField(blank=True)
-    resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    resume = models.FileField(upload_to='resumes/', storage=content_addressed_storage, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -64,7 +67,7 @@ class StudentProfile(models.Model):
     student_id = models.CharField(max_length=255, blank=True)
     birth_date = models.DateField(null=True, blank=True, help_text="Student's date of birth")
     sex = models.CharField(max_length=10, choices=[('Male', 'Male'), ('Female', 'Female')], blank=True)
-    certificate_of_registration = models.FileField(upload_to='certificates_of_registration/', blank=True, null=True, help_text="Certificate of Registration (COR) document")
+    certificate_of_registration = models.FileField(upload_to='certificates_of_registration/', storage=content_addressed_storage, blank=True, null=True, help_text="Certificate of Registration (COR) document")
     cor_verified = models.BooleanField(default=False, help_text="Whether the COR has been verified by the student")
     qr_code_token = models.CharField(max_length=255, blank=True, null=True, unique=True, help_text="Permanent encrypted token for QR code")
     qr_code_image = models.TextField(blank=True, null=True, help_text="Base64-encoded QR code image")
@@ -82,6 +85,20 @@ class StudentProfile(models.Model):
         ('GS', 'Graduate School'),
     ]
     college = models.CharField(max_length=10, choices=COLLEGE_CHOICES, blank=True, null=True)
+    student_id_key = models.CharField(max_length=255, blank=True, db_index=True, editable=False, help_text="Case-folded Student ID used for indexed login lookups")
+
+    @staticmethod
+    def normalize_student_id(value):
+        """Case-fold a Student ID the same way it is stored in student_id_key"""
+        return (value or '').strip().upper()
+
+    def save(self, *args, **kwargs):
+        """Keep the indexed login key in sync with student_id"""
+        self.student_id_key = self.normalize_student_id(self.student_id)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'student_id' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'student_id_key'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} Profile"
@@ -177,9 +194,46 @@ class Internship(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
 
+    class Meta:
+        # Catalogue filters and facets (see core/catalogue.py)
+        indexes = [
+            models.Index(fields=['slots'], name='internship_slots_idx'),
+            models.Index(fields=['position_type'], name='internship_type_idx'),
+            models.Index(fields=['work_location'], name='internship_location_idx'),
+        ]
+
     def __str__(self):
         return f"{self.position} at {self.company.name}"
 
+
+class InternshipTag(models.Model):
+    """
+    One required course or target college of an internship, split out of
+    Internship.required_courses and Company.target_colleges so the catalogue
+    can filter and count them with indexed GROUP BY queries.
+    """
+    COURSE = 'course'
+    COLLEGE = 'college'
+    KIND_CHOICES = [
+        (COURSE, 'Required Course'),
+        (COLLEGE, 'Target College'),
+    ]
+
+    internship = models.ForeignKey(Internship, on_delete=models.CASCADE, related_name='tags')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100, help_text="Upper-cased course or college code")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['internship', 'kind', 'value'], name='internship_tag_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value'], name='internship_tag_value_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.internship_id} {self.kind}: {self.value}"
+
 class Application(models.Model):
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="core_applications")
     internship = models.ForeignKey(Internship, on_delete=models.CASCADE)
@@ -197,10 +251,10 @@ class Application(models.Model):
     feedback = models.TextField(blank=True)
     cover_letter = models.TextField(blank=True)
     resume_url = models.URLField(blank=True, help_text="URL to student's resume (e.g., Google Drive, Dropbox link)")
-    resume_file = models.FileField(upload_to='application_resumes/', blank=True, null=True)
-    parents_consent = models.FileField(upload_to='application_consents/', blank=True, null=True, help_text="Parent's consent letter (PDF, Doc, Image)")
-    internship_contract = models.FileField(upload_to='application_contracts/', blank=True, null=True, help_text="Internship Contract (PDF, Doc, Image)")
-    student_health_record = models.FileField(upload_to='application_health_records/', blank=True, null=True, help_text="Student health record (PDF, Doc, Image)")
+    resume_file = models.FileField(upload_to='application_resumes/', storage=content_addressed_storage, blank=True, null=True)
+    parents_consent = models.FileField(upload_to='application_consents/', storage=content_addressed_storage, blank=True, null=True, help_text="Parent's consent letter (PDF, Doc, Image)")
+    internship_contract = models.FileField(upload_to='application_contracts/', storage=content_addressed_storage, blank=True, null=True, help_text="Internship Contract (PDF, Doc, Image)")
+    student_health_record = models.FileField(upload_to='application_health_records/', storage=content_addressed_storage, blank=True, null=True, help_text="Student health record (PDF, Doc, Image)")
 
     def __str__(self):
         return f"{self.student.username} - {self.internship.position}"
@@ -263,6 +317,8 @@ class DailyJournal(models.Model):
         ('Rejected', 'Rejected'),
     ])
     supervisor_comment = models.TextField(blank=True)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='reviewed_journals')
+    reviewed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -290,7 +346,7 @@ class PreTrainingRequirement(models.Model):
         ('Barangay Clearance', 'Barangay Clearance'),
         ('Other', 'Other'),
     ])
-    document_file = models.FileField(upload_to='pre_training_docs/', blank=True, null=True)
+    document_file = models.FileField(upload_to='pre_training_docs/', storage=content_addressed_storage, blank=True, null=True)
     document_url = models.URLField(blank=True)
     status = models.CharField(max_length=20, default='Pending', choices=[
         ('Pending', 'Pending'),
@@ -427,6 +483,43 @@ class Attendance(models.Model):
         return f"{self.student.username} - {self.date} - {self.status}"
 
 
+class HoursLedger(models.Model):
+    """
+    Running hours and record counts per student and application (application is
+    null for records not tied to one). Maintained by core.hours_ledger from the
+    Attendance and DailyJournal signals; don't edit by hand.
+    """
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='hours_ledgers')
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='hours_ledgers', null=True, blank=True)
+
+    attendance_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    attendance_approved_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    attendance_pending_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    late_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    attendance_count = models.PositiveIntegerField(default=0)
+    present_count = models.PositiveIntegerField(default=0)
+    late_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+
+    journal_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    journal_approved_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    journal_pending_hours = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    journal_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'application'], name='hours_ledger_unique_application'),
+            # NULLs never collide in the constraint above
+            models.UniqueConstraint(fields=['student'], condition=models.Q(application__isnull=True), name='hours_ledger_unique_unassigned'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.application_id or 'unassigned'}"
+
+
 class Task(models.Model):
     """Task Assignment for Interns"""
     title = models.CharField(max_length=200)
@@ -902,3 +995,85 @@ class Notification(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.title}"
 
+
+class OutboxEmail(models.Model):
+    """Queued outgoing email, delivered by the send_queued_emails worker"""
+    STATUS_CHOICES = [
+        ('Queued', 'Queued'),
+        ('Sending', 'Sending'),
+        ('Sent', 'Sent'),
+        ('Failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    body_text = models.TextField(blank=True)
+    body_html = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Queued')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the worker may try this message")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+    
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.status})"
+
+
+class StoredBlob(models.Model):
+    """A file in the content-addressed upload store (see core/storage.py)"""
+    sha256 = models.CharField(max_length=64, db_index=True)
+    # One row per stored file: the same bytes under another extension are a separate file
+    name = models.CharField(max_length=255, unique=True, help_text="Storage name, e.g. blobs/ab/cd/<sha256>.pdf")
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0, help_text="FileField values pointing at this blob")
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_referenced_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Stored Blob"
+        verbose_name_plural = "Stored Blobs"
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class SearchEntry(models.Model):
+    """
+    One searchable journal, task, message, support ticket or internship (see core/search.py).
+    The full-text index itself is an FTS5 table on SQLite or a generated tsvector
+    column on PostgreSQL, both created by raw SQL in migration 0072.
+    """
+    KIND_CHOICES = [
+        ('journal', 'Daily Journal'),
+        ('task', 'Task'),
+        ('message', 'Message'),
+        ('ticket', 'Support Ticket'),
+        ('internship', 'Internship'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    student = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='search_entries', help_text="Student the record belongs to (empty for messages)")
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    created_at = models.DateTimeField(help_text="Creation time of the indexed record")
+
+    class Meta:
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
@@ -0,0 +1,115 @@
+"""
+Notification helpers for the EARIST OJT System
+Keeps a per-user unread counter in the shared cache so most badge polls skip the database.
+The counter needs a cache shared by every worker (set REDIS_URL); with the default
+per-process LocMemCache each worker keeps its own copy. Either way it expires after
+NOTIFICATION_UNREAD_TTL seconds and is recounted, so drift or a missed update never lasts.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import Notification
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def get_unread_ttl():
+    """Seconds a cached unread count lives before it is recounted from the database"""
+    return getattr(settings, 'NOTIFICATION_UNREAD_TTL', 60)
+
+
+def _unread_key(user_id):
+    return f"notif_unread_{user_id}"
+
+
+def get_unread_count(user_id):
+    """Return the unread count, rebuilding it from the database on a cache miss"""
+    count = cache.get(_unread_key(user_id))
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        # add() so a concurrent incr/decr that already seeded the key wins; a
+        # count that raced a missed incr is only stale until the TTL runs out
+        cache.add(_unread_key(user_id), count, get_unread_ttl())
+    return max(count, 0)
+
+
+def increment_unread(user_id, amount=1):
+    """Atomically bump the unread counter after notifications are created"""
+    try:
+        cache.incr(_unread_key(user_id), amount)
+    except ValueError:
+        # Counter not seeded yet; the next read rebuilds it from the database
+        pass
+
+
+def decrement_unread(user_id, amount=1):
+    """Atomically lower the unread counter after notifications are read"""
+    try:
+        if cache.decr(_unread_key(user_id), amount) < 0:
+            cache.delete(_unread_key(user_id))
+    except ValueError:
+        pass
+
+
+def reset_unread(user_id):
+    cache.set(_unread_key(user_id), 0, get_unread_ttl())
+
+
+def create_notifications(notifications):
+    """
+    Insert many Notification objects in one query and bump each recipient's counter.
+    bulk_create skips post_save, so the counters are updated here instead.
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return []
+    created = Notification.objects.bulk_create(notifications)
+    per_user = {}
+    for notification in created:
+        if not notification.is_read:
+            per_user[notification.user_id] = per_user.get(notification.user_id, 0) + 1
+
+    def bump_counters():
+        for user_id, amount in per_user.items():
+            increment_unread(user_id, amount)
+
+    # Only touch the cache once the rows are really there
+    transaction.on_commit(bump_counters)
+    return created
+
+
+def paginate_notifications(user, cursor=None, since=None, limit=None):
+    """
+    Keyset-paginate a user's notifications, newest first.
+
+    cursor: id of the last notification from the previous page (older items follow)
+    since:  notification id or ISO timestamp; only newer notifications are returned
+    """
+    try:
+        limit = min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(limit, 1)
+
+    queryset = Notification.objects.filter(user=user).order_by('-id')
+
+    if since:
+        if str(since).isdigit():
+            queryset = queryset.filter(id__gt=int(since))
+        else:
+            since_dt = parse_datetime(str(since))
+            if since_dt:
+                queryset = queryset.filter(created_at__gt=since_dt)
+
+    if cursor and str(cursor).isdigit():
+        queryset = queryset.filter(id__lt=int(cursor))
+
+    items = list(queryset[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = items[-1].id if has_more and items else None
+
+    return items, next_cursor, has_more
@@ -0,0 +1,174 @@
+"""
+List pagination and projection for the EARIST OJT System
+Keyset (cursor) pagination, a ?fields= sparse fieldset and select_related /
+prefetch_related paths derived from the serializer, shared by the big list
+endpoints so response size and query count stay bounded as tables grow.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class ListCursorPagination(CursorPagination):
+    """
+    Cursor pagination over an indexed, nearly-unique ordering (e.g. -created_at),
+    so each page is a WHERE ... LIMIT query however deep the client scrolls.
+
+    Opt-in: a request without ?cursor= or ?page_size= gets the full list as
+    before, so existing clients that expect a plain array keep working.
+    New endpoints pass optional=False to always paginate.
+    """
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    ordering = '-id'
+
+    def __init__(self, ordering=None, optional=True):
+        if ordering:
+            self.ordering = ordering
+        self.optional = optional
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.optional and self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+def requested_fields(request):
+    """Top-level field names from ?fields=a,b,c, or None for every field"""
+    raw = request.query_params.get('fields', '')
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    return set(fields) or None
+
+
+def _relation_path(model, source, prefix):
+    """
+    Walk a dotted serializer source (e.g. 'student.get_full_name') across model
+    relations. Returns (select_related path, prefetch_related path, target model);
+    the walk stops at the first attribute that is not a relation.
+    """
+    select, prefetch = [], []
+    for attr in source.split('.'):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        if field.many_to_many or field.one_to_many or prefetch:
+            prefetch.append(attr)
+        else:
+            select.append(attr)
+        model = field.related_model
+
+    select_path = '__'.join(prefix + select) if select else None
+    prefetch_path = '__'.join(prefix + select + prefetch) if prefetch else None
+    return select_path, prefetch_path, model
+
+
+def related_paths(serializer, fields=None, prefix=None):
+    """
+    select_related and prefetch_related paths needed to serialize without N+1
+    queries. Follows nested serializers and dotted sources; SerializerMethodFields
+    declare what they touch through the serializer's method_field_relations.
+    """
+    prefix = prefix or []
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = serializer.Meta.model
+    hints = getattr(serializer, 'method_field_relations', {})
+    select, prefetch = set(), set()
+
+    for name, field in serializer.fields.items():
+        if field.write_only or (fields is not None and name not in fields):
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            select.update('__'.join(prefix + [path]) for path in hints.get(name, []))
+            continue
+        if field.source == '*':
+            continue
+        # A primary key relation only reads the local *_id column
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+
+        select_path, prefetch_path, _ = _relation_path(model, field.source, prefix)
+        if select_path:
+            select.add(select_path)
+        if prefetch_path:
+            prefetch.add(prefetch_path)
+            continue
+
+        if isinstance(field, serializers.BaseSerializer) and select_path:
+            nested_select, nested_prefetch = related_paths(field, prefix=select_path.split('__'))
+            select.update(nested_select)
+            prefetch.update(nested_prefetch)
+
+    # Only keep the deepest select_related path of each chain
+    select = {path for path in select if not any(other.startswith(path + '__') for other in select)}
+    return sorted(select), sorted(prefetch)
+
+
+def project(serializer, fields):
+    """Drop every field the client did not ask for before serializing"""
+    if fields is None:
+        return
+    target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+    for name in list(target.fields):
+        if name not in fields:
+            target.fields.pop(name)
+
+
+def _sparse(data, fields):
+    # to_representation overrides may add keys back (e.g. absolute file URLs)
+    if fields is None:
+        return data
+    return [{key: value for key, value in row.items() if key in fields} for row in data]
+
+
+def list_response(request, queryset, serializer_class, ordering, context=None):
+    """
+    Serialize queryset for a list endpoint: load the relations the (projected)
+    serializer needs, apply ?fields= and paginate when ?cursor= / ?page_size=
+    is given. ordering must start with a field that is cheap to seek on.
+    """
+    fields = requested_fields(request)
+    context = context if context is not None else {'request': request}
+
+    serializer = serializer_class(queryset, many=True, context=context)
+    project(serializer, fields)
+    select, prefetch = related_paths(serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    paginator = ListCursorPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    serializer.instance = page if page is not None else queryset
+    data = _sparse(serializer.data, fields)
+
+    if page is not None:
+        return paginator.get_paginated_response(data)
+    return Response(data)
+
+
+class ProjectedListMixin:
+    """
+    ViewSet mixin giving list() the same pagination and projection as
+    list_response. Set ordering on the view.
+    """
+    ordering = '-id'
+
+    def list(self, request, *args, **kwargs):
+        return list_response(
+            request,
+            self.filter_queryset(self.get_queryset()),
+            self.get_serializer_class(),
+            self.ordering,
+            self.get_serializer_context(),
+        )
@@ -0,0 +1,75 @@
+"""
+Ephemeral presence store for the EARIST OJT System
+Keeps typing indicators in the shared cache instead of the database
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def get_typing_ttl():
+    """Seconds a typing flag stays alive without being refreshed"""
+    return getattr(settings, 'TYPING_INDICATOR_TTL', 5)
+
+
+def uses_database_fallback():
+    """Whether typing indicators should still be stored in the TypingIndicator table"""
+    return getattr(settings, 'TYPING_INDICATOR_USE_DATABASE', False)
+
+
+def _typing_key(user_id, recipient_id):
+    return f"typing_{user_id}_{recipient_id}"
+
+
+def set_typing(user_id, recipient_id, is_typing):
+    """Mark user_id as typing (or not) to recipient_id"""
+    if uses_database_fallback():
+        return _set_typing_db(user_id, recipient_id, is_typing)
+
+    key = _typing_key(user_id, recipient_id)
+    if is_typing:
+        # Expiry is handled by the cache TTL, no cleanup needed
+        cache.set(key, True, get_typing_ttl())
+    else:
+        cache.delete(key)
+    return True
+
+
+def is_typing(user_id, recipient_id):
+    """Check whether user_id is currently typing to recipient_id"""
+    if uses_database_fallback():
+        return _is_typing_db(user_id, recipient_id)
+
+    return bool(cache.get(_typing_key(user_id, recipient_id), False))
+
+
+# ========== DATABASE FALLBACK ==========
+
+def _set_typing_db(user_id, recipient_id, is_typing):
+    from django.contrib.auth.models import User
+    from .models import TypingIndicator
+
+    if not User.objects.filter(id=recipient_id).exists():
+        return False
+
+    TypingIndicator.objects.update_or_create(
+        user_id=user_id,
+        recipient_id=recipient_id,
+        defaults={'is_typing': is_typing}
+    )
+    return True
+
+
+def _is_typing_db(user_id, recipient_id):
+    from .models import TypingIndicator
+
+    # Expired rows are treated as not typing without writing them back
+    time_threshold = timezone.now() - timedelta(seconds=get_typing_ttl())
+    return TypingIndicator.objects.filter(
+        user_id=user_id,
+        recipient_id=recipient_id,
+        is_typing=True,
+        last_typed_at__gte=time_threshold
+    ).exists()
@@ -0,0 +1,107 @@
+"""
+Required internship hours for the EARIST OJT System
+Compiles a college's CoordinatorSettings.hours_config into a course ->
+required-hours table once and caches it, so progress and list screens resolve
+each student's requirement with a dict lookup. The table is dropped whenever
+coordinator settings or profiles change (see core.signals).
+student_required_hours() and progress_percentage() are the one rule every
+progress screen uses.
+"""
+from django.core.cache import cache
+
+from .shared_cache import bounded_ttl
+
+DEFAULT_REQUIRED_HOURS = 486
+# Signals invalidate it; the TTL only bounds edge cases like role changes. A
+# per-process cache only sees this worker's invalidations, so there it is capped
+# at LOCAL_CACHE_TTL (see shared_cache.bounded_ttl).
+TABLE_TTL = 60 * 60
+
+
+def _cache_key(college):
+    return f"required_hours_{college}"
+
+
+def _normalize(value):
+    return value.upper().replace('.', '').replace(' ', '')
+
+
+def _parse_hours(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _match(programs, course):
+    """
+    First configured program matching the course: exact, either name contained
+    in the other, or equal after dropping dots and spaces ("B.S. IT" vs "BSIT").
+    """
+    course_upper = course.upper()
+    normalized_course = _normalize(course)
+    for program_upper, normalized_program, hours in programs:
+        if (program_upper == course_upper or
+                program_upper in course_upper or
+                course_upper in program_upper or
+                normalized_program in normalized_course):
+            return hours
+    return None
+
+
+def _compile(college):
+    from django.contrib.auth.models import User
+    from .models import CoordinatorSettings, StudentProfile, UserRole
+
+    programs = []
+    coordinator_id = User.objects.filter(
+        user_role__role=UserRole.COORDINATOR,
+        coordinator_profile__college=college,
+    ).order_by('id').values_list('id', flat=True).first()
+    if coordinator_id:
+        settings = CoordinatorSettings.objects.filter(coordinator_id=coordinator_id).only('hours_config').first()
+        for config in (settings.hours_config if settings else None) or []:
+            program = (config.get('program') or '').strip()
+            hours = _parse_hours(config.get('requiredHours'))
+            if program and hours is not None:
+                programs.append((program.upper(), _normalize(program), hours))
+
+    # Pre-resolve every course already on file; unmatched courses map to None
+    courses = StudentProfile.objects.filter(college=college).exclude(course='').values_list('course', flat=True).distinct()
+    return {
+        'programs': programs,
+        'courses': {course: _match(programs, course) for course in courses},
+    }
+
+
+def get_table(college):
+    table = cache.get(_cache_key(college))
+    if table is None:
+        table = _compile(college)
+        cache.set(_cache_key(college), table, bounded_ttl(TABLE_TTL))
+    return table
+
+
+def required_hours_for(college, course):
+    """Hours configured for a course in a college, or None when no program matches"""
+    if not college or not course:
+        return None
+    table = get_table(college)
+    if course in table['courses']:
+        return table['courses'][course]
+    # A course no student had when the table was built
+    return _match(table['programs'], course)
+
+
+def student_required_hours(profile):
+    """Hours a student must render: their course's configured hours, else DEFAULT_REQUIRED_HOURS"""
+    configured = required_hours_for(profile.college, profile.course) if profile else None
+    return DEFAULT_REQUIRED_HOURS if configured is None else configured
+
+
+def progress_percentage(rendered, required):
+    return min(100, (rendered / required * 100) if required > 0 else 0)
+
+
+def invalidate(*colleges):
+    cache.delete_many([_cache_key(college) for college in colleges if college])
@@ -0,0 +1,220 @@
+"""
+Bulk journal and attendance review for the EARIST OJT System
+Selects a reviewer's records by id list or date range, applies the decision
+with a single scoped UPDATE, refreshes the hours ledger once per student and
+sends each student one digest notification and email instead of one per entry.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Application, Attendance, DailyJournal, Notification, UserRole
+from . import hours_ledger
+from . import notifications as notification_utils
+
+# action -> new status; only records still awaiting review are touched
+JOURNAL_ACTIONS = {'approve': 'Approved', 'reject': 'Rejected'}
+JOURNAL_REVIEWABLE = 'Submitted'
+ATTENDANCE_ACTIONS = {'approve': 'Present', 'reject': 'Absent'}
+ATTENDANCE_REVIEWABLE = 'Pending'
+
+
+def scope_students(user):
+    """Student ids whose journals and attendance this user may review"""
+    from django.contrib.auth.models import User
+
+    students = User.objects.filter(user_role__role=UserRole.STUDENT)
+    role = user.user_role.role if hasattr(user, 'user_role') else None
+
+    if role == UserRole.ADMIN or (user.is_staff and not role):
+        return students.values('id')
+    if role == UserRole.COORDINATOR:
+        if hasattr(user, 'coordinator_profile') and user.coordinator_profile.college:
+            return students.filter(student_profile__college=user.coordinator_profile.college).values('id')
+        return students.none().values('id')
+    if role == UserRole.SUPERVISOR:
+        if hasattr(user, 'company_user_profile'):
+            return Application.objects.filter(
+                status='Approved', internship__company_id=user.company_user_profile.company_id
+            ).values('student_id')
+        return students.none().values('id')
+    return students.none().values('id')
+
+
+def parse_selection(data):
+    """
+    (selection kwargs, error message) from a request body with either "ids"
+    or a "date_from"/"date_to" range, optionally narrowed by "student_id".
+    """
+    from django.utils.dateparse import parse_date
+
+    selection = {}
+    ids = data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            return None, 'ids must be a non-empty list'
+        try:
+            selection['ids'] = [int(record_id) for record_id in ids]
+        except (TypeError, ValueError):
+            return None, 'ids must be numbers'
+
+    for key in ('date_from', 'date_to'):
+        if data.get(key):
+            try:
+                selection[key] = parse_date(str(data[key]))
+            except ValueError:
+                selection[key] = None
+            if selection[key] is None:
+                return None, f'{key} must be a date (YYYY-MM-DD)'
+
+    if not selection:
+        return None, 'Provide ids or a date_from/date_to range'
+
+    if data.get('student_id'):
+        try:
+            selection['student_id'] = int(data['student_id'])
+        except (TypeError, ValueError):
+            return None, 'student_id must be a number'
+    return selection, None
+
+
+def _select(queryset, ids=None, date_from=None, date_to=None, student_id=None):
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if student_id:
+        queryset = queryset.filter(student_id=student_id)
+    return queryset
+
+
+def bulk_review_journals(user, action, comment='', **selection):
+    """
+    Approve or reject every Submitted journal in the selection (ids, date_from,
+    date_to, student_id) that belongs to a student the user may review.
+    Returns {'updated', 'status', 'ids', 'students'}.
+    """
+    new_status = JOURNAL_ACTIONS[action]
+    now = timezone.now()
+
+    with transaction.atomic():
+        journals = _select(
+            DailyJournal.objects.filter(status=JOURNAL_REVIEWABLE, student_id__in=scope_students(user)),
+            **selection,
+        )
+        rows = list(journals.select_for_update().order_by('date').values('id', 'student_id', 'date', 'hours_rendered'))
+        if not rows:
+            return {'updated': 0, 'status': new_status, 'ids': [], 'students': 0}
+
+        fields = {'status': new_status, 'reviewed_by': user, 'reviewed_at': now, 'updated_at': now}
+        if comment:
+            fields['supervisor_comment'] = comment
+        # update() skips post_save, so the ledger refresh below stands in for the signal
+        DailyJournal.objects.filter(id__in=[row['id'] for row in rows]).update(**fields)
+
+        by_student = _group_by_student(rows)
+        for student_id in by_student:
+            hours_ledger.refresh_student(student_id)
+        _queue_digests(by_student, 'journal', new_status, comment)
+
+    return {'updated': len(rows), 'status': new_status, 'ids': [row['id'] for row in rows], 'students': len(by_student)}
+
+
+def bulk_review_attendance(user, action, notes='', **selection):
+    """
+    Mark every Pending attendance record in the selection Present (approve) or
+    Absent (reject, which also clears its hours), recording the user in marked_by.
+    Returns {'updated', 'status', 'ids', 'students'}.
+    """
+    new_status = ATTENDANCE_ACTIONS[action]
+
+    with transaction.atomic():
+        records = _select(
+            Attendance.objects.filter(status=ATTENDANCE_REVIEWABLE, student_id__in=scope_students(user)),
+            **selection,
+        )
+        rows = list(records.select_for_update().order_by('date').values('id', 'student_id', 'date', 'hours_rendered'))
+        if not rows:
+            return {'updated': 0, 'status': new_status, 'ids': [], 'students': 0}
+
+        fields = {'status': new_status, 'marked_by': user}
+        if action == 'reject':
+            # Progress and grading sum hours_rendered over every status, so a
+            # rejected day must not keep its hours (the digest still lists them)
+            fields['hours_rendered'] = 0
+        if notes:
+            fields['notes'] = notes
+        Attendance.objects.filter(id__in=[row['id'] for row in rows]).update(**fields)
+
+        by_student = _group_by_student(rows)
+        for student_id in by_student:
+            hours_ledger.refresh_student(student_id)
+        _queue_digests(by_student, 'attendance', new_status, notes)
+
+    return {'updated': len(rows), 'status': new_status, 'ids': [row['id'] for row in rows], 'students': len(by_student)}
+
+
+def _group_by_student(rows):
+    by_student = defaultdict(list)
+    for row in rows:
+        by_student[row['student_id']].append(row)
+    return by_student
+
+
+def _queue_digests(by_student, record_type, new_status, remark):
+    """One notification and one email per student summarising every reviewed entry"""
+    from django.contrib.auth.models import User
+    from .email_notifications import build_notification_email, send_bulk_emails
+
+    label = 'journal entries' if record_type == 'journal' else 'attendance records'
+    title = f"{'Journal' if record_type == 'journal' else 'Attendance'} Review: {new_status}"
+
+    notification_utils.create_notifications(
+        Notification(
+            user_id=student_id,
+            title=title,
+            message=f"{len(rows)} {label} marked {new_status}: {_date_list(rows)}.",
+            notification_type=record_type,
+            related_id=rows[0]['id'] if len(rows) == 1 else None,
+        )
+        for student_id, rows in by_student.items()
+    )
+
+    students = User.objects.filter(id__in=list(by_student)).only('id', 'email', 'username', 'first_name', 'last_name')
+    messages = []
+    for student in students:
+        if not student.email:
+            continue
+        rows = by_student[student.id]
+        items = ''.join(
+            f"<div class=\"info-row\"><span class=\"info-label\">{row['date'].strftime('%B %d, %Y')}:</span> {row['hours_rendered']} hours</div>"
+            for row in rows
+        )
+        content = f"""
+    <p>{len(rows)} of your {label} {'has' if len(rows) == 1 else 'have'} been reviewed and marked <strong>{new_status}</strong>.</p>
+
+    <div class="highlight-box">{items}</div>
+    """
+        if remark:
+            content += f"""
+        <p><strong>Supervisor Comments:</strong><br>
+        <em>"{remark}"</em></p>
+        """
+        page = 'journals' if record_type == 'journal' else 'attendance'
+        messages.append(build_notification_email(
+            student.email, title, student.get_full_name() or student.username, content,
+            f"http://localhost:3000/student/{page}", "View Details",
+        ))
+
+    # Inserted into the outbox only once the review is committed
+    transaction.on_commit(lambda: send_bulk_emails(messages))
+
+
+def _date_list(rows, limit=5):
+    dates = [row['date'].strftime('%b %d') for row in rows[:limit]]
+    if len(rows) > limit:
+        dates.append(f"and {len(rows) - limit} more")
+    return ', '.join(dates)
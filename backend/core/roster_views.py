@@ -0,0 +1,183 @@
+"""
+Roster Progress API Views
+Hours, progress, tasks, attendance breakdown and evaluation counts for a whole
+company or college in one paginated call, built from a fixed number of grouped
+queries instead of one progress request per intern.
+"""
+
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator, EmptyPage
+from django.db.models import Count, Q, Sum
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from .models import UserRole, Application, HoursLedger, Task, PerformanceEvaluation
+from .permissions import role_required
+from .required_hours import progress_percentage, student_required_hours
+from .hours_ledger import HOURS_FIELDS, COUNT_FIELDS, rendered_hours
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _placed_at(company_id):
+    return Application.objects.filter(status='Approved', internship__company_id=company_id).values('student_id')
+
+
+def _roster_queryset(request):
+    """
+    Students visible to the caller, or an error Response.
+    Supervisors see interns with an approved application at their company,
+    coordinators see their college; admins may filter by ?company= or ?college=.
+    """
+    role = request.user.user_role.role
+    students = User.objects.filter(user_role__role=UserRole.STUDENT)
+
+    if role == UserRole.SUPERVISOR:
+        if not hasattr(request.user, 'company_user_profile'):
+            return None, Response({'error': 'No company profile found'}, status=status.HTTP_404_NOT_FOUND)
+        company_id = request.user.company_user_profile.company_id
+        return students.filter(id__in=_placed_at(company_id)), None
+
+    if role == UserRole.COORDINATOR:
+        college = getattr(getattr(request.user, 'coordinator_profile', None), 'college', None)
+        if not college:
+            return None, Response({'error': 'Coordinator college not found'}, status=status.HTTP_400_BAD_REQUEST)
+        return students.filter(student_profile__college=college), None
+
+    # Admin
+    company_id = request.query_params.get('company')
+    college = request.query_params.get('college')
+    if company_id:
+        if not company_id.isdigit():
+            return None, Response({'error': 'company must be a company id'}, status=status.HTTP_400_BAD_REQUEST)
+        students = students.filter(id__in=_placed_at(company_id))
+    if college:
+        students = students.filter(student_profile__college=college)
+    return students, None
+
+
+def _page_params(request):
+    try:
+        page_number = max(int(request.query_params.get('page', 1)), 1)
+        page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return None, None
+    return page_number, min(max(page_size, 1), MAX_PAGE_SIZE)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.SUPERVISOR, UserRole.COORDINATOR, UserRole.ADMIN])
+def roster_progress(request):
+    """
+    Progress for every student on the caller's roster, paginated
+    (?page=, ?page_size= up to 200, ?search= on name / username / Student ID).
+    """
+    try:
+        students, error = _roster_queryset(request)
+        if error:
+            return error
+
+        search = request.query_params.get('search', '').strip()
+        if search:
+            students = students.filter(
+                Q(first_name__icontains=search) | Q(last_name__icontains=search) |
+                Q(username__icontains=search) | Q(student_profile__student_id__icontains=search)
+            )
+
+        page_number, page_size = _page_params(request)
+        if page_number is None:
+            return Response({'error': 'page and page_size must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        students = students.select_related('student_profile').only(
+            'id', 'username', 'first_name', 'last_name', 'email',
+            'student_profile__student_id', 'student_profile__course', 'student_profile__college',
+        ).order_by('last_name', 'first_name', 'id')
+        paginator = Paginator(students, page_size)
+        try:
+            page = paginator.page(page_number)
+        except EmptyPage:
+            page = None
+        page_students = list(page.object_list) if page else []
+        student_ids = [student.id for student in page_students]
+
+        # One grouped query per source, whatever the page size
+        applications = {
+            app.student_id: app
+            for app in Application.objects.filter(student_id__in=student_ids, status='Approved')
+            .select_related('internship__company').order_by('applied_at')
+        }
+        ledgers = {
+            row.pop('student_id'): row
+            for row in HoursLedger.objects.filter(student_id__in=student_ids).order_by()
+            .values('student_id').annotate(**{field: Sum(field) for field in HOURS_FIELDS + COUNT_FIELDS})
+        }
+        tasks = {
+            row['student_id']: row
+            for row in Task.objects.filter(student_id__in=student_ids).order_by()
+            .values('student_id').annotate(total=Count('id'), completed=Count('id', filter=Q(status='Completed')))
+        }
+        evaluations = dict(
+            PerformanceEvaluation.objects.filter(student_id__in=student_ids).order_by()
+            .values('student_id').annotate(count=Count('id')).values_list('student_id', 'count')
+        )
+
+        results = []
+        for student in page_students:
+            profile = getattr(student, 'student_profile', None)
+            ledger = ledgers.get(student.id, {})
+            task_counts = tasks.get(student.id, {})
+            application = applications.get(student.id)
+
+            # Same hours and requirement as the per-student progress pages
+            required_hours = student_required_hours(profile)
+            attendance_hours = rendered_hours(ledger)
+            progress = progress_percentage(attendance_hours, required_hours)
+            tasks_total = task_counts.get('total', 0)
+            tasks_completed = task_counts.get('completed', 0)
+
+            results.append({
+                'student_id': student.id,
+                'student_name': student.get_full_name() or student.username,
+                'student_email': student.email,
+                'student_id_number': profile.student_id if profile else '',
+                'course': profile.course if profile else '',
+                'college': profile.college if profile else '',
+                'company_name': application.internship.company.name if application and application.internship.company else None,
+                'position': application.internship.position if application else None,
+
+                'total_hours': round(attendance_hours, 2),
+                'attendance_hours': round(attendance_hours, 2),
+                'journal_hours': round(float(ledger.get('journal_hours') or 0), 2),
+                'approved_journal_hours': round(float(ledger.get('journal_approved_hours') or 0), 2),
+                'required_hours': required_hours,
+                'progress_percentage': round(progress, 2),
+
+                'tasks_total': tasks_total,
+                'tasks_completed': tasks_completed,
+                'task_completion': round(tasks_completed / tasks_total * 100, 2) if tasks_total else 0,
+
+                'attendance': {
+                    'total_records': ledger.get('attendance_count') or 0,
+                    'present_count': ledger.get('present_count') or 0,
+                    'late_count': ledger.get('late_count') or 0,
+                    'absent_count': ledger.get('absent_count') or 0,
+                    'pending_count': ledger.get('pending_count') or 0,
+                    'late_hours': round(float(ledger.get('late_hours') or 0), 2),
+                },
+                'journal_count': ledger.get('journal_count') or 0,
+                'evaluation_count': evaluations.get(student.id, 0),
+            })
+
+        return Response({
+            'count': paginator.count,
+            'page': page_number,
+            'page_size': page_size,
+            'num_pages': paginator.num_pages,
+            'results': results,
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
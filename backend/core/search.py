@@ -0,0 +1,363 @@
+"""
+Full-text search for the EARIST OJT System
+Daily journals, tasks, messages, support tickets and internships are copied
+into SearchEntry rows, kept current by signals (see core.signals), and indexed
+by SQLite FTS5 or a PostgreSQL tsvector column. Searches are ranked (bm25 /
+ts_rank) and scoped to what the caller may already see in the list views;
+the internship catalogue (core.catalogue) filters with matching_ids.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+FTS_TABLE = 'core_searchentry_fts'
+MAX_TERMS = 8
+SNIPPET_LENGTH = 160
+TITLE_WEIGHT = 4.0  # title matches count this much more than body matches
+
+# SQLite: external-content FTS5 table over core_searchentry, synced by triggers.
+# Django rebuilds a SQLite table on most ALTERs, dropping its triggers, so any
+# later schema change to SearchEntry must re-run these statements.
+SQLITE_INDEX_SQL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, body, content='core_searchentry', content_rowid='id', tokenize='porter unicode61')",
+    f"""CREATE TRIGGER core_searchentry_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER core_searchentry_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER core_searchentry_au AFTER UPDATE ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS core_searchentry_ai",
+    "DROP TRIGGER IF EXISTS core_searchentry_ad",
+    "DROP TRIGGER IF EXISTS core_searchentry_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL: a stored generated column needs no triggers
+POSTGRES_INDEX_SQL = [
+    """ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING GIN (search_vector)",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS core_searchentry_vector_idx",
+    "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+
+# ---------- Indexed content ----------
+
+def _journal_entry(journal):
+    return {
+        'student_id': journal.student_id,
+        'title': f"Journal {journal.date}",
+        'body': '\n'.join(filter(None, [journal.activities, journal.learning_outcomes])),
+        'created_at': journal.created_at,
+    }
+
+
+def _task_entry(task):
+    return {
+        'student_id': task.student_id,
+        'title': task.title,
+        'body': '\n'.join(filter(None, [task.description, task.student_notes, task.supervisor_feedback])),
+        'created_at': task.created_at,
+    }
+
+
+def _message_entry(message):
+    return {
+        'student_id': None,
+        'title': message.subject,
+        'body': message.message,
+        'created_at': message.created_at,
+    }
+
+
+def _ticket_entry(ticket):
+    return {
+        'student_id': ticket.student_id,
+        'title': ticket.subject,
+        'body': '\n'.join(filter(None, [ticket.message, ticket.admin_response])),
+        'created_at': ticket.created_at,
+    }
+
+
+def _internship_entry(internship):
+    return {
+        'student_id': None,
+        'title': internship.position,
+        'body': '\n'.join(filter(None, [internship.description, internship.required_skills])),
+        'created_at': internship.created_at or timezone.now(),
+    }
+
+
+# kind -> (model name, entry builder, source fields the entry reads)
+SOURCES = {
+    'journal': ('DailyJournal', _journal_entry, {'student', 'date', 'activities', 'learning_outcomes'}),
+    'task': ('Task', _task_entry, {'student', 'title', 'description', 'student_notes', 'supervisor_feedback'}),
+    'message': ('Message', _message_entry, {'subject', 'message'}),
+    'ticket': ('SupportTicket', _ticket_entry, {'student', 'subject', 'message', 'admin_response'}),
+    'internship': ('Internship', _internship_entry, {'position', 'description', 'required_skills'}),
+}
+KIND_FOR_MODEL = {model_name: kind for kind, (model_name, _, _) in SOURCES.items()}
+
+# Kinds the /search/ API returns; internships are searched through the catalogue
+SCOPED_KINDS = ['journal', 'task', 'message', 'ticket']
+
+
+def index_object(instance, update_fields=None):
+    """Create or refresh the SearchEntry for a saved journal, task, message or ticket"""
+    from .models import SearchEntry
+
+    kind = KIND_FOR_MODEL[type(instance).__name__]
+    _, build, indexed_fields = SOURCES[kind]
+    # e.g. marking a message read never touches indexed text
+    if update_fields and not indexed_fields.intersection(update_fields):
+        return
+
+    values = build(instance)
+    entry = SearchEntry.objects.filter(kind=kind, object_id=instance.pk).first()
+    if entry is None:
+        SearchEntry.objects.create(kind=kind, object_id=instance.pk, **values)
+    elif (entry.student_id, entry.title, entry.body) != (values['student_id'], values['title'], values['body']):
+        for field, value in values.items():
+            setattr(entry, field, value)
+        entry.save()
+
+
+def remove_object(instance):
+    from .models import SearchEntry
+
+    kind = KIND_FOR_MODEL[type(instance).__name__]
+    SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def rebuild_index(apps=None, kinds=None):
+    """
+    Re-create the SearchEntry rows of `kinds` (every kind when None) from the
+    source tables. Pass the migration `apps` registry when running from a
+    migration. Returns the entry count.
+    """
+    if apps is None:
+        from django.apps import apps
+    SearchEntry = apps.get_model('core', 'SearchEntry')
+    kinds = kinds or list(SOURCES)
+
+    SearchEntry.objects.filter(kind__in=kinds).delete()
+    count = 0
+    for kind in kinds:
+        model_name, build, _ = SOURCES[kind]
+        model = apps.get_model('core', model_name)
+        batch = []
+        for instance in model.objects.order_by('pk').iterator(chunk_size=1000):
+            batch.append(SearchEntry(kind=kind, object_id=instance.pk, **build(instance)))
+            if len(batch) >= 1000:
+                SearchEntry.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def create_index(schema_editor):
+    """Create the backend's full-text index; other databases fall back to LIKE"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                print("⚠️ SQLite was built without FTS5; search will use LIKE matching")
+                return
+        statements = SQLITE_INDEX_SQL
+    elif vendor == 'postgresql':
+        statements = POSTGRES_INDEX_SQL
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_index(schema_editor):
+    statements = {'sqlite': SQLITE_DROP_SQL, 'postgresql': POSTGRES_DROP_SQL}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+# ---------- Querying ----------
+
+def parse_terms(query):
+    """Lower-cased word terms of a free-text query; operators and quotes are dropped"""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+_fts_table_present = None
+
+
+def _has_fts_table():
+    global _fts_table_present
+    if _fts_table_present is None:
+        _fts_table_present = FTS_TABLE in connection.introspection.table_names()
+    return _fts_table_present
+
+
+def scope_for(user):
+    """
+    Q over SearchEntry limited to what the user can see elsewhere: own messages;
+    tickets for staff or their owner; journals and tasks of the coordinator's
+    college, the supervisor's placed interns, everyone for admins, or the
+    student's own.
+    """
+    from .models import Application, Message, UserRole
+
+    own_messages = Message.objects.filter(
+        Q(sender=user, deleted_by_sender=False) | Q(recipient=user, deleted_by_recipient=False)
+    ).values('id')
+    scope = Q(kind='message', object_id__in=own_messages)
+
+    scope |= Q(kind='ticket') if user.is_staff else Q(kind='ticket', student=user)
+
+    role = getattr(getattr(user, 'user_role', None), 'role', None)
+    records = Q(kind__in=['journal', 'task'])
+    if role == UserRole.ADMIN or (role is None and user.is_staff):
+        scope |= records
+    elif role == UserRole.COORDINATOR:
+        college = getattr(getattr(user, 'coordinator_profile', None), 'college', None)
+        if college:
+            scope |= records & Q(student__student_profile__college=college)
+    elif role == UserRole.SUPERVISOR:
+        company_id = getattr(getattr(user, 'company_user_profile', None), 'company_id', None)
+        if company_id:
+            placed = Application.objects.filter(status='Approved', internship__company_id=company_id).values('student_id')
+            scope |= records & Q(student_id__in=placed)
+    else:
+        scope |= records & Q(student=user)
+    return scope
+
+
+def matching_ids(kind, query):
+    """
+    Subquery of the object ids of `kind` whose entry matches every term of
+    query, for use as filter(id__in=...); None when the query has no terms.
+    """
+    from .models import SearchEntry
+
+    terms = parse_terms(query)
+    if not terms:
+        return None
+
+    if connection.vendor == 'sqlite' and _has_fts_table():
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return RawSQL(
+            f"SELECT entry.object_id FROM core_searchentry entry JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = entry.id "
+            f"WHERE {FTS_TABLE} MATCH %s AND entry.kind = %s",
+            (match, kind),
+        )
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return RawSQL(
+            "SELECT object_id FROM core_searchentry WHERE search_vector @@ to_tsquery('english', %s) AND kind = %s",
+            (tsquery, kind),
+        )
+
+    entries = SearchEntry.objects.filter(kind=kind)
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return entries.values('object_id')
+
+
+def _ranked_ids(terms, entries, limit, offset):
+    """[(entry id, rank)] best first, restricted to the entries queryset"""
+    scoped_sql, scoped_params = entries.values('id').query.sql_with_params()
+
+    if connection.vendor == 'sqlite' and _has_fts_table():
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT rowid, -bm25({FTS_TABLE}, %s, 1.0) AS score FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({scoped_sql}) "
+            f"ORDER BY score DESC, rowid DESC LIMIT %s OFFSET %s"
+        )
+        params = [TITLE_WEIGHT, match, *scoped_params, limit, offset]
+    elif connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            "SELECT id, ts_rank(search_vector, query) AS score "
+            "FROM core_searchentry, to_tsquery('english', %s) query "
+            f"WHERE search_vector @@ query AND id IN ({scoped_sql}) "
+            "ORDER BY score DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        params = [tsquery, *scoped_params, limit, offset]
+    else:
+        # No full-text index: every term must appear, newest first
+        for term in terms:
+            entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        ids = entries.order_by('-created_at', '-id').values_list('id', flat=True)[offset:offset + limit]
+        return [(entry_id, 0.0) for entry_id in ids]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(entry_id, float(score)) for entry_id, score in cursor.fetchall()]
+
+
+def _snippet(text, terms):
+    """Excerpt of text around the first matching term"""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(min(positions) - SNIPPET_LENGTH // 4, 0) if positions else 0
+    excerpt = ' '.join(text[start:start + SNIPPET_LENGTH].split())
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + SNIPPET_LENGTH < len(text) else ''
+    return f"{prefix}{excerpt}{suffix}"
+
+
+def search(user, query, kinds=None, limit=20, offset=0):
+    """
+    Ranked matches for query among the records user may see.
+    Returns (results, has_more); each result is {type, id, title, snippet,
+    score, rank, created_at, student_id, student_name}. score is the raw
+    relevance (bm25 / ts_rank; higher is better, 0.0 without a full-text
+    index) and rank the 1-based position across pages.
+    """
+    from .models import SearchEntry
+
+    terms = parse_terms(query)
+    if not terms:
+        return [], False
+
+    entries = SearchEntry.objects.filter(scope_for(user))
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+
+    # One extra row tells whether another page exists without counting
+    ranked = _ranked_ids(terms, entries, limit + 1, offset)
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+
+    rows = SearchEntry.objects.select_related('student').in_bulk([entry_id for entry_id, _ in ranked])
+    results = []
+    for position, (entry_id, score) in enumerate(ranked, start=offset + 1):
+        entry = rows[entry_id]
+        results.append({
+            'type': entry.kind,
+            'id': entry.object_id,
+            'title': entry.title,
+            'snippet': _snippet(entry.body, terms),
+            # Unrounded: bm25 scores on a small corpus are often well below 1e-4
+            'score': score,
+            'rank': position,
+            'created_at': entry.created_at,
+            'student_id': entry.student_id,
+            'student_name': (entry.student.get_full_name() or entry.student.username) if entry.student else None,
+        })
+    return results, has_more
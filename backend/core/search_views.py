@@ -0,0 +1,53 @@
+"""
+Search API Views
+One ranked full-text search across daily journals, tasks, messages and support
+tickets, limited to the records the caller can already open elsewhere.
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from .search import SCOPED_KINDS, search as run_search
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Search with ?q= (every word must match, prefixes allowed), optionally
+    ?type=journal,task,message,ticket, paginated with ?page= and ?page_size=.
+    """
+    try:
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = [kind.strip() for kind in request.query_params.get('type', '').split(',') if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in SCOPED_KINDS]
+        if unknown:
+            return Response({
+                'error': f"Unknown type: {', '.join(unknown)}",
+                'types': SCOPED_KINDS,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({'error': 'page and page_size must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results, has_more = run_search(request.user, query, kinds=kinds or None, limit=page_size, offset=(page - 1) * page_size)
+        return Response({
+            'query': query,
+            'page': page,
+            'page_size': page_size,
+            'has_more': has_more,
+            'results': results,
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2,15 +2,43 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.db import IntegrityError
+from django.db.models import F
 from .models import (
-    Company, Internship, Application, StudentProfile, UserActivityLog,
+    UserRole, Company, Internship, Application, StudentProfile, UserActivityLog,
     Supervisor, CompanyUser, DailyJournal, PreTrainingRequirement,
     DocumentTemplate, Attendance, Task, PerformanceEvaluation,
     Notice, SupportTicket, CoordinatorProfile, NarrativeReport, SupervisorDocument, Notification,
     TypingIndicator
 )
+from .thumbnails import thumbnail_url, thumbnail_urls
+
+# Role and profile columns annotated onto User rows by annotate_user_profiles
+USER_PROFILE_ANNOTATIONS = {
+    'annotated_role': 'user_role__role',
+    'annotated_student_profile_id': 'student_profile__id',
+    'annotated_student_id': 'student_profile__student_id',
+    'annotated_course': 'student_profile__course',
+    'annotated_year': 'student_profile__year',
+    'annotated_section': 'student_profile__section',
+    'annotated_student_college': 'student_profile__college',
+    'annotated_coordinator_college': 'coordinator_profile__college',
+}
+
+
+def annotate_user_profiles(queryset):
+    """
+    Add the role and profile columns UserSerializer reads to a User queryset,
+    so serializing any number of users is a single LEFT JOIN query instead of
+    up to five one-to-one lookups per user.
+    """
+    return queryset.annotate(**{name: F(path) for name, path in USER_PROFILE_ANNOTATIONS.items()})
+
 
 class UserSerializer(serializers.ModelSerializer):
+    """
+    Reads role and profile data from annotate_user_profiles columns when the
+    instance carries them, and from the one-to-one relations otherwise.
+    """
     role = serializers.SerializerMethodField()
     role_display = serializers.SerializerMethodField()
     college = serializers.SerializerMethodField()
@@ -19,18 +47,32 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_active', 'date_joined', 'role', 'role_display', 'college', 'student_profile']
-    
+
+    @staticmethod
+    def _is_annotated(obj):
+        return hasattr(obj, 'annotated_role')
+
     def get_role(self, obj):
-        if hasattr(obj, 'user_role'):
+        if self._is_annotated(obj):
+            if obj.annotated_role is not None:
+                return obj.annotated_role
+        elif hasattr(obj, 'user_role'):
             return obj.user_role.role
         return 'admin' if obj.is_staff else 'student'
     
     def get_role_display(self, obj):
-        if hasattr(obj, 'user_role'):
+        if self._is_annotated(obj):
+            if obj.annotated_role is not None:
+                return dict(UserRole.ROLE_CHOICES).get(obj.annotated_role, obj.annotated_role)
+        elif hasattr(obj, 'user_role'):
             return obj.user_role.get_role_display()
         return 'Administrator' if obj.is_staff else 'Student'
 
     def get_college(self, obj):
+        if self._is_annotated(obj):
+            if obj.annotated_student_profile_id is not None:
+                return obj.annotated_student_college
+            return obj.annotated_coordinator_college
         if hasattr(obj, 'student_profile'):
             return obj.student_profile.college
         elif hasattr(obj, 'coordinator_profile'):
@@ -39,6 +81,15 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_student_profile(self, obj):
         """Include student_profile data if it exists"""
+        if self._is_annotated(obj):
+            if obj.annotated_student_profile_id is None:
+                return None
+            return {
+                'student_id': obj.annotated_student_id,
+                'course': obj.annotated_course,
+                'year': obj.annotated_year,
+                'section': obj.annotated_section,
+            }
         if hasattr(obj, 'student_profile'):
             return {
                 'student_id': obj.student_profile.student_id,
@@ -94,6 +145,9 @@ class StudentProfileSerializer(serializers.ModelSerializer):
             else:
                 representation['certification_file'] = instance.certification_file.url
         
+        # Size-specific thumbnail URLs so lists don't load the full-resolution upload
+        representation['profile_picture_thumbnails'] = thumbnail_urls(self.context.get('request'), instance.profile_picture)
+        
         return representation
     
     def update(self, instance, validated_data):
@@ -252,7 +306,13 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
     def validate(self, data):
-        user = authenticate(username=data['username'], password=data['password'])
+        user = self.context.get('user')
+        if user is not None and user.username == data['username']:
+            # The login view already loaded this user; skip the second lookup authenticate() does
+            if not (user.is_active and user.check_password(data['password'])):
+                user = None
+        else:
+            user = authenticate(username=data['username'], password=data['password'])
         if user is None:
             raise serializers.ValidationError("Invalid username or password")
         return user
@@ -319,6 +379,8 @@ class ApplicationSerializer(serializers.ModelSerializer):
     internship_contract = serializers.FileField(required=False, allow_null=True)
     student_health_record = serializers.FileField(required=False, allow_null=True)
 
+    method_field_relations = {'student_id': ['student__student_profile']}
+
     class Meta:
         model = Application
         fields = ['id', 'student_name', 'student_id', 'internship', 'internship_id', 'status', 'applied_at', 'feedback', 'cover_letter', 'resume_url', 'resume_file', 'parents_consent', 'internship_contract', 'student_health_record']
@@ -425,9 +487,9 @@ class DailyJournalSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'student', 'student_name', 'application', 'application_id',
             'date', 'activities', 'learning_outcomes', 'hours_rendered',
-            'status', 'supervisor_comment', 'created_at', 'updated_at'
+            'status', 'supervisor_comment', 'reviewed_by', 'reviewed_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['student', 'supervisor_comment']
+        read_only_fields = ['student', 'supervisor_comment', 'reviewed_by', 'reviewed_at']
 
 
 class PreTrainingRequirementSerializer(serializers.ModelSerializer):
@@ -442,6 +504,12 @@ class PreTrainingRequirementSerializer(serializers.ModelSerializer):
             'submitted_at', 'reviewed_at'
         ]
         read_only_fields = ['student', 'status', 'admin_comment', 'reviewed_at']
+    
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # First-page preview for PDFs, thumbnail for images
+        representation['preview_url'] = thumbnail_url(self.context.get('request'), instance.document_file, 'large')
+        return representation
 
 
 class DocumentTemplateSerializer(serializers.ModelSerializer):
@@ -602,6 +670,7 @@ class SupervisorDocumentSerializer(serializers.ModelSerializer):
                 representation['document_file'] = request.build_absolute_uri(instance.document_file.url)
             else:
                 representation['document_file'] = instance.document_file.url
+        representation['preview_url'] = thumbnail_url(self.context.get('request'), instance.document_file, 'large')
         return representation
 
 
@@ -0,0 +1,55 @@
+"""
+Cache sharing checks for the EARIST OJT System
+The default cache is only shared between workers when REDIS_URL is set; the
+LocMemCache fallback is per process, so a delete in one worker never reaches
+the others. Features that rely on invalidation or cross-worker counters ask
+here whether they can trust the cache. State that must be shared whatever the
+deployment (login throttling) uses the "shared" alias instead, which falls
+back to the database cache table without Redis.
+"""
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.connection import ConnectionProxy
+
+PER_PROCESS_BACKENDS = (LocMemCache, DummyCache)
+SHARED_ALIAS = 'shared'
+
+# Like django.core.cache.cache, but for the always-shared alias
+shared_cache = ConnectionProxy(caches, SHARED_ALIAS)
+
+
+def is_shared(alias='default'):
+    """Whether every worker sees the same cache under alias"""
+    return not isinstance(caches[alias], PER_PROCESS_BACKENDS)
+
+
+def get_local_ttl():
+    """Longest a per-process cache may keep a value other workers cannot invalidate"""
+    return getattr(settings, 'LOCAL_CACHE_TTL', 30)
+
+
+def bounded_ttl(ttl, alias='default'):
+    """ttl on a shared cache; otherwise capped at LOCAL_CACHE_TTL"""
+    if is_shared(alias):
+        return ttl
+    return min(ttl, get_local_ttl()) if ttl else get_local_ttl()
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """System check: the "shared" alias must really be shared between processes"""
+    if SHARED_ALIAS not in settings.CACHES:
+        return [checks.Error(
+            f'CACHES has no "{SHARED_ALIAS}" alias.',
+            hint='Point it at Redis or django.core.cache.backends.db.DatabaseCache.',
+            id='core.E001',
+        )]
+    if not is_shared(SHARED_ALIAS):
+        return [checks.Error(
+            f'CACHES["{SHARED_ALIAS}"] is per process, so login lockouts would not apply across workers.',
+            hint='Point it at Redis or django.core.cache.backends.db.DatabaseCache.',
+            id='core.E002',
+        )]
+    return []
@@ -0,0 +1,139 @@
+"""
+Model signal handlers for the core app
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .models import (
+    Notification, UserRole, StudentProfile, CoordinatorProfile, Supervisor, CompanyUser, Company,
+    Attendance, DailyJournal, CoordinatorSettings, Task, Message, SupportTicket, Internship,
+)
+from . import catalogue, compliance, hours_ledger, notifications, required_hours, search
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        # Only touch the cache once the row is really there; a rollback leaves it alone
+        user_id = instance.user_id
+        transaction.on_commit(lambda: notifications.increment_unread(user_id))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: notifications.decrement_unread(user_id))
+
+
+# ========== CACHED TOKEN INVALIDATION ==========
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Covers password changes and deactivation
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_save, sender=CoordinatorProfile)
+@receiver(post_delete, sender=CoordinatorProfile)
+@receiver(post_save, sender=Supervisor)
+@receiver(post_delete, sender=Supervisor)
+@receiver(post_save, sender=CompanyUser)
+@receiver(post_delete, sender=CompanyUser)
+def user_context_changed(sender, instance, **kwargs):
+    # The cached user carries its role and profiles, so any change must drop it
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=Company)
+def company_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    for user_id in CompanyUser.objects.filter(company=instance).values_list('user_id', flat=True):
+        invalidate_user_tokens(user_id)
+
+
+# ========== HOURS LEDGER ==========
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_save, sender=DailyJournal)
+def hours_record_saved(sender, instance, **kwargs):
+    # Covers new records, edited hours and status transitions (approve/reject/mark)
+    hours_ledger.refresh_student(instance.student_id)
+
+
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=DailyJournal)
+def hours_record_deleted(sender, instance, origin=None, **kwargs):
+    # When a student or application is deleted their ledger rows cascade with
+    # it, and refreshing mid-delete would recreate them
+    if isinstance(origin, sender) or getattr(origin, 'model', None) is sender:
+        hours_ledger.refresh_student(instance.student_id)
+
+
+# ========== REQUIRED HOURS TABLE / REQUIRED DOCS ==========
+
+@receiver(post_save, sender=CoordinatorSettings)
+@receiver(post_delete, sender=CoordinatorSettings)
+def coordinator_settings_changed(sender, instance, **kwargs):
+    college = CoordinatorProfile.objects.filter(user_id=instance.coordinator_id).values_list('college', flat=True).first()
+    required_hours.invalidate(college)
+    compliance.invalidate(college)
+
+
+@receiver(post_save, sender=CoordinatorProfile)
+@receiver(post_delete, sender=CoordinatorProfile)
+def coordinator_profile_changed(sender, instance, **kwargs):
+    required_hours.invalidate(instance.college)
+    compliance.invalidate(instance.college)
+
+
+# ========== SEARCH INDEX ==========
+
+@receiver(post_save, sender=DailyJournal)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Message)
+@receiver(post_save, sender=SupportTicket)
+@receiver(post_save, sender=Internship)
+def searchable_record_saved(sender, instance, update_fields=None, **kwargs):
+    search.index_object(instance, update_fields)
+
+
+@receiver(post_delete, sender=DailyJournal)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Message)
+@receiver(post_delete, sender=SupportTicket)
+@receiver(post_delete, sender=Internship)
+def searchable_record_deleted(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+# ========== INTERNSHIP CATALOGUE TAGS ==========
+
+@receiver(post_save, sender=Internship)
+def internship_saved(sender, instance, update_fields=None, **kwargs):
+    # Slot changes are frequent and never touch tags
+    if update_fields and 'required_courses' not in update_fields:
+        return
+    catalogue.sync_tags([instance.id])
+
+
+@receiver(post_save, sender=Company)
+def company_catalogue_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and 'target_colleges' not in update_fields):
+        return
+    catalogue.sync_tags(list(instance.internships.values_list('id', flat=True)))
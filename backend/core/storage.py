@@ -0,0 +1,203 @@
+"""
+Content-addressed upload storage for the EARIST OJT System
+Student document uploads are stored once per SHA-256 digest under
+MEDIA_ROOT/blobs/, so re-uploading the same resume or consent form for every
+application shares one file. StoredBlob rows, one per stored file name, track
+how many FileField values point at each blob; sweep_blobs() recounts them,
+adopts referenced files that have no row and removes the orphans, including
+files on disk that neither a row nor a FileField knows about.
+"""
+import hashlib
+import os
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+BLOB_DIR = 'blobs'
+MAX_EXTENSION_LENGTH = 10
+
+
+def blob_name_for(digest, original_name):
+    """blobs/ab/cd/<digest><ext>; the extension is kept so content types still resolve"""
+    ext = os.path.splitext(original_name)[1].lower()
+    if len(ext) > MAX_EXTENSION_LENGTH:
+        ext = ''
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_DIR + '/')
+
+
+def digest_from_name(name):
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by content hash. FileFields keep working
+    as usual; identical uploads simply end up with the same name.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Same name means same bytes, so there is nothing to de-conflict
+        return name
+
+    def _save(self, name, content):
+        sha256 = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            sha256.update(chunk)
+            size += len(chunk)
+        digest = sha256.hexdigest()
+        blob_name = blob_name_for(digest, name)
+
+        if not self.exists(blob_name):
+            # Write under a unique temporary name and rename into place, so two
+            # concurrent uploads of the same file cannot clash or leave a partial blob
+            temp_name = super()._save(f'{BLOB_DIR}/tmp/{uuid.uuid4().hex}', content)
+            os.makedirs(os.path.dirname(self.path(blob_name)), exist_ok=True)
+            os.replace(self.path(temp_name), self.path(blob_name))
+
+        _add_reference(digest, blob_name, size)
+        return blob_name
+
+    def delete(self, name):
+        """Drop one reference; the file itself goes once nothing points at it"""
+        if not is_blob_name(name):
+            return super().delete(name)
+        if _remove_reference(name):
+            super().delete(name)
+
+
+def _add_reference(digest, name, size):
+    from .models import StoredBlob
+
+    # Keyed on the name, not the digest: the extension is part of the file name
+    blob, created = StoredBlob.objects.get_or_create(
+        name=name, defaults={'sha256': digest, 'size': size, 'ref_count': 1}
+    )
+    if not created:
+        StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1, last_referenced_at=timezone.now())
+
+
+def _remove_reference(name):
+    """Decrement the count; returns True when the blob is no longer referenced"""
+    from .models import StoredBlob
+
+    StoredBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    deleted, _ = StoredBlob.objects.filter(name=name, ref_count=0).delete()
+    return deleted > 0
+
+
+_storage = None
+
+
+def content_addressed_storage():
+    """Callable used as FileField(storage=...) so migrations don't pin settings"""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
+
+
+def blob_fields():
+    """(model, field) pairs whose files live in the content-addressed store"""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.get_fields()
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def count_references():
+    """How many rows point at each blob name, from one values_list() per field"""
+    counts = Counter()
+    for model, field in blob_fields():
+        names = model.objects.filter(**{f'{field.name}__startswith': BLOB_DIR + '/'}).values_list(field.name, flat=True)
+        counts.update(names)
+    return counts
+
+
+def _stray_files(storage, known, cutoff):
+    """
+    Names of files under blobs/ (tmp/ leftovers included) that are not in known
+    and were last modified before cutoff.
+    """
+    root = storage.path(BLOB_DIR)
+    stray = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            name = '/'.join([BLOB_DIR, *os.path.relpath(path, root).split(os.sep)])
+            if name in known:
+                continue
+            try:
+                modified = os.path.getmtime(path)
+            except OSError:
+                # Renamed into place or removed since the walk listed it
+                continue
+            if modified < cutoff.timestamp():
+                stray.append(name)
+    return stray
+
+
+def sweep_blobs(dry_run=False, grace=timedelta(hours=1)):
+    """
+    Reset every StoredBlob.ref_count to the real number of references, add rows
+    for referenced blobs that have none, and delete blobs nothing points at.
+    Blobs referenced within grace are kept, since an upload is saved to storage
+    a moment before its row is. Files under blobs/ with no row and no reference,
+    such as temp files left by an interrupted upload, are removed once they are
+    older than grace.
+
+    Returns the names of the orphaned blobs and stray files (removed unless dry_run).
+    """
+    from .models import StoredBlob
+
+    counts = count_references()
+    storage = content_addressed_storage()
+    cutoff = timezone.now() - grace
+
+    stale = []
+    orphans = []
+    tracked = set()
+    for blob in StoredBlob.objects.all().iterator():
+        tracked.add(blob.name)
+        actual = counts.get(blob.name, 0)
+        if actual == 0 and blob.last_referenced_at < cutoff:
+            orphans.append(blob)
+        elif blob.ref_count != actual:
+            blob.ref_count = actual
+            stale.append(blob)
+
+    stray = _stray_files(storage, tracked | set(counts), cutoff)
+
+    if dry_run:
+        return [blob.name for blob in orphans] + stray
+
+    # e.g. files written before rows were keyed by name
+    untracked = [
+        StoredBlob(
+            name=name, sha256=digest_from_name(name), ref_count=count,
+            size=storage.size(name) if storage.exists(name) else 0,
+        )
+        for name, count in counts.items() if name not in tracked
+    ]
+    StoredBlob.objects.bulk_create(untracked, batch_size=500, ignore_conflicts=True)
+    StoredBlob.objects.bulk_update(stale, ['ref_count'], batch_size=500)
+    for blob in orphans:
+        FileSystemStorage.delete(storage, blob.name)
+    StoredBlob.objects.filter(pk__in=[blob.pk for blob in orphans]).delete()
+    for name in stray:
+        FileSystemStorage.delete(storage, name)
+    return [blob.name for blob in orphans] + stray
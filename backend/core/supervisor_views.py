@@ -21,6 +21,7 @@ from .serializers import (
     PerformanceEvaluationSerializer, SupervisorDocumentSerializer
 )
 from .permissions import role_required
+from .thumbnails import thumbnail_url
 
 # Supervisor Dashboard
 @api_view(['GET'])
@@ -183,9 +184,11 @@ def supervisor_interns_list(request):
             
             # Get profile image URL
             profile_image_url = None
+            profile_thumbnail_url = None
             if profile and profile.profile_picture:
                 try:
                     profile_image_url = request.build_absolute_uri(profile.profile_picture.url)
+                    profile_thumbnail_url = thumbnail_url(request, profile.profile_picture, 'small')
                 except (ValueError, AttributeError):
                     profile_image_url = None
             
@@ -199,6 +202,7 @@ def supervisor_interns_list(request):
                 'course': profile.course if profile else '',
                 'phone': profile.phone if profile else '',
                 'profile_image': profile_image_url,
+                'profile_image_thumbnail': profile_thumbnail_url,
                 'applied_at': app.applied_at,
                 'application_id': app.id,
                 'status': app.status,  # Show application status (Pending, Approved, Rejected)
@@ -556,6 +560,32 @@ def supervisor_attendance(request):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.SUPERVISOR, UserRole.COORDINATOR, UserRole.ADMIN])
+def supervisor_attendance_bulk_review(request):
+    """
+    Verify many pending attendance records at once: approve marks them Present,
+    reject marks them Absent. Same body as journal bulk review, with optional notes.
+    """
+    from .review_transitions import bulk_review_attendance, parse_selection, ATTENDANCE_ACTIONS
+    
+    action = request.data.get('action')
+    if action not in ATTENDANCE_ACTIONS:
+        return Response({'error': f'Invalid action. Choose from: {", ".join(ATTENDANCE_ACTIONS)}'}, status=status.HTTP_400_BAD_REQUEST)
+    selection, error = parse_selection(request.data)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        result = bulk_review_attendance(request.user, action, notes=request.data.get('notes', ''), **selection)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    result['message'] = f"{result['updated']} attendance record(s) marked {result['status']}"
+    return Response(result)
+
+
 # Messaging System
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -780,25 +810,27 @@ def supervisor_student_attendance(request, student_id):
             student=student
         ).order_by('-date')
         
-        # Calculate attendance statistics
-        total_records = attendance_records.count()
-        present_count = attendance_records.filter(status='Present').count()
-        late_count = attendance_records.filter(status='Late').count()
-        absent_count = attendance_records.filter(status='Absent').count()
-        pending_count = attendance_records.filter(status='Pending').count()
-        
-        # Calculate total hours from attendance
-        attendance_hours = sum([record.hours_rendered or 0 for record in attendance_records])
+        # Attendance statistics and hours come from the hours ledger
+        from core.hours_ledger import student_totals
+        ledger = student_totals(student.id)
+        total_records = ledger['attendance_count']
+        present_count = ledger['present_count']
+        late_count = ledger['late_count']
+        absent_count = ledger['absent_count']
+        pending_count = ledger['pending_count']
+        attendance_hours = ledger['attendance_hours']
         
         # Get journal entries for additional hours
         journals = DailyJournal.objects.filter(student=student).order_by('-date')
-        journal_hours = sum([j.hours_rendered or 0 for j in journals])
+        journal_hours = ledger['journal_hours']
         
         # Calculate total hours and progress
-        total_hours = attendance_hours
+        from core.hours_ledger import rendered_hours
+        from core.required_hours import progress_percentage as percentage_of
+        total_hours = rendered_hours(ledger)
         from core.coordinator_views import get_required_hours_for_student
         required_hours = get_required_hours_for_student(student)
-        progress_percentage = min(100, (total_hours / required_hours * 100) if required_hours > 0 else 0)
+        progress_percentage = percentage_of(total_hours, required_hours)
         
         # Get tasks
         tasks = Task.objects.filter(student=student).order_by('-created_at')
@@ -842,7 +874,7 @@ def supervisor_student_attendance(request, student_id):
             'pending_tasks': total_tasks - completed_tasks,
             
             # Counts
-            'journal_count': journals.count(),
+            'journal_count': ledger['journal_count'],
             'evaluation_count': evaluations.count(),
             
             # Detailed Records
@@ -869,20 +901,24 @@ def supervisor_student_progress(request, student_id):
         # Get all journal entries
         journals = DailyJournal.objects.filter(student=student).order_by('-date')
         
-        # Calculate total hours from journals
-        journal_hours = sum([j.hours_rendered or 0 for j in journals])
+        # Hours and attendance counts from the hours ledger
+        from core.hours_ledger import student_totals
+        ledger = student_totals(student.id)
+        journal_hours = ledger['journal_hours']
         
         # Get attendance records
         attendance_records = Attendance.objects.filter(student=student).order_by('-date')
-        attendance_hours = sum([a.hours_rendered or 0 for a in attendance_records])
+        attendance_hours = ledger['attendance_hours']
         
         # Get application to find required hours
         from core.coordinator_views import get_required_hours_for_student
         required_hours = get_required_hours_for_student(student)
         
         # Use attendance hours as the primary source (most accurate)
-        total_hours = attendance_hours
-        progress_percentage = min(100, (total_hours / required_hours * 100) if required_hours > 0 else 0)
+        from core.hours_ledger import rendered_hours
+        from core.required_hours import progress_percentage as percentage_of
+        total_hours = rendered_hours(ledger)
+        progress_percentage = percentage_of(total_hours, required_hours)
         
         # Get evaluations
         evaluations = PerformanceEvaluation.objects.filter(student=student).order_by('-submitted_at')
@@ -920,13 +956,13 @@ def supervisor_student_progress(request, student_id):
             'remarks': a.remarks if hasattr(a, 'remarks') else None
         } for a in attendance_records]
 
-        # Calculate Attendance Stats for Dashboard Cards
-        present_count = attendance_records.filter(status='Present').count()
-        late_count = attendance_records.filter(status='Late').count()
-        absent_count = attendance_records.filter(status='Absent').count()
+        # Attendance Stats for Dashboard Cards
+        present_count = ledger['present_count']
+        late_count = ledger['late_count']
+        absent_count = ledger['absent_count']
         
-        # Calculate Late Hours (sum of hours for Late records)
-        late_hours = sum([a.hours_rendered or 0 for a in attendance_records if a.status == 'Late'])
+        # Late Hours (sum of hours for Late records)
+        late_hours = ledger['late_hours']
 
         # Get Tasks Stats
         tasks = Task.objects.filter(
@@ -1,3 +1,728 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import login_throttle
+from .application_transitions import bulk_transition_applications
+from .bulk_grading import compute_scores, grade_students
+from .email_outbox import _claim_batch, enqueue_email, purge_finished, send_queued_emails
+from .models import (
+    Application, Attendance, Company, CompanyUser, CoordinatorProfile, CoordinatorSettings, DailyJournal,
+    HoursLedger, Internship, LoginAttempt, Notification, OutboxEmail, StudentFinalGrade, StudentProfile, UserRole,
+)
+from .review_transitions import bulk_review_attendance, bulk_review_journals
+from .search import search
+from .serializers import UserSerializer, annotate_user_profiles
+from .storage import sweep_blobs
+
+
+# Queries allowed for a successful student login: profile/user/role/2FA lookup,
+# token fetch and the activity log insert. Lockouts live in the shared cache,
+# which is the core_shared_cache table without Redis; those reads are budgeted
+# separately.
+LOGIN_QUERY_BUDGET = 3
+LOGIN_CACHE_QUERY_BUDGET = 4
+
+
+def split_cache_queries(queries):
+    """(application queries, shared-cache table queries)"""
+    cache_queries = [q['sql'] for q in queries if 'core_shared_cache' in q['sql']]
+    return [q['sql'] for q in queries if 'core_shared_cache' not in q['sql']], cache_queries
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginQueryBudgetTests(TestCase):
+    """Benchmark for the login fast path: query count must stay fixed as students are added"""
+
+    def setUp(self):
+        cache.clear()
+
+    def create_student(self, index):
+        user = User.objects.create_user(username=f'student{index}', password='secret123')
+        UserRole.objects.create(user=user, role=UserRole.STUDENT)
+        StudentProfile.objects.create(user=user, student_id=f'2024-{index:05d}', birth_date='2003-01-15')
+        Token.objects.create(user=user)
+        return user
+
+    def login(self, student_id):
+        return APIClient().post('/api/login/', {
+            'username': student_id,
+            'password': 'secret123',
+            'birth_date': '2003-01-15',
+        }, format='json')
+
+    def test_student_id_lookup_is_case_folded(self):
+        self.create_student(1)
+        profile = StudentProfile.objects.get(user__username='student1')
+        self.assertEqual(profile.student_id_key, '2024-00001')
+
+        response = self.login('  2024-00001 ')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['user']['role'], 'student')
+
+    def test_student_login_query_budget(self):
+        self.create_student(1)
+        with CaptureQueriesContext(connection) as small:
+            response = self.login('2024-00001')
+        self.assertEqual(response.status_code, 200, response.data)
+        small, small_cache = split_cache_queries(small)
+        self.assertLessEqual(len(small), LOGIN_QUERY_BUDGET, small)
+        self.assertLessEqual(len(small_cache), LOGIN_CACHE_QUERY_BUDGET, small_cache)
+
+        for index in range(2, 51):
+            self.create_student(index)
+        with CaptureQueriesContext(connection) as large:
+            response = self.login('2024-00050')
+        self.assertEqual(response.status_code, 200, response.data)
+        large, large_cache = split_cache_queries(large)
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(len(large_cache), len(small_cache))
+
+    def test_failed_login_is_rejected(self):
+        self.create_student(1)
+        response = APIClient().post('/api/login/', {
+            'username': '2024-00001',
+            'password': 'wrong',
+            'birth_date': '2003-01-15',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class UserListQueryCountTests(TestCase):
+    """users_list must serialize any number of users in a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='secret123', is_staff=True)
+        UserRole.objects.create(user=self.admin, role=UserRole.ADMIN)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def create_users(self, start, count):
+        for index in range(start, start + count):
+            student = User.objects.create_user(username=f'student{index}')
+            UserRole.objects.create(user=student, role=UserRole.STUDENT)
+            StudentProfile.objects.create(user=student, student_id=f'2024-{index:05d}', college='CCS', course='BSIT')
+
+            coordinator = User.objects.create_user(username=f'coordinator{index}')
+            UserRole.objects.create(user=coordinator, role=UserRole.COORDINATOR)
+            CoordinatorProfile.objects.create(user=coordinator, college='CEN')
+
+            # No role or profile at all
+            User.objects.create_user(username=f'plain{index}')
+
+    def list_users(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response, len(queries)
+
+    def test_query_count_is_constant(self):
+        self.create_users(1, 2)
+        small, small_queries = self.list_users()
+
+        self.create_users(3, 30)
+        large, large_queries = self.list_users()
+
+        self.assertEqual(len(large.data), len(small.data) + 90)
+        self.assertEqual(large_queries, small_queries)
+
+    def test_annotated_output_matches_relations(self):
+        self.create_users(1, 2)
+        users = User.objects.order_by('id')
+        from_relations = UserSerializer(users, many=True).data
+        from_annotations = UserSerializer(annotate_user_profiles(users), many=True).data
+        self.assertEqual(from_annotations, from_relations)
+
+
+class TokenCacheTests(TestCase):
+    """Resolved tokens may only be cached where every worker sees the invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student1')
+        UserRole.objects.create(user=self.user, role=UserRole.STUDENT)
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_per_process_cache_disables_token_cache(self):
+        from .authentication import get_token_cache_ttl, _token_key
+
+        self.assertEqual(get_token_cache_ttl(), 0)
+        self.assertEqual(self.client.get('/api/notifications/').status_code, 200)
+        self.assertIsNone(cache.get(_token_key(self.token.key)))
+
+    def test_revoked_token_is_rejected_at_once(self):
+        self.assertEqual(self.client.get('/api/notifications/').status_code, 200)
+        # A queryset delete skips signals, as when another worker revokes the token
+        Token.objects.filter(pk=self.token.pk).delete()
+        self.assertEqual(self.client.get('/api/notifications/').status_code, 401)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+class EmailOutboxTests(TestCase):
+    """Claiming, retry backoff and secret retention in the email outbox"""
+
+    def queue(self, count=1):
+        return [enqueue_email('Your 2FA Code', f'user{index}@example.com', 'Code: 123456') for index in range(count)]
+
+    def test_workers_never_claim_the_same_rows(self):
+        self.queue(5)
+        first = _claim_batch(3)
+        second = _claim_batch(3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({row.id for row in first} & {row.id for row in second})
+
+    def test_rows_claimed_elsewhere_are_not_returned(self):
+        self.queue(2)
+        # Another worker flips the rows between our SELECT and UPDATE
+        due = OutboxEmail.objects.filter
+        with mock.patch.object(OutboxEmail.objects, 'filter', side_effect=lambda *args, **kwargs: (
+            due(*args, **{**kwargs, 'status': 'Sending'})
+            if kwargs.get('status') == 'Queued' and 'next_attempt_at__lte' in kwargs else due(*args, **kwargs)
+        )):
+            OutboxEmail.objects.update(status='Sending')
+            self.assertEqual(_claim_batch(5), [])
+
+    def test_sent_messages_lose_their_body(self):
+        message, = self.queue()
+        self.assertEqual(send_queued_emails(), (1, 0))
+        message.refresh_from_db()
+        self.assertEqual(message.status, 'Sent')
+        self.assertEqual((message.body_text, message.body_html), ('', ''))
+        self.assertIn('123456', mail.outbox[0].body)
+
+    def test_failures_back_off_then_give_up(self):
+        message, = self.queue()
+        with mock.patch('core.email_outbox.EmailMultiAlternatives.send', side_effect=OSError('down')):
+            self.assertEqual(send_queued_emails(), (0, 1))
+            message.refresh_from_db()
+            self.assertEqual((message.status, message.attempts), ('Queued', 1))
+            self.assertGreater(message.next_attempt_at, timezone.now())
+
+            # Not due yet, so nothing is claimed
+            self.assertEqual(send_queued_emails(), (0, 0))
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(send_queued_emails(), (0, 1))
+
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.body_text), ('Failed', 2, ''))
+
+    def test_purge_keeps_queued_and_recent_rows(self):
+        old, recent, queued = self.queue(3)
+        OutboxEmail.objects.filter(id__in=[old.id, recent.id]).update(status='Sent')
+        OutboxEmail.objects.filter(id__in=[old.id, queued.id]).update(created_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(purge_finished(days=7), 1)
+        self.assertEqual(set(OutboxEmail.objects.values_list('id', flat=True)), {recent.id, queued.id})
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    LOGIN_MAX_ATTEMPTS=3, LOGIN_IP_MAX_ATTEMPTS=4, LOGIN_LOCKOUT_SECONDS=120,
+)
+class LoginThrottleTests(TestCase):
+    """Sliding-window lockouts kept in the shared cache"""
+
+    def setUp(self):
+        cache.clear()
+        caches['shared'].clear()
+
+    def at(self, moment):
+        # Only the throttle's clock moves; cache expiry keeps real time
+        return mock.patch.object(login_throttle, 'time', mock.Mock(time=mock.Mock(return_value=moment)))
+
+    def fail_at(self, moment, username='admin1', ip=None):
+        with self.at(moment):
+            return login_throttle.register_failure(username, ip)
+
+    def remaining_at(self, moment, username='admin1'):
+        with self.at(moment):
+            return login_throttle.lockout_remaining(username)
+
+    def test_failures_outside_the_window_do_not_count(self):
+        self.fail_at(1000.0)
+        self.fail_at(1100.0)
+        # The first failure is 130s old: only two fall inside the window
+        self.assertEqual(self.fail_at(1130.0), (2, None))
+        self.assertEqual(self.fail_at(1140.0), (3, 'user'))
+
+    def test_lockout_expires_after_the_window(self):
+        for moment in (1000.0, 1001.0, 1002.0):
+            attempts, locked = self.fail_at(moment)
+        self.assertEqual(locked, 'user')
+        self.assertGreater(self.remaining_at(1010.0), 0)
+        self.assertEqual(self.remaining_at(1130.0), 0)
+        # The lock started a clean window
+        self.assertEqual(self.fail_at(1131.0), (1, None))
+
+    def test_reset_forgets_earlier_failures(self):
+        self.fail_at(1000.0)
+        self.fail_at(1001.0)
+        with self.at(1002.0):
+            login_throttle.reset('admin1')
+        self.assertEqual(self.fail_at(1003.0), (1, None))
+
+    def test_network_lock_only_affects_failed_attempts(self):
+        user = User.objects.create_user(username='admin1', password='secret123')
+        UserRole.objects.create(user=user, role=UserRole.ADMIN)
+        client = APIClient(REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        for index in range(4):
+            self.fail_at(time.time(), username=f'other{index}', ip='10.0.0.1')
+
+        response = client.post('/api/login/', {'username': 'admin1', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('network', response.data['error'])
+
+        response = client.post('/api/login/', {'username': 'admin1', 'password': 'secret123'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def test_clear_all_and_audit_commands(self):
+        now = time.time()
+        for _ in range(3):
+            self.fail_at(now)
+        self.assertGreater(login_throttle.lockout_remaining('admin1'), 0)
+
+        call_command('persist_login_lockouts', stdout=StringIO())
+        self.assertEqual(LoginAttempt.objects.filter(username='admin1').count(), 1)
+
+        call_command('clear_login_lockouts', '--all', stdout=StringIO())
+        self.assertEqual(login_throttle.lockout_remaining('admin1'), 0)
+
+    def test_commands_refuse_a_per_process_cache(self):
+        per_process = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle'},
+        }
+        with override_settings(CACHES=per_process):
+            for command in (['clear_login_lockouts', '--all'], ['persist_login_lockouts']):
+                with self.assertRaises(CommandError):
+                    call_command(*command, stdout=StringIO())
+
+
+class BulkReviewTests(TestCase):
+    """Bulk journal and attendance review: scoping, hours and digests"""
+
+    def setUp(self):
+        cache.clear()
+        company = Company.objects.create(name='Acme', address='x', contact_person='p', contact_email='hr@acme.test')
+        other = Company.objects.create(name='Beta', address='x', contact_person='p', contact_email='hr@beta.test')
+        self.supervisor = User.objects.create_user(username='supervisor')
+        UserRole.objects.create(user=self.supervisor, role=UserRole.SUPERVISOR)
+        CompanyUser.objects.create(user=self.supervisor, company=company)
+
+        self.interns = []
+        for index, employer in enumerate([company, company, other]):
+            student = User.objects.create_user(username=f'student{index}', email=f'student{index}@example.com')
+            UserRole.objects.create(user=student, role=UserRole.STUDENT)
+            internship = Internship.objects.create(company=employer, position='Developer', description='d', slots=5)
+            Application.objects.create(student=student, internship=internship, status='Approved')
+            for day in range(1, 4):
+                DailyJournal.objects.create(
+                    student=student, date=f'2026-01-0{day}', activities='work', hours_rendered=8, status='Submitted',
+                )
+                Attendance.objects.create(student=student, date=f'2026-01-0{day}', hours_rendered=8, status='Pending')
+            self.interns.append(student)
+
+    def test_journals_outside_the_supervisors_company_are_untouched(self):
+        result = bulk_review_journals(self.supervisor, 'approve', date_from=date(2026, 1, 1), date_to=date(2026, 1, 31))
+        self.assertEqual((result['updated'], result['students']), (6, 2))
+        self.assertFalse(DailyJournal.objects.filter(student=self.interns[2]).exclude(status='Submitted').exists())
+        self.assertEqual(
+            DailyJournal.objects.filter(reviewed_by=self.supervisor, status='Approved').count(), 6,
+        )
+
+        outside = list(DailyJournal.objects.filter(student=self.interns[2]).values_list('id', flat=True))
+        self.assertEqual(bulk_review_journals(self.supervisor, 'reject', ids=outside)['updated'], 0)
+
+    def test_one_digest_per_student(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_review_journals(self.supervisor, 'approve', ids=list(DailyJournal.objects.values_list('id', flat=True)))
+        self.assertEqual(Notification.objects.filter(notification_type='journal').count(), 2)
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_rejected_attendance_credits_no_hours(self):
+        student = self.interns[0]
+        record = Attendance.objects.filter(student=student).first()
+        result = bulk_review_attendance(self.supervisor, 'reject', ids=[record.id])
+        self.assertEqual((result['updated'], result['status']), (1, 'Absent'))
+
+        record.refresh_from_db()
+        self.assertEqual(record.hours_rendered, 0)
+        ledger = HoursLedger.objects.filter(student=student).aggregate(
+            approved=Sum('attendance_approved_hours'), total=Sum('attendance_hours'), absent=Sum('absent_count'),
+        )
+        self.assertEqual((ledger['approved'], ledger['total'], ledger['absent']), (0, 16, 1))
+
+    def test_approved_attendance_counts(self):
+        bulk_review_attendance(self.supervisor, 'approve', student_id=self.interns[1].id, date_from=date(2026, 1, 1))
+        ledger = HoursLedger.objects.filter(student=self.interns[1]).aggregate(approved=Sum('attendance_approved_hours'))
+        self.assertEqual(ledger['approved'], 24)
+
+
+class BulkApplicationTransitionTests(TestCase):
+    """bulk_transition_applications: one approval per student, slots, scoping and notifications"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', is_staff=True)
+        UserRole.objects.create(user=self.admin, role=UserRole.ADMIN)
+        self.company = Company.objects.create(name='Acme', address='x', contact_person='p', contact_email='hr@acme.test')
+
+    def student(self, username, college='CCS'):
+        user = User.objects.create_user(username=username, email=f'{username}@example.com')
+        UserRole.objects.create(user=user, role=UserRole.STUDENT)
+        StudentProfile.objects.create(user=user, college=college)
+        return user
+
+    def apply(self, student, slots=5):
+        internship = Internship.objects.create(company=self.company, position='Developer', description='d', slots=slots)
+        return Application.objects.create(student=student, internship=internship, status='Pending')
+
+    def test_second_application_of_a_student_is_reported_rejected(self):
+        student = self.student('student1')
+        first, second, untouched = self.apply(student), self.apply(student), self.apply(student)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            results, updated = bulk_transition_applications(self.admin, [first.id, second.id], 'Approved')
+
+        self.assertEqual(updated, 1)
+        self.assertEqual([row['result'] for row in results], ['updated', 'rejected'])
+        statuses = dict(Application.objects.values_list('id', 'status'))
+        self.assertEqual(
+            (statuses[first.id], statuses[second.id], statuses[untouched.id]), ('Approved', 'Rejected', 'Rejected'),
+        )
+        # Every application that changed tells the student
+        self.assertEqual(Notification.objects.filter(user=student, notification_type='application').count(), 3)
+        self.assertEqual(OutboxEmail.objects.filter(to_email=student.email).count(), 3)
+
+    def test_slots_are_granted_in_request_order(self):
+        internship = Internship.objects.create(company=self.company, position='Developer', description='d', slots=1)
+        early = Application.objects.create(student=self.student('student1'), internship=internship, status='Pending')
+        late = Application.objects.create(student=self.student('student2'), internship=internship, status='Pending')
+
+        results, updated = bulk_transition_applications(self.admin, [early.id, late.id], 'Approved')
+        self.assertEqual(updated, 1)
+        self.assertEqual([row['result'] for row in results], ['updated', 'error'])
+        internship.refresh_from_db()
+        self.assertEqual(internship.slots, 0)
+
+    def test_coordinators_only_move_their_college(self):
+        coordinator = User.objects.create_user(username='coordinator')
+        UserRole.objects.create(user=coordinator, role=UserRole.COORDINATOR)
+        CoordinatorProfile.objects.create(user=coordinator, college='CCS')
+        own = self.apply(self.student('student1', college='CCS'))
+        other = self.apply(self.student('student2', college='CEN'))
+
+        results, updated = bulk_transition_applications(coordinator, [own.id, other.id, 'x'], 'Rejected')
+        self.assertEqual(updated, 1)
+        self.assertEqual([row['result'] for row in results], ['updated', 'error'])
+        self.assertEqual(Application.objects.get(id=other.id).status, 'Pending')
+
+
+class MediaAccessTests(TestCase):
+    """media-view/ and media-thumb/ only serve files the caller may see"""
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = self.settings(MEDIA_ROOT=self.media_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.owner = self.user('owner', UserRole.STUDENT)
+        StudentProfile.objects.create(user=self.owner, college='CCS')
+        self.name = 'blobs/ab/cd/abcd.pdf'
+        StudentProfile.objects.filter(user=self.owner).update(resume=self.name)
+        os.makedirs(os.path.join(self.media_root, 'blobs/ab/cd'))
+        with open(os.path.join(self.media_root, self.name), 'wb') as handle:
+            handle.write(b'%PDF-1.4 resume')
+
+    def user(self, username, role, **extra):
+        user = User.objects.create_user(username=username, **extra)
+        UserRole.objects.create(user=user, role=role)
+        return user
+
+    def fetch(self, user=None, path=None):
+        client = APIClient()
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=user)[0].key}')
+        return client.get(f'/api/{path or "media-view/" + self.name}')
+
+    def test_anonymous_requests_are_refused(self):
+        self.assertEqual(self.fetch().status_code, 401)
+        self.assertEqual(self.fetch(path=f'media-thumb/small/{self.name}').status_code, 401)
+
+    def test_other_students_get_not_found(self):
+        other = self.user('other', UserRole.STUDENT)
+        StudentProfile.objects.create(user=other, college='CCS')
+        self.assertEqual(self.fetch(other).status_code, 404)
+        self.assertEqual(self.fetch(other, path=f'media-thumb/small/{self.name}').status_code, 404)
+
+    def test_owner_coordinator_and_admin_can_read(self):
+        coordinator = self.user('coordinator', UserRole.COORDINATOR)
+        CoordinatorProfile.objects.create(user=coordinator, college='CCS')
+        admin = self.user('admin', UserRole.ADMIN, is_staff=True)
+        for reader in (self.owner, coordinator, admin):
+            response = self.fetch(reader)
+            self.assertEqual(response.status_code, 200, reader.username)
+            self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 resume')
+
+    def test_coordinators_of_other_colleges_and_unrelated_supervisors_are_refused(self):
+        coordinator = self.user('coordinator', UserRole.COORDINATOR)
+        CoordinatorProfile.objects.create(user=coordinator, college='CEN')
+        supervisor = self.user('supervisor', UserRole.SUPERVISOR)
+        company = Company.objects.create(name='Acme', address='x', contact_person='p', contact_email='hr@acme.test')
+        CompanyUser.objects.create(user=supervisor, company=company)
+        self.assertEqual(self.fetch(coordinator).status_code, 404)
+        self.assertEqual(self.fetch(supervisor).status_code, 404)
+
+        internship = Internship.objects.create(company=company, position='Developer', description='d', slots=5)
+        Application.objects.create(student=self.owner, internship=internship, status='Pending')
+        self.assertEqual(self.fetch(supervisor).status_code, 200)
+
+    def test_files_without_a_row_are_admin_only(self):
+        with open(os.path.join(self.media_root, 'stray.pdf'), 'wb') as handle:
+            handle.write(b'x')
+        self.assertEqual(self.fetch(self.owner, path='media-view/stray.pdf').status_code, 404)
+        admin = self.user('admin', UserRole.ADMIN, is_staff=True)
+        self.assertEqual(self.fetch(admin, path='media-view/stray.pdf').status_code, 200)
+
+
+class BlobSweepTests(TestCase):
+    """sweep_blobs also clears files under blobs/ that nothing tracks"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = self.settings(MEDIA_ROOT=self.media_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def write(self, name, age):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(b'x')
+        moment = time.time() - age
+        os.utime(path, (moment, moment))
+        return path
+
+    def test_untracked_files_older_than_grace_are_removed(self):
+        user = User.objects.create_user(username='student')
+        StudentProfile.objects.create(user=user, resume='blobs/aa/bb/kept.pdf')
+        kept = self.write('blobs/aa/bb/kept.pdf', age=7200)
+        leftover = self.write('blobs/tmp/0123abcd', age=7200)
+        stray = self.write('blobs/cc/dd/stray.pdf', age=7200)
+        fresh = self.write('blobs/tmp/fresh', age=60)
+
+        self.assertEqual(sorted(sweep_blobs(dry_run=True)), ['blobs/cc/dd/stray.pdf', 'blobs/tmp/0123abcd'])
+        self.assertTrue(os.path.exists(leftover))
+
+        sweep_blobs()
+        self.assertEqual([os.path.exists(path) for path in (kept, leftover, stray, fresh)], [True, False, False, True])
+
+
+class ProgressAgreementTests(TestCase):
+    """The roster and the per-student progress page report the same hours and requirement"""
+
+    def setUp(self):
+        cache.clear()
+        self.coordinator = User.objects.create_user(username='coordinator', is_staff=True)
+        UserRole.objects.create(user=self.coordinator, role=UserRole.COORDINATOR)
+        CoordinatorProfile.objects.create(user=self.coordinator, college='CCS')
+        self.student = User.objects.create_user(username='student')
+        UserRole.objects.create(user=self.student, role=UserRole.STUDENT)
+        StudentProfile.objects.create(user=self.student, college='CCS', course='BSIT')
+        company = Company.objects.create(name='Acme', address='x', contact_person='p', contact_email='hr@acme.test')
+        internship = Internship.objects.create(
+            company=company, position='Developer', description='d', slots=5, duration_hours=320,
+        )
+        Application.objects.create(student=self.student, internship=internship, status='Approved')
+        for day in range(1, 4):
+            Attendance.objects.create(student=self.student, date=f'2026-01-0{day}', hours_rendered=8, status='Present')
+            DailyJournal.objects.create(
+                student=self.student, date=f'2026-01-0{day}', activities='work', hours_rendered=8, status='Approved',
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.coordinator)
+
+    def test_roster_matches_student_progress(self):
+        roster = self.client.get('/api/progress/roster/').data['results'][0]
+        progress = self.client.get(f'/api/progress/{self.student.id}/').data
+
+        self.assertEqual(roster['total_hours'], progress['total_hours_rendered'])
+        self.assertEqual(roster['required_hours'], progress['required_hours'])
+        self.assertEqual(roster['progress_percentage'], progress['overall_progress'])
+        # Attendance only, and the shared default rather than the internship's duration
+        self.assertEqual((progress['total_hours_rendered'], progress['required_hours']), (24.0, 486))
+
+
+class OpenInternshipTests(TestCase):
+    """The catalogue and the internship list hide the same filled postings"""
+
+    def setUp(self):
+        cache.clear()
+        company = Company.objects.create(name='Acme', address='x', contact_person='p', contact_email='hr@acme.test')
+        # Three places, two approved: slots has already counted down to one
+        self.partly_filled = Internship.objects.create(company=company, position='Developer', description='d', slots=1)
+        self.filled = Internship.objects.create(company=company, position='Tester', description='d', slots=0)
+        for index in range(2):
+            intern = User.objects.create_user(username=f'intern{index}')
+            Application.objects.create(student=intern, internship=self.partly_filled, status='Approved')
+
+        self.student = User.objects.create_user(username='student')
+        UserRole.objects.create(user=self.student, role=UserRole.STUDENT)
+        StudentProfile.objects.create(user=self.student)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    @mock.patch('core.views.check_student_compliance', return_value=(True, []))
+    def test_list_and_catalogue_agree(self, _):
+        listed = {row['id'] for row in self.client.get('/api/internships/').data}
+        catalogue = {row['id'] for row in self.client.get('/api/internships/catalogue/?facets=false').data['results']}
+        self.assertEqual(listed, {self.partly_filled.id})
+        self.assertEqual(catalogue, listed)
+
+
+class LocalCacheTtlTests(TestCase):
+    """Invalidated tables only live LOCAL_CACHE_TTL on a per-process cache"""
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(LOCAL_CACHE_TTL=30)
+    def test_required_hours_table_ttl_is_capped(self):
+        from . import required_hours
+        with mock.patch.object(required_hours.cache, 'set') as cache_set:
+            required_hours.get_table('CCS')
+        self.assertEqual(cache_set.call_args.args[2], 30)
+
+    @override_settings(LOCAL_CACHE_TTL=30)
+    def test_required_docs_ttl_is_capped(self):
+        from . import compliance
+        with mock.patch.object(compliance.cache, 'set') as cache_set:
+            compliance.required_docs_for('CCS')
+        self.assertEqual(cache_set.call_args.args[2], 30)
+
+
+class UnreadCounterTests(TestCase):
+    """The cached unread counter follows committed notifications only"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student')
+
+    def test_counter_moves_on_commit(self):
+        from .notifications import _unread_key
+        cache.set(_unread_key(self.user.id), 0)
+        with self.captureOnCommitCallbacks() as callbacks:
+            notification = Notification.objects.create(user=self.user, title='t', message='m')
+        self.assertEqual(cache.get(_unread_key(self.user.id)), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get(_unread_key(self.user.id)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.delete()
+        self.assertEqual(cache.get(_unread_key(self.user.id)), 0)
+
+
+class BulkGradingTests(TestCase):
+    """grade_students / compute_scores: brackets, requirements, dry runs and reruns"""
+
+    def setUp(self):
+        self.student = User.objects.create_user(username='student')
+        UserRole.objects.create(user=self.student, role=UserRole.STUDENT)
+
+    def test_bracket_boundaries(self):
+        ratings = [98, 97.99, 75, 74.99]
+        inputs = {
+            'hours': np.zeros(4), 'required': np.full(4, 486.0), 'rating': np.array(ratings),
+            'requirements_approved': np.zeros(4), 'requirements_required': np.zeros(4),
+        }
+        scores = compute_scores(inputs, {'attendance': 0.0, 'supervisor': 100.0, 'requirements': 0.0})
+        self.assertEqual(list(scores['final_grade']), [1.00, 1.25, 3.00, 5.00])
+
+    def test_no_required_documents_counts_as_complete(self):
+        # No college, so nothing is required
+        grade_students([self.student.id])
+        self.assertEqual(StudentFinalGrade.objects.get(student=self.student).requirements_score, 100)
+
+        # A coordinator list with nothing marked required
+        cache.clear()
+        coordinator = User.objects.create_user(username='coordinator')
+        CoordinatorProfile.objects.create(user=coordinator, college='CCS')
+        CoordinatorSettings.objects.create(coordinator=coordinator, required_docs=[{'name': 'Waiver', 'required': False}])
+        other = User.objects.create_user(username='other')
+        StudentProfile.objects.create(user=other, college='CCS')
+        grade_students([other.id])
+        self.assertEqual(StudentFinalGrade.objects.get(student=other).requirements_score, 100)
+
+    def test_dry_run_writes_nothing(self):
+        result = grade_students([self.student.id], dry_run=True)
+        self.assertEqual((result['created'], result['dry_run']), (1, True))
+        self.assertFalse(StudentFinalGrade.objects.exists())
+
+    def test_second_run_reports_unchanged(self):
+        first = grade_students([self.student.id])
+        second = grade_students([self.student.id])
+        self.assertEqual((first['created'], first['unchanged']), (1, 0))
+        self.assertEqual((second['created'], second['updated'], second['unchanged']), (0, 0, 1))
+        self.assertEqual(second['changes'], [])
+
+
+class SearchScopeTests(TestCase):
+    """search() only returns journals the caller may see, and follows edits"""
+
+    def setUp(self):
+        cache.clear()
+        self.journals = {}
+        for username, college in (('ccs_student', 'CCS'), ('cen_student', 'CEN')):
+            student = User.objects.create_user(username=username)
+            UserRole.objects.create(user=student, role=UserRole.STUDENT)
+            StudentProfile.objects.create(user=student, college=college)
+            self.journals[username] = DailyJournal.objects.create(
+                student=student, date='2026-01-05', activities=f'Configured the firewall for {username}', hours_rendered=8,
+            )
+        self.coordinator = User.objects.create_user(username='coordinator')
+        UserRole.objects.create(user=self.coordinator, role=UserRole.COORDINATOR)
+        CoordinatorProfile.objects.create(user=self.coordinator, college='CCS')
+
+    def found(self, user, query='firewall'):
+        results, _ = search(user, query, kinds=['journal'])
+        return {row['id'] for row in results}
+
+    def test_students_only_see_their_own_journals(self):
+        own = self.journals['ccs_student']
+        self.assertEqual(self.found(own.student), {own.id})
+
+    def test_coordinators_only_see_their_college(self):
+        self.assertEqual(self.found(self.coordinator), {self.journals['ccs_student'].id})
+
+    def test_edited_entries_are_reindexed(self):
+        journal = self.journals['ccs_student']
+        journal.activities = 'Rewired the switch closet'
+        journal.save()
+        self.assertEqual(self.found(journal.student), set())
+        self.assertEqual(self.found(journal.student, 'switch closet'), {journal.id})
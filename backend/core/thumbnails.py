@@ -0,0 +1,130 @@
+"""
+Image derivatives for the EARIST OJT System
+Generates resized WebP (or JPEG) thumbnails of uploaded images and first-page
+previews of PDF uploads on first request, and keeps them on disk under
+MEDIA_ROOT/derivatives/ so later requests are plain file reads.
+"""
+import os
+import tempfile
+
+from django.conf import settings
+
+try:
+    import pymupdf  # only needed for PDF previews
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+# Longest edge in pixels for each named size
+THUMBNAIL_SIZES = {
+    'small': 64,
+    'medium': 256,
+    'large': 800,
+}
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
+PDF_EXTENSIONS = {'.pdf'}
+DERIVATIVES_DIR = 'derivatives'
+
+
+def _output_format():
+    """WebP when Pillow was built with it, JPEG otherwise"""
+    from PIL import features
+    return ('WEBP', '.webp') if features.check('webp') else ('JPEG', '.jpg')
+
+
+def can_generate(name):
+    ext = os.path.splitext(name or '')[1].lower()
+    return ext in IMAGE_EXTENSIONS or (ext in PDF_EXTENSIONS and HAS_PYMUPDF)
+
+
+def derivative_path(source_path, size):
+    """Where the derivative of an absolute source path inside MEDIA_ROOT is stored"""
+    media_root = os.path.realpath(settings.MEDIA_ROOT)
+    relative = os.path.relpath(source_path, media_root)
+    _, ext = _output_format()
+    return os.path.join(media_root, DERIVATIVES_DIR, size, relative + ext)
+
+
+def get_or_create_derivative(source_path, size):
+    """
+    Return the path of the derivative for source_path, generating it if it is
+    missing or older than the source. Returns None if the file type is not supported.
+    """
+    if size not in THUMBNAIL_SIZES or not can_generate(source_path):
+        return None
+
+    target = derivative_path(source_path, size)
+    try:
+        if os.path.getmtime(target) >= os.path.getmtime(source_path):
+            return target
+    except OSError:
+        pass
+
+    image = _open_source(source_path, THUMBNAIL_SIZES[size])
+    if image is None:
+        return None
+    _save_thumbnail(image, target, THUMBNAIL_SIZES[size])
+    return target
+
+
+def _open_source(source_path, edge):
+    from PIL import Image, ImageOps
+
+    if os.path.splitext(source_path)[1].lower() in PDF_EXTENSIONS:
+        return _render_pdf_first_page(source_path, edge)
+
+    image = Image.open(source_path)
+    # Let the JPEG decoder downscale while decoding; much faster for phone photos
+    image.draft('RGB', (edge * 2, edge * 2))
+    return ImageOps.exif_transpose(image)
+
+
+def _render_pdf_first_page(source_path, edge):
+    from PIL import Image
+
+    with pymupdf.open(source_path) as document:
+        if document.page_count == 0:
+            return None
+        page = document.load_page(0)
+        # Render close to the target size instead of at full page resolution
+        zoom = edge / max(page.rect.width, page.rect.height, 1)
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom * 2, zoom * 2), alpha=False)
+        return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+
+
+def _save_thumbnail(image, target, edge):
+    image.thumbnail((edge, edge))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    image_format, _ = _output_format()
+    if image_format == 'JPEG' and image.mode == 'RGBA':
+        image = image.convert('RGB')
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # Write to a temp file and rename so concurrent requests never read half a thumbnail
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            image.save(output, image_format, quality=80)
+        os.replace(temp_path, target)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def thumbnail_url(request, field_file, size='medium'):
+    """Absolute URL of a size-specific derivative of a FileField/ImageField value, or None"""
+    if not field_file or not can_generate(field_file.name):
+        return None
+    path = f'/api/media-thumb/{size}/{field_file.name}'
+    return request.build_absolute_uri(path) if request else path
+
+
+def thumbnail_urls(request, field_file):
+    """URLs for every configured size, keyed by size name"""
+    if not field_file or not can_generate(field_file.name):
+        return None
+    return {size: thumbnail_url(request, field_file, size) for size in THUMBNAIL_SIZES}
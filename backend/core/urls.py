@@ -7,6 +7,9 @@ from . import supervisor_views
 from . import document_template_views
 from . import database_views
 from . import backup_views
+from . import roster_views
+from . import search_views
+from . import catalogue_views
 
 
 router = DefaultRouter()
@@ -40,11 +43,13 @@ urlpatterns = [
 
     # Internships
     path('internships/', views.internship_list, name='internship-list'),
+    path('internships/catalogue/', catalogue_views.internship_catalogue, name='internship-catalogue'),
     path('internships/<int:pk>/', views.internship_detail, name='internship-detail'),
 
     # Applications
     path('applications/', views.application_list, name='application-list'),
     path('applications/<int:pk>/', views.application_detail, name='application-detail'),
+    path('applications/bulk-status/', views.application_bulk_status, name='application-bulk-status'),
     path('student/applications/', views.application_list, name='student-application-list'),
     path('student/messages/', views.student_messages, name='student-messages'),
     path('student/messages/<int:message_id>/read/', views.student_mark_message_read, name='student-mark-message-read'),
@@ -81,6 +86,7 @@ urlpatterns = [
     path('journals/', views.daily_journal_list, name='journal-list'),
     path('journals/<int:pk>/', views.daily_journal_detail, name='journal-detail'),
     path('journals/<int:pk>/approve/', views.approve_journal, name='approve-journal'),
+    path('journals/bulk-review/', views.journal_bulk_review, name='journal-bulk-review'),
     
     # Pre-Training Requirements
     path('pre-training-requirements/', views.pre_training_requirements_list, name='pre-training-list'),
@@ -112,9 +118,12 @@ urlpatterns = [
     # Progress Tracking
     path('progress/', views.student_progress, name='student-progress'),
     path('progress/<int:student_id>/', views.student_progress, name='student-progress-detail'),
+    path('progress/roster/', roster_views.roster_progress, name='roster-progress'),
+    path('search/', search_views.search, name='search'),
     
     # Media Files (without X-Frame-Options for iframe embedding)
     path('media-view/<path:file_path>', views.serve_media_file, name='serve-media-file'),
+    path('media-thumb/<str:size>/<path:file_path>', views.serve_media_thumbnail, name='serve-media-thumbnail'),
     
     # System Settings
     path('settings/', views.get_system_settings, name='get-settings'),
@@ -142,6 +151,7 @@ urlpatterns = [
     path('supervisor/journals/', supervisor_views.supervisor_journals, name='supervisor-journals'),
     path('supervisor/evaluations/', supervisor_views.supervisor_submit_evaluation, name='supervisor-evaluations'),
     path('supervisor/attendance/', supervisor_views.supervisor_attendance, name='supervisor-attendance'),
+    path('supervisor/attendance/bulk-review/', supervisor_views.supervisor_attendance_bulk_review, name='supervisor-attendance-bulk-review'),
     path('supervisor/students/<int:student_id>/attendance/', supervisor_views.supervisor_student_attendance, name='supervisor-student-attendance'),
     path('supervisor/messages/', supervisor_views.supervisor_messages, name='supervisor-messages'),
     path('supervisor/messages/<int:message_id>/', supervisor_views.supervisor_mark_message_read, name='supervisor-message-detail'),
@@ -176,6 +186,8 @@ urlpatterns = [
     path('coordinator/grading/criteria/', views.grading_criteria_list, name='grading-criteria'),
     path('coordinator/grading/criteria/<int:pk>/', views.grading_criteria_detail, name='grading-criteria-detail'),
     path('coordinator/grading/compute/<int:student_id>/', views.compute_student_grade, name='compute-student-grade'),
+    path('coordinator/grading/compute-all/', coordinator_views.coordinator_bulk_compute_grades, name='coordinator-bulk-compute-grades'),
+    path('coordinator/compliance/', coordinator_views.coordinator_compliance_matrix, name='coordinator-compliance-matrix'),
     path('coordinator/grading/grades/', coordinator_views.coordinator_student_grades, name='coordinator-student-grades'),
     
     # Coordinator Analytics
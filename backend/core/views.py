@@ -7,6 +7,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from .permissions import role_required
 from .models import UserRole
+from . import presence
+from . import notifications as notification_utils
+from . import email_templates
+from .pagination import list_response, ProjectedListMixin
 from django.contrib.auth import login
 from django.utils import timezone
 from django.db.models import Q
@@ -17,14 +21,14 @@ from .serializers import (
     SupervisorSerializer, CompanyUserSerializer, DailyJournalSerializer,
     PreTrainingRequirementSerializer, DocumentTemplateSerializer, AttendanceSerializer,
     TaskSerializer, PerformanceEvaluationSerializer, NoticeSerializer, SupportTicketSerializer,
-    NarrativeReportSerializer, CoordinatorProfileSerializer
+    NarrativeReportSerializer, CoordinatorProfileSerializer, annotate_user_profiles
 )
 from .models import (
     Company, Internship, Application, StudentProfile, UserActivityLog,
     Supervisor, CompanyUser, DailyJournal, PreTrainingRequirement,
     DocumentTemplate, Attendance, Task, PerformanceEvaluation,
     Notice, SupportTicket, EmailVerification, GradingCriteria, StudentFinalGrade, NarrativeReport,
-    CoordinatorProfile, LoginAttempt, EmailOTP, TwoFactorAuth, Message, TypingIndicator
+    CoordinatorProfile, LoginAttempt, EmailOTP, TwoFactorAuth, Message, TypingIndicator, HoursLedger
 )
 import zipfile
 import io
@@ -46,49 +50,8 @@ def check_student_compliance(user):
     Check if student has completed all required pre-training documents (Approved status).
     Returns (is_compliant, missing_docs_list)
     """
-    if not hasattr(user, 'student_profile') or not user.student_profile.college:
-        return True, []
-        
-    student_college = user.student_profile.college
-    
-    # Get Coordinator Settings
-    from .models import CoordinatorProfile, CoordinatorSettings, PreTrainingRequirement
-    
-    # Find coordinator profile for this college
-    coordinator_profile = CoordinatorProfile.objects.filter(college=student_college).first()
-    
-    required_doc_names = []
-    
-    # If no coordinator or no settings, enforce DEFAULTS
-    if not coordinator_profile:
-        required_doc_names = ['Resume/CV', 'Application Letter', 'Endorsement Letter', 'Waiver', 'Consent Letter']
-    else:
-        settings = CoordinatorSettings.objects.filter(coordinator=coordinator_profile.user).first()
-        if not settings or not settings.required_docs:
-             required_doc_names = ['Resume/CV', 'Application Letter', 'Endorsement Letter', 'Waiver', 'Consent Letter']
-        else:
-            # Get required documents (where required=True)
-            required_doc_names = [d['name'] for d in settings.required_docs if d.get('required', False)]
-    
-    # If explicitly no required docs (empty list configured), allow
-    if not required_doc_names:
-        return True, []
-
-    # Get student's Approved documents
-    submitted_docs = PreTrainingRequirement.objects.filter(
-        student=user,
-        status='Approved'
-    ).values_list('requirement_type', flat=True)
-    
-    missing_docs = []
-    for req_name in required_doc_names:
-        if req_name not in submitted_docs:
-            missing_docs.append(req_name)
-            
-    if missing_docs:
-        return False, missing_docs
-        
-    return True, []
+    from .compliance import student_compliance
+    return student_compliance(user)
 
 # 🧱 Dashboard Summary
 @api_view(['GET'])
@@ -381,11 +344,9 @@ def internship_list(request):
         
         # For students, hide filled internships (Auto-disable logic)
         if request.user.is_authenticated and hasattr(request.user, 'user_role') and request.user.user_role.role == 'student':
-            from django.db.models import Count, F, Q
-            # Count approved applications and exclude if >= slots
-            internships = internships.annotate(
-                approved_apps=Count('application', filter=Q(application__status='Approved'))
-            ).filter(approved_apps__lt=F('slots'))
+            # Same rule as the catalogue: slots already counts down on each approval
+            from .catalogue import open_internships
+            internships = open_internships(internships)
 
         serializer = InternshipSerializer(internships, many=True)
         return Response(serializer.data)
@@ -472,8 +433,7 @@ def application_list(request):
         else:
             apps = Application.objects.filter(student=request.user)
         
-        serializer = ApplicationSerializer(apps, many=True, context={'request': request})
-        return Response(serializer.data)
+        return list_response(request, apps, ApplicationSerializer, ('-applied_at', '-id'))
 
     elif request.method == 'POST':
         # Check if student has an active approved application (not completed)
@@ -613,6 +573,36 @@ def application_detail(request, pk):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.ADMIN, UserRole.COORDINATOR, UserRole.SUPERVISOR])
+def application_bulk_status(request):
+    """
+    Change the status of many applications at once.
+    Expects JSON: { application_ids: [<id>, ...], status: <status>, feedback: <optional> }
+    Coordinators are limited to their college and supervisors to their company.
+    """
+    from .application_transitions import bulk_transition_applications, VALID_STATUSES
+    
+    application_ids = request.data.get('application_ids', [])
+    new_status = request.data.get('status')
+    
+    if not application_ids or not isinstance(application_ids, list):
+        return Response({'error': 'application_ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if new_status not in VALID_STATUSES:
+        return Response({'error': f'Invalid status. Choose from: {", ".join(sorted(VALID_STATUSES))}'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results, updated_count = bulk_transition_applications(
+        request.user, application_ids, new_status, feedback=request.data.get('feedback', '')
+    )
+    
+    return Response({
+        'message': f'Updated {updated_count} application(s) to {new_status}',
+        'updated_count': updated_count,
+        'results': results
+    })
+
+
 # 🔐 Authentication
 # Send Verification Code
 @api_view(['POST'])
@@ -643,125 +633,18 @@ def send_verification_code(request):
     
     # Send email
     try:
-        from django.core.mail import EmailMultiAlternatives
-        
-        # HTML email template
-        html_content = f'''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
-                            <div style="font-size: 32px; margin-bottom: 10px;">✉️</div>
-                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
-                                Email Verification
-                            </h2>
-                            
-                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
-                                Thank you for registering!<br>
-                                Please use the code below to verify your email address.
-                            </p>
-                            
-                            <!-- Code Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0">
-                                <tr>
-                                    <td align="center" style="padding: 20px 0;">
-                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
-                                            <div style="background: #ffffff; padding: 25px 60px; border-radius: 10px;">
-                                                <div style="font-size: 42px; font-weight: 700; letter-spacing: 12px; color: #667eea; font-family: 'Courier New', monospace;">
-                                                    {code}
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="margin: 30px 0 0; font-size: 14px; line-height: 1.6; color: #666; text-align: center;">
-                                This code will expire in <strong>1 hour</strong>.
-                            </p>
-                            
-                            <!-- Info Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
-                                <tr>
-                                    <td style="background-color: #e3f2fd; border-left: 4px solid #2196f3; padding: 15px; border-radius: 4px;">
-                                        <p style="margin: 0; font-size: 13px; color: #1565c0; line-height: 1.5;">
-                                            <strong>ℹ️ Note:</strong><br>
-                                            If you didn't request this code, please ignore this email.
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
-                                Best regards,<br>
-                                <strong>EARIST OJT System Team</strong>
-                            </p>
-                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
-                                This is an automated message, please do not reply to this email.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Footer Note -->
-                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
-                    <tr>
-                        <td style="text-align: center; padding: 0 40px;">
-                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
-                                © 2025 EARIST OJT System. All rights reserved.<br>
-                                This message was sent to {email}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-'''
+        from .email_outbox import enqueue_email
         
-        # Plain text version
-        text_content = f'''Your verification code is: {code}
-
-This code will expire in 1 hour.
-
-If you did not request this code, please ignore this email.
-
-Best regards,
-EARIST OJT System'''
+        # HTML and plain text come from the precompiled templates in email_templates.py
+        html_content, text_content = email_templates.render('verification_code', code=code, email=email)
         
-        # Create email with both HTML and plain text
-        email_msg = EmailMultiAlternatives(
+        # Queue email with both HTML and plain text (delivered by send_queued_emails)
+        enqueue_email(
             subject='Email Verification Code - EARIST OJT System',
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[email]
+            to_email=email,
+            body_text=text_content,
+            body_html=html_content
         )
-        email_msg.attach_alternative(html_content, "text/html")
-        email_msg.send(fail_silently=False)
         return Response({
             'message': 'Verification code sent to your email',
             'email': email
@@ -839,14 +722,10 @@ def register_user(request):
 def login_user(request):
     from django.utils import timezone
     from datetime import timedelta
-    from .models import LoginAttempt
+    from . import login_throttle
 
-    # Get client IP
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
+    # Get client IP (X-Forwarded-For only through trusted proxies)
+    ip = login_throttle.client_ip(request)
 
 
     # Check if the input username matches a Student ID
@@ -854,19 +733,31 @@ def login_user(request):
     input_birth_date = request.data.get('birth_date')
     target_username = input_username
     student_profile = None
+    resolved_user = None  # Loaded once with role and 2FA so later checks cost no queries
     
     if input_username:
         input_username = input_username.strip()
         
-        # Try to resolve Student ID to Username
-        try:
-            # Case-insensitive lookup for Student ID
-            student_profile = StudentProfile.objects.get(student_id__iexact=input_username)
-            target_username = student_profile.user.username
-        except (StudentProfile.DoesNotExist, StudentProfile.MultipleObjectsReturned):
+        # Try to resolve Student ID to Username via the indexed, case-folded key
+        student_id_key = StudentProfile.normalize_student_id(input_username)
+        profiles = []
+        if student_id_key:
+            profiles = list(
+                StudentProfile.objects
+                .select_related('user', 'user__user_role', 'user__two_factor_auth')
+                .defer('qr_code_image')
+                .filter(student_id_key=student_id_key)[:2]
+            )
+        
+        if len(profiles) == 1:
+            student_profile = profiles[0]
+            resolved_user = student_profile.user
+            target_username = resolved_user.username
+        else:
             # Not a student ID, check if it's a non-student user (admin/coordinator/supervisor)
-            if User.objects.filter(username=input_username).exists():
-                user = User.objects.get(username=input_username)
+            user = User.objects.select_related('user_role', 'two_factor_auth').filter(username=input_username).first()
+            if user:
+                resolved_user = user
                 
                 # Check if user has a non-student role
                 if hasattr(user, 'user_role'):
@@ -886,44 +777,29 @@ def login_user(request):
                     return Response({
                         "error": "Please log in using your Student ID."
                     }, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                 # User doesn't exist
-                 pass
-            pass
 
     # Check lockout status for the target username BEFORE any verification
-    if target_username:
-        try:
-            attempt = LoginAttempt.objects.get(username=target_username)
-            if attempt.attempts >= 3:
-                # Check 2-minute lockout
-                time_diff = timezone.now() - attempt.last_attempt
-                if time_diff.total_seconds() < 120: # 120 seconds = 2 minutes
-                    minutes_left = 2 - int(time_diff.total_seconds() / 60)
-                    return Response({
-                        "error": f"Account temporarily locked. Please try again in {minutes_left} minutes."
-                    }, status=status.HTTP_403_FORBIDDEN)
-                else:
-                    # Lockout expired, reset attempts
-                    attempt.attempts = 0
-                    attempt.save()
-        except LoginAttempt.DoesNotExist:
-            pass
+    # (kept in the cache by login_throttle, so this never touches the database).
+    # IP lockouts only affect failed attempts, so a shared campus network never
+    # blocks someone entering the right credentials.
+    seconds_left = login_throttle.lockout_remaining(target_username)
+    if seconds_left:
+        minutes_left = login_throttle.minutes_left(seconds_left)
+        return Response({
+            "error": f"Account temporarily locked. Please try again in {minutes_left} minutes."
+        }, status=status.HTTP_403_FORBIDDEN)
+    max_attempts = login_throttle.get_max_attempts()
+    network_locked_error = "Too many failed login attempts from this network. Please try again later."
 
     # NOW verify birthday if it's a student login
     if student_profile:
         if not input_birth_date:
             # Track this as a failed attempt
             if target_username:
-                attempt, created = LoginAttempt.objects.get_or_create(username=target_username)
-                attempt.ip_address = ip
-                attempt.attempts += 1
-                attempt.last_attempt = timezone.now()
-                
-                attempt.save()
-                
-                attempt.save()
-                remaining = 3 - attempt.attempts
+                attempts, locked = login_throttle.register_failure(target_username, ip)
+                if locked == 'ip':
+                    return Response({"error": network_locked_error}, status=status.HTTP_403_FORBIDDEN)
+                remaining = max(max_attempts - attempts, 0)
                 return Response({
                     "error": f"Birthday is required for login. {remaining} attempts remaining."
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -935,15 +811,10 @@ def login_user(request):
         if str(student_profile.birth_date) != input_birth_date:
             # Track this as a failed attempt
             if target_username:
-                attempt, created = LoginAttempt.objects.get_or_create(username=target_username)
-                attempt.ip_address = ip
-                attempt.attempts += 1
-                attempt.last_attempt = timezone.now()
-                
-                attempt.save()
-                
-                attempt.save()
-                remaining = 3 - attempt.attempts
+                attempts, locked = login_throttle.register_failure(target_username, ip)
+                if locked == 'ip':
+                    return Response({"error": network_locked_error}, status=status.HTTP_403_FORBIDDEN)
+                remaining = max(max_attempts - attempts, 0)
                 return Response({
                     "error": f"Invalid birthday. {remaining} attempts remaining."
                 }, status=status.HTTP_400_BAD_REQUEST)
@@ -957,7 +828,7 @@ def login_user(request):
             request.data._mutable = True
         request.data['username'] = student_profile.user.username
 
-    serializer = LoginSerializer(data=request.data)
+    serializer = LoginSerializer(data=request.data, context={'user': resolved_user})
     if serializer.is_valid():
         user = serializer.validated_data
         
@@ -972,10 +843,11 @@ def login_user(request):
         two_fa_required = False
         two_fa_setup_required = False
         
-        try:
-            two_factor = TwoFactorAuth.objects.get(user=user, is_enabled=True, is_verified=True)
+        # two_factor_auth was joined into the lookup above, so this is not another query
+        two_factor = getattr(user, 'two_factor_auth', None)
+        if two_factor and two_factor.is_enabled and two_factor.is_verified:
             two_fa_required = True
-        except TwoFactorAuth.DoesNotExist:
+        else:
             # If user is admin and doesn't have 2FA enabled, offer choice
             if user_role == 'admin':
                 # Return choice prompt
@@ -1034,127 +906,20 @@ def login_user(request):
                         )
                         
                         try:
-                            from django.core.mail import EmailMultiAlternatives
+                            from .email_outbox import enqueue_email
                             
-                            # HTML email template
-                            html_content = f'''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
-                            <div style="font-size: 32px; margin-bottom: 10px;">🔐</div>
-                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
-                                Security Verification Code
-                            </h2>
-                            
-                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
-                                Hello <strong>{user.get_full_name() or user.username}</strong>,<br>
-                                We received a request to verify your identity.
-                            </p>
-                            
-                            <!-- Code Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0">
-                                <tr>
-                                    <td align="center" style="padding: 20px 0;">
-                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
-                                            <div style="background: #ffffff; padding: 25px 50px; border-radius: 10px;">
-                                                <div style="font-size: 36px; font-weight: 700; letter-spacing: 8px; color: #667eea; font-family: 'Courier New', monospace;">
-                                                    {code}
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="margin: 30px 0 0; font-size: 14px; line-height: 1.6; color: #666; text-align: center;">
-                                This code will expire in <strong>10 minutes</strong>.
-                            </p>
-                            
-                            <!-- Warning Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
-                                <tr>
-                                    <td style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; border-radius: 4px;">
-                                        <p style="margin: 0; font-size: 13px; color: #856404; line-height: 1.5;">
-                                            <strong>⚠️ Security Notice:</strong><br>
-                                            If you didn't request this code, please ignore this email or contact your administrator immediately.
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
-                                Best regards,<br>
-                                <strong>EARIST OJT System Team</strong>
-                            </p>
-                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
-                                This is an automated message, please do not reply to this email.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Footer Note -->
-                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
-                    <tr>
-                        <td style="text-align: center; padding: 0 40px;">
-                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
-                                © 2025 EARIST OJT System. All rights reserved.<br>
-                                This message was sent to {user.email}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-'''
-                            
-                            # Plain text version
-                            text_content = f'''Hello {user.get_full_name() or user.username},
-
-Your 2FA verification code is: {code}
-
-This code will expire in 10 minutes.
-
-If you did not request this code, please ignore this email or contact your administrator.
-
-Best regards,
-EARIST OJT System'''
+                            # HTML and plain text come from the precompiled templates in email_templates.py
+                            html_content, text_content = email_templates.render(
+                                'two_factor_code', code=code, email=user.email, name=user.get_full_name() or user.username
+                            )
                             
-                            # Create email with both HTML and plain text
-                            email_msg = EmailMultiAlternatives(
+                            # Queue email with both HTML and plain text (delivered by send_queued_emails)
+                            enqueue_email(
                                 subject='EARIST OJT System - Your 2FA Code',
-                                body=text_content,
-                                from_email=settings.DEFAULT_FROM_EMAIL,
-                                to=[user.email]
+                                to_email=user.email,
+                                body_text=text_content,
+                                body_html=html_content
                             )
-                            email_msg.attach_alternative(html_content, "text/html")
-                            email_msg.send(fail_silently=False)
                         except Exception as email_error:
                             return Response({
                                 'error': f'Failed to send verification email: {str(email_error)}'
@@ -1269,7 +1034,7 @@ EARIST OJT System'''
 
         
         # Reset login attempts on success
-        LoginAttempt.objects.filter(username=user.username).delete()
+        login_throttle.reset(user.username)
         
         # Log login activity
         UserActivityLog.objects.create(
@@ -1300,21 +1065,17 @@ EARIST OJT System'''
     else:
         # Login failed
         if target_username:
-            attempt, created = LoginAttempt.objects.get_or_create(username=target_username)
-            attempt.ip_address = ip
-            attempt.attempts += 1
-            attempt.last_attempt = timezone.now()
+            attempts, locked = login_throttle.register_failure(target_username, ip)
             
-            if attempt.attempts >= 3:
-                attempt.save()
+            if locked == 'ip':
+                return Response({"error": network_locked_error}, status=status.HTTP_403_FORBIDDEN)
+            if locked:
                 return Response({
                     "error": "Too many failed attempts. Security check required.",
                     "requires_captcha": True
                 }, status=status.HTTP_403_FORBIDDEN)
             
-            attempt.save()
-            
-            remaining = 3 - attempt.attempts
+            remaining = max_attempts - attempts
             return Response({
                 "error": f"Invalid credentials. {remaining} attempts remaining."
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -1333,7 +1094,7 @@ def logout_user(request):
             description=f'{request.user.username} logged out'
         )
         
-        # Delete the token
+        # Delete the token (signals.token_deleted also drops it from the auth cache)
         try:
             token = Token.objects.get(user=request.user)
             token.delete()
@@ -1404,151 +1165,23 @@ def request_password_reset(request):
         
         # Send beautiful HTML email
         try:
-            from django.core.mail import EmailMultiAlternatives
+            from .email_outbox import enqueue_email
             
             student_name = user.get_full_name() or user.username
             
-            # HTML email template
-            html_content = f'''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
-                            <div style="font-size: 32px; margin-bottom: 10px;">🔒</div>
-                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
-                                Password Reset Request
-                            </h2>
-                            
-                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
-                                Hello <strong>{student_name}</strong>,<br>
-                                We received a request to reset your password.
-                            </p>
-                            
-                            <!-- Password Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0">
-                                <tr>
-                                    <td align="center" style="padding: 20px 0;">
-                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
-                                            <div style="background: #ffffff; padding: 25px 50px; border-radius: 10px;">
-                                                <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">Your New Password</p>
-                                                <div style="font-size: 28px; font-weight: 700; letter-spacing: 3px; color: #667eea; font-family: 'Courier New', monospace;">
-                                                    {new_password}
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Important Info -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
-                                <tr>
-                                    <td style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; border-radius: 4px;">
-                                        <p style="margin: 0 0 10px; font-size: 13px; color: #856404; line-height: 1.5;">
-                                            <strong>⚠️ Important:</strong>
-                                        </p>
-                                        <ul style="margin: 0; padding-left: 20px; font-size: 13px; color: #856404; line-height: 1.6;">
-                                            <li>Use this password to log in immediately</li>
-                                            <li>Change this password after logging in for security</li>
-                                            <li>If you didn't request this, contact admin immediately</li>
-                                        </ul>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Login Button -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
-                                <tr>
-                                    <td align="center">
-                                        <a href="http://localhost:3000/login" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: #ffffff; text-decoration: none; padding: 15px 40px; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                                            Log In Now
-                                        </a>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
-                                Best regards,<br>
-                                <strong>EARIST OJT System Team</strong>
-                            </p>
-                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
-                                This is an automated message, please do not reply to this email.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Footer Note -->
-                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
-                    <tr>
-                        <td style="text-align: center; padding: 0 40px;">
-                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
-                                © 2025 EARIST OJT System. All rights reserved.<br>
-                                This message was sent to {user.email}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-'''
-            
-            # Plain text version
-            text_content = f'''Password Reset Request
-
-Hello {student_name},
-
-We received a request to reset your password.
-
-Your new password is: {new_password}
-
-Important:
-- Use this password to log in immediately
-- Change this password after logging in for security
-- If you didn't request this, contact admin immediately
-
-Log in at: http://localhost:3000/login
-
-Best regards,
-EARIST OJT System'''
+            # HTML and plain text come from the precompiled templates in email_templates.py
+            html_content, text_content = email_templates.render(
+                'password_reset', new_password=new_password, name=student_name, email=user.email
+            )
             
-            # Create email with both HTML and plain text
-            email_msg = EmailMultiAlternatives(
+            # Queue email with both HTML and plain text (delivered by send_queued_emails)
+            enqueue_email(
                 subject='Password Reset Request - EARIST OJT System',
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[user.email]
+                to_email=user.email,
+                body_text=text_content,
+                body_html=html_content
             )
-            email_msg.attach_alternative(html_content, "text/html")
-            
-            print(f"[PASSWORD RESET] Attempting to send email to {user.email}...")
-            email_msg.send(fail_silently=False)
-            print(f"[PASSWORD RESET] Email sent successfully to {user.email}")
+            print(f"[PASSWORD RESET] Email queued for {user.email}")
             
             return Response({
                 'message': f'A new password has been sent to {user.email}. Please check your inbox.'
@@ -1617,10 +1250,13 @@ def change_password(request):
 @permission_classes([IsAuthenticated])
 def my_profile(request):
     """Get or update own student profile"""
-    try:
-        profile = StudentProfile.objects.get(user=request.user)
-    except StudentProfile.DoesNotExist:
+    # Already joined in by the authentication class
+    profile = getattr(request.user, 'student_profile', None)
+    if profile is None:
         profile = StudentProfile.objects.create(user=request.user)
+    elif request.method != 'GET':
+        # request.user may come from the token cache; never write back a stale copy
+        profile = StudentProfile.objects.get(pk=profile.pk)
     
     if request.method == 'GET':
         serializer = StudentProfileSerializer(profile, context={'request': request})
@@ -1690,9 +1326,8 @@ def users_list(request):
         return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
     
     if request.method == 'GET':
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        users = annotate_user_profiles(User.objects.all())
+        return list_response(request, users, UserSerializer, ('-date_joined', '-id'), context={})
     
     elif request.method == 'POST':
         # Create new user
@@ -2292,7 +1927,7 @@ def analyze_text(request):
         profile_summary = ""
         if include_profile:
             try:
-                sp = StudentProfile.objects.filter(user=request.user).first()
+                sp = getattr(request.user, 'student_profile', None)
                 user = request.user
                 profile_lines = [f"User: {user.get_full_name() or user.username}"]
                 if user.email:
@@ -2421,8 +2056,7 @@ def daily_journal_list(request):
         else:
             journals = DailyJournal.objects.filter(student=request.user)
         
-        serializer = DailyJournalSerializer(journals, many=True, context={'request': request})
-        return Response(serializer.data)
+        return list_response(request, journals, DailyJournalSerializer, ('-date', '-id'))
     
     elif request.method == 'POST':
         # Only students can create journals
@@ -2523,6 +2157,8 @@ def approve_journal(request, pk):
     
     if comment:
         journal.supervisor_comment = comment
+    journal.reviewed_by = request.user
+    journal.reviewed_at = timezone.now()
     journal.save()
     
     # Send email notification to student
@@ -2537,6 +2173,34 @@ def approve_journal(request, pk):
     return Response(serializer.data)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@role_required([UserRole.SUPERVISOR, UserRole.COORDINATOR, UserRole.ADMIN])
+def journal_bulk_review(request):
+    """
+    Approve or reject many submitted journal entries at once.
+    Expects JSON: { action: 'approve'|'reject', ids: [<id>, ...] } or
+    { action, date_from, date_to, student_id: <optional> }, plus an optional comment.
+    Supervisors are limited to their interns and coordinators to their college.
+    """
+    from .review_transitions import bulk_review_journals, parse_selection, JOURNAL_ACTIONS
+    
+    action = request.data.get('action')
+    if action not in JOURNAL_ACTIONS:
+        return Response({'error': f'Invalid action. Choose from: {", ".join(JOURNAL_ACTIONS)}'}, status=status.HTTP_400_BAD_REQUEST)
+    selection, error = parse_selection(request.data)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        result = bulk_review_journals(request.user, action, comment=request.data.get('comment', ''), **selection)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    result['message'] = f"{result['updated']} journal entr{'y' if result['updated'] == 1 else 'ies'} marked {result['status']}"
+    return Response(result)
+
+
 # 📄 Pre-Training Requirements Views
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -2649,8 +2313,7 @@ def attendance_list(request):
         else:
             attendances = Attendance.objects.filter(student=request.user)
         
-        serializer = AttendanceSerializer(attendances, many=True, context={'request': request})
-        return Response(serializer.data)
+        return list_response(request, attendances, AttendanceSerializer, ('-date', '-id'))
     
     elif request.method == 'POST':
         import secrets
@@ -2760,8 +2423,7 @@ def task_list(request):
         else:
             tasks = Task.objects.filter(student=request.user)
         
-        serializer = TaskSerializer(tasks, many=True, context={'request': request})
-        return Response(serializer.data)
+        return list_response(request, tasks, TaskSerializer, ('-created_at', '-id'))
     
     elif request.method == 'POST':
         # Supervisors/admins can assign tasks
@@ -2880,8 +2542,7 @@ def notice_list(request):
             ).filter(
                 Q(expires_at__gte=today) | Q(expires_at__isnull=True)
             )
-        serializer = NoticeSerializer(notices, many=True, context={'request': request})
-        return Response(serializer.data)
+        return list_response(request, notices, NoticeSerializer, ('-created_at', '-id'))
     
     elif request.method == 'POST':
         if not request.user.is_authenticated or not request.user.is_staff:
@@ -3010,57 +2671,21 @@ def student_progress(request, student_id=None):
         else:
             student = request.user
         
-        # Calculate total hours from journals and attendance
-        journal_hours = DailyJournal.objects.filter(student=student).aggregate(
-            total=Sum('hours_rendered')
-        )['total'] or 0
-        
-        attendance_hours = Attendance.objects.filter(student=student).aggregate(
-            total=Sum('hours_rendered')
-        )['total'] or 0
-        
-        total_hours = float(journal_hours) + float(attendance_hours)
+        # Hours and requirement by the same rule as the roster and supervisor pages
+        from .hours_ledger import rendered_hours, student_totals
+        from .required_hours import progress_percentage, student_required_hours
+        ledger = student_totals(student.id)
+        total_hours = rendered_hours(ledger)
         
         # Get application status
         applications = Application.objects.filter(student=student)
         approved_app = applications.filter(status='Approved').first()
         
-        # Calculate progress percentage
-        required_hours = 320  # Default required hours
-        
-        if approved_app and approved_app.internship and approved_app.internship.duration_hours:
-             required_hours = approved_app.internship.duration_hours
-
-        # Check Coordinator Settings for Course-specific requirements (Overrides Internship)
-        try:
-            from .models import CoordinatorProfile, CoordinatorSettings
-            # Get profile safely
-            if hasattr(student, 'student_profile'):
-                student_profile = student.student_profile
-                if student_profile.college:
-                    coord_profile = CoordinatorProfile.objects.filter(college=student_profile.college).first()
-                    if coord_profile:
-                        settings = CoordinatorSettings.objects.filter(coordinator=coord_profile.user).first()
-                        if settings and settings.hours_config:
-                            for config in settings.hours_config:
-                                program = config.get('program', '')
-                                course = student_profile.course or ''
-                                # Match program name with course
-                                if program and course and (program.lower() == course.lower() or program in course or course in program):
-                                    req = config.get('requiredHours')
-                                    if req:
-                                        required_hours = int(req)
-                                        # Prefer exact match if possible, otherwise keep looking? 
-                                        # Usually first match is good enough.
-                                        break
-        except Exception as e:
-            print(f"Error checking coordinator settings: {e}")
-            pass
-        
-        progress_percentage = min(100, (total_hours / required_hours * 100) if required_hours > 0 else 0)
+        required_hours = student_required_hours(getattr(student, 'student_profile', None))
+        overall_progress = progress_percentage(total_hours, required_hours)
         
         # Get statistics
-        journal_count = DailyJournal.objects.filter(student=student).count()
+        journal_count = ledger['journal_count']
         task_count = Task.objects.filter(student=student).count()
         completed_tasks = Task.objects.filter(student=student, status='Completed').count()
         evaluations_count = PerformanceEvaluation.objects.filter(student=student).count()
@@ -3091,7 +2716,7 @@ def student_progress(request, student_id=None):
             'student_name': student.get_full_name() or student.username,
             'total_hours_rendered': round(total_hours, 2),
             'required_hours': required_hours,
-            'overall_progress': round(progress_percentage, 2),
+            'overall_progress': round(overall_progress, 2),
             'journal_entries_count': journal_count,
             'total_tasks': task_count,
             'tasks_completed': completed_tasks,
@@ -3113,41 +2738,31 @@ def student_progress(request, student_id=None):
 
 
 # 📄 Serve Media Files Without X-Frame-Options
-from django.http import FileResponse, Http404
+from django.http import Http404, JsonResponse
 from django.conf import settings
 from django.views.decorators.clickjacking import xframe_options_exempt
 import os
-import mimetypes
 
 @xframe_options_exempt
 def serve_media_file(request, file_path):
     """Serve media files without X-Frame-Options header to allow iframe embedding"""
-    print(f"[DEBUG] serve_media_file called with file_path: {file_path}")
-    
-    # Construct the full file path
-    full_path = os.path.join(settings.MEDIA_ROOT, file_path)
-    print(f"[DEBUG] Full path: {full_path}")
-    print(f"[DEBUG] File exists: {os.path.exists(full_path)}")
-    
-    # Security check: ensure the file is within MEDIA_ROOT
-    if not os.path.abspath(full_path).startswith(os.path.abspath(settings.MEDIA_ROOT)):
-        print(f"[DEBUG] Security check failed - file outside MEDIA_ROOT")
+    from .media_responses import resolve_media_path, file_response
+    from .media_access import media_user, can_view_media
+
+    # Ownership/role check first, so nothing about the file leaks to other users
+    user = media_user(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    if not can_view_media(user, file_path):
         raise Http404("File not found")
-    
-    # Check if file exists
-    if not os.path.exists(full_path):
-        print(f"[DEBUG] File does not exist")
+
+    # Security check: ensure the file is within MEDIA_ROOT and exists
+    full_path = resolve_media_path(file_path)
+    if full_path is None:
         raise Http404("File not found")
-    
-    # Determine content type
-    content_type, _ = mimetypes.guess_type(full_path)
-    if content_type is None:
-        content_type = 'application/octet-stream'
-    
-    print(f"[DEBUG] Content type: {content_type}")
-    
-    # Open and serve the file
-    response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+
+    # Handles ETag/Last-Modified revalidation, Range requests and X-Accel-Redirect offload
+    response = file_response(request, full_path)
     
     # Remove X-Frame-Options to allow iframe embedding from different ports
     # @xframe_options_exempt already helps, but ensuring the header is permissive
@@ -3157,10 +2772,46 @@ def serve_media_file(request, file_path):
     # Add CORS headers for cross-origin requests
     response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
     response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
-    response['Access-Control-Allow-Headers'] = 'Content-Type'
-    response['Access-Control-Expose-Headers'] = 'Content-Disposition'
+    response['Access-Control-Allow-Headers'] = 'Content-Type, Range, If-None-Match, If-Modified-Since, If-Range'
+    response['Access-Control-Expose-Headers'] = 'Content-Disposition, Content-Range, Accept-Ranges, Content-Length, ETag'
     
-    print(f"[DEBUG] Serving file successfully")
+    return response
+
+
+@xframe_options_exempt
+def serve_media_thumbnail(request, size, file_path):
+    """Serve a resized thumbnail (images) or first-page preview (PDFs), generated on first request"""
+    from .media_responses import resolve_media_path, file_response
+    from .thumbnails import THUMBNAIL_SIZES, DERIVATIVES_DIR, get_or_create_derivative
+
+    from .media_access import media_user, can_view_media
+
+    if size not in THUMBNAIL_SIZES or file_path.startswith(DERIVATIVES_DIR + '/'):
+        raise Http404("File not found")
+
+    # Same permission rules as the full file
+    user = media_user(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    if not can_view_media(user, file_path):
+        raise Http404("File not found")
+
+    source_path = resolve_media_path(file_path)
+    if source_path is None:
+        raise Http404("File not found")
+
+    try:
+        derivative = get_or_create_derivative(source_path, size)
+    except Exception as e:
+        print(f"❌ Thumbnail generation failed for {file_path}: {str(e)}")
+        derivative = None
+    if derivative is None:
+        raise Http404("Preview not available")
+
+    response = file_response(request, derivative)
+    if 'X-Frame-Options' in response:
+        del response['X-Frame-Options']
+    response['Access-Control-Allow-Origin'] = 'http://localhost:3000'
     return response
 
 
@@ -4096,39 +3747,52 @@ def admin_backup_database(request):
         
         # Generate backup filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = os.path.join(backup_dir, f'backup_{timestamp}.json')
-        
-        # Use Django's dumpdata command
-        result = subprocess.run(
-            ['python', 'manage.py', 'dumpdata', '--output', backup_file, '--indent', '2'],
-            cwd=settings.BASE_DIR,
-            capture_output=True,
-            text=True
-        )
         
-        if result.returncode == 0:
-            # Get file size
-            file_size = os.path.getsize(backup_file)
-            file_size_mb = file_size / (1024 * 1024)
+        if db_settings['ENGINE'] == 'django.db.backends.sqlite3':
+            # Online backup API: copies pages in small steps so live requests keep writing,
+            # verifies the copy with PRAGMA integrity_check and gzips it to disk
+            from .backup_engine import BackupError, online_sqlite_backup
+            backup_file = os.path.join(backup_dir, f'backup_{timestamp}.sqlite3.gz')
+            try:
+                online_sqlite_backup(db_name, backup_file)
+            except BackupError as e:
+                return Response({
+                    'error': 'Backup failed',
+                    'details': str(e)
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        else:
+            backup_file = os.path.join(backup_dir, f'backup_{timestamp}.json')
             
-            # Log the backup
-            UserActivityLog.objects.create(
-                user=request.user,
-                action='database_backup',
-                description=f'Database backup created: {os.path.basename(backup_file)}'
+            # Use Django's dumpdata command
+            result = subprocess.run(
+                ['python', 'manage.py', 'dumpdata', '--output', backup_file, '--indent', '2'],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True
             )
-            
-            return Response({
-                'message': 'Database backup created successfully',
-                'backup_file': os.path.basename(backup_file),
-                'file_size_mb': round(file_size_mb, 2),
-                'timestamp': timestamp
-            })
-        else:
-            return Response({
-                'error': 'Backup failed',
-                'details': result.stderr
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            if result.returncode != 0:
+                return Response({
+                    'error': 'Backup failed',
+                    'details': result.stderr
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        # Get file size
+        file_size = os.path.getsize(backup_file)
+        file_size_mb = file_size / (1024 * 1024)
+        
+        # Log the backup
+        UserActivityLog.objects.create(
+            user=request.user,
+            action='database_backup',
+            description=f'Database backup created: {os.path.basename(backup_file)}'
+        )
+        
+        return Response({
+            'message': 'Database backup created successfully',
+            'backup_file': os.path.basename(backup_file),
+            'file_size_mb': round(file_size_mb, 2),
+            'timestamp': timestamp
+        })
             
     except Exception as e:
         return Response({
@@ -4154,7 +3818,7 @@ def admin_list_backups(request):
         
         backups = []
         for filename in os.listdir(backup_dir):
-            if filename.startswith('backup_') and filename.endswith('.json'):
+            if filename.startswith('backup_') and filename.endswith(('.json', '.sqlite3.gz')):
                 filepath = os.path.join(backup_dir, filename)
                 file_size = os.path.getsize(filepath)
                 file_size_mb = file_size / (1024 * 1024)
@@ -4381,73 +4045,24 @@ def grading_criteria_detail(request, pk):
 @permission_classes([IsAuthenticated])
 @role_required([UserRole.COORDINATOR, UserRole.ADMIN])
 def compute_student_grade(request, student_id):
-    """Compute final grade for a student based on criteria"""
+    """Compute final grade for a student based on criteria (same engine as the bulk grading)"""
     try:
-        student = User.objects.get(id=student_id)
-        
-        # 1. Calculate Attendance Score
-        # Assumption: 486 hours required (or fetch from settings)
-        required_hours = 486 
-        total_hours = DailyJournal.objects.filter(student=student, status='Approved').aggregate(total=models.Sum('hours_rendered'))['total'] or 0
-        attendance_percentage = min((float(total_hours) / required_hours) * 100, 100)
+        from .bulk_grading import grade_students
         
-        # 2. Calculate Supervisor Rating Score
-        # Average of overall_rating (1-5). Convert to percentage: (Rating / 5) * 100
-        avg_rating = PerformanceEvaluation.objects.filter(student=student).aggregate(avg=models.Avg('overall_rating'))['avg'] or 0
-        supervisor_percentage = (float(avg_rating) / 5.0) * 100
-        
-        # 3. Requirements Score (Placeholder logic)
-        requirements_percentage = 100 # Assume complete for now
-        
-        # 4. Final Grade Computation based on GradingCriteria
-        criteria = GradingCriteria.objects.all()
-        final_score = 0
+        student = User.objects.get(id=student_id)
+        result = grade_students([student.id])
         
-        # Default weights if no criteria set
-        if not criteria.exists():
-            # Default: 30% Attendance, 50% Supervisor, 20% Requirements
-            final_score = (attendance_percentage * 0.30) + (supervisor_percentage * 0.50) + (requirements_percentage * 0.20)
-        else:
-            for c in criteria:
-                if 'Attendance' in c.name:
-                    final_score += (attendance_percentage * float(c.weight) / 100)
-                elif 'Supervisor' in c.name or 'Evaluation' in c.name:
-                    final_score += (supervisor_percentage * float(c.weight) / 100)
-                elif 'Requirement' in c.name or 'Document' in c.name:
-                    final_score += (requirements_percentage * float(c.weight) / 100)
-        
-        # Convert Percentage to Grade (1.0 - 5.0)
-        if final_score >= 98: grade = 1.00
-        elif final_score >= 95: grade = 1.25
-        elif final_score >= 92: grade = 1.50
-        elif final_score >= 89: grade = 1.75
-        elif final_score >= 86: grade = 2.00
-        elif final_score >= 83: grade = 2.25
-        elif final_score >= 80: grade = 2.50
-        elif final_score >= 77: grade = 2.75
-        elif final_score >= 75: grade = 3.00
-        else: grade = 5.00
-        
-        remarks = 'Passed' if grade <= 3.0 else 'Failed'
-        
-        # Save
-        obj, created = StudentFinalGrade.objects.update_or_create(
-            student=student,
-            defaults={
-                'attendance_score': attendance_percentage,
-                'supervisor_rating_score': supervisor_percentage,
-                'requirements_score': requirements_percentage,
-                'final_grade': grade,
-                'remarks': remarks
-            }
-        )
+        # Unchanged grades produce no change entry; read back what is stored
+        grade = StudentFinalGrade.objects.get(student=student)
         
         return Response({
             'student': student.username,
-            'attendance_score': round(attendance_percentage, 2),
-            'supervisor_score': round(supervisor_percentage, 2),
-            'final_grade': grade,
-            'remarks': remarks
+            'attendance_score': round(float(grade.attendance_score), 2),
+            'supervisor_score': round(float(grade.supervisor_rating_score), 2),
+            'requirements_score': round(float(grade.requirements_score), 2),
+            'final_grade': float(grade.final_grade),
+            'remarks': grade.remarks,
+            'changed': bool(result['changes'])
         })
         
     except User.DoesNotExist:
@@ -4532,13 +4147,13 @@ def coordinator_analytics(request):
             completed_students = 0
         completion_rate = (completed_students / total_students * 100) if total_students > 0 else 0
         
-        # Hours rendered - sum of all approved journal hours
+        # Hours rendered - sum of all approved journal hours (from the hours ledger)
         from django.db.models import Sum, Avg, Count
         try:
-            total_hours = DailyJournal.objects.filter(
-                student_id__in=student_ids,
-                status='Approved'
-            ).aggregate(total=Sum('hours_rendered'))['total'] or 0
+            total_hours = HoursLedger.objects.filter(
+                student_id__in=student_ids
+            ).aggregate(total=Sum('journal_approved_hours'))['total'] or 0
+            total_hours = float(total_hours)
         except Exception as e:
             print(f"Error getting total hours: {e}")
             total_hours = 0
@@ -4631,9 +4246,10 @@ def coordinator_analytics(request):
             'details': error_details if settings.DEBUG else None
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class NarrativeReportViewSet(viewsets.ModelViewSet):
+class NarrativeReportViewSet(ProjectedListMixin, viewsets.ModelViewSet):
     serializer_class = NarrativeReportSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ('-submitted_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
@@ -4761,129 +4377,20 @@ def choose_2fa_method(request):
             )
             
             try:
-                from django.core.mail import EmailMultiAlternatives
-                from django.utils.html import strip_tags
-                
-                # HTML email template
-                html_content = f'''
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; background-color: #f5f5f5;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f5f5; padding: 40px 20px;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 1px solid #e0e0e0;">
-                            <div style="font-size: 32px; margin-bottom: 10px;">🔐</div>
-                            <h1 style="margin: 0; font-size: 24px; font-weight: 600; color: #333;">EARIST OJT System</h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <h2 style="margin: 0 0 20px; font-size: 20px; font-weight: 600; color: #333; text-align: center;">
-                                Security Verification Code
-                            </h2>
-                            
-                            <p style="margin: 0 0 30px; font-size: 15px; line-height: 1.6; color: #666; text-align: center;">
-                                Hello <strong>{user.get_full_name() or user.username}</strong>,<br>
-                                We received a request to verify your identity.
-                            </p>
-                            
-                            <!-- Code Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0">
-                                <tr>
-                                    <td align="center" style="padding: 20px 0;">
-                                        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 3px; border-radius: 12px; display: inline-block;">
-                                            <div style="background: #ffffff; padding: 25px 50px; border-radius: 10px;">
-                                                <div style="font-size: 36px; font-weight: 700; letter-spacing: 8px; color: #667eea; font-family: 'Courier New', monospace;">
-                                                    {code}
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="margin: 30px 0 0; font-size: 14px; line-height: 1.6; color: #666; text-align: center;">
-                                This code will expire in <strong>10 minutes</strong>.
-                            </p>
-                            
-                            <!-- Warning Box -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-top: 30px;">
-                                <tr>
-                                    <td style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; border-radius: 4px;">
-                                        <p style="margin: 0; font-size: 13px; color: #856404; line-height: 1.5;">
-                                            <strong>⚠️ Security Notice:</strong><br>
-                                            If you didn't request this code, please ignore this email or contact your administrator immediately.
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f8f9fa; border-top: 1px solid #e0e0e0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 10px; font-size: 13px; color: #666; text-align: center;">
-                                Best regards,<br>
-                                <strong>EARIST OJT System Team</strong>
-                            </p>
-                            <p style="margin: 0; font-size: 12px; color: #999; text-align: center;">
-                                This is an automated message, please do not reply to this email.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-                
-                <!-- Footer Note -->
-                <table width="600" cellpadding="0" cellspacing="0" style="margin-top: 20px;">
-                    <tr>
-                        <td style="text-align: center; padding: 0 40px;">
-                            <p style="margin: 0; font-size: 12px; color: #999; line-height: 1.5;">
-                                © 2025 EARIST OJT System. All rights reserved.<br>
-                                This message was sent to {user.email}
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-'''
+                from .email_outbox import enqueue_email
                 
-                # Plain text version
-                text_content = f'''Hello {user.get_full_name() or user.username},
-
-Your 2FA verification code is: {code}
-
-This code will expire in 10 minutes.
-
-If you did not request this code, please ignore this email or contact your administrator.
-
-Best regards,
-EARIST OJT System
-'''
+                # HTML and plain text come from the precompiled templates in email_templates.py
+                html_content, text_content = email_templates.render(
+                    'two_factor_code', code=code, email=user.email, name=user.get_full_name() or user.username
+                )
                 
-                # Create email with both HTML and plain text
-                email = EmailMultiAlternatives(
+                # Queue email with both HTML and plain text (delivered by send_queued_emails)
+                enqueue_email(
                     subject='EARIST OJT System - Your 2FA Code',
-                    body=text_content,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[user.email]
+                    to_email=user.email,
+                    body_text=text_content,
+                    body_html=html_content
                 )
-                email.attach_alternative(html_content, "text/html")
-                email.send(fail_silently=False)
             except Exception as email_error:
                 return Response({
                     'error': f'Failed to send verification email: {str(email_error)}'
@@ -5269,11 +4776,13 @@ def send_email_otp(request):
             ip_address=ip_address
         )
         
-        # Send email
+        # Queue email (delivered by send_queued_emails)
         try:
-            send_mail(
+            from .email_outbox import enqueue_email
+            enqueue_email(
                 subject='EARIST OJT System - Your 2FA Code',
-                message=f'''Hello {user.get_full_name() or user.username},
+                to_email=user.email,
+                body_text=f'''Hello {user.get_full_name() or user.username},
 
 Your 2FA verification code is: {code}
 
@@ -5283,10 +4792,7 @@ If you did not request this code, please ignore this email or contact your admin
 
 Best regards,
 EARIST OJT System
-''',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
+'''
             )
             
             return Response({
@@ -5374,7 +4880,8 @@ def verify_email_otp(request):
         token, created = Token.objects.get_or_create(user=user)
         
         # Reset login attempts
-        LoginAttempt.objects.filter(username=user.username).delete()
+        from . import login_throttle
+        login_throttle.reset(user.username)
         
         # Log login activity
         UserActivityLog.objects.create(
@@ -5424,17 +4931,30 @@ def verify_email_otp(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_list(request):
-    """Get user's notifications"""
-    from .models import Notification
+    """
+    Get user's notifications, newest first.
+    Query params: cursor (next_cursor from the previous page), since (id or ISO timestamp), limit
+    Pass count_only=true for a cheap badge poll.
+    """
     from .serializers import NotificationSerializer
     
-    notifications = Notification.objects.filter(user=request.user)
-    unread_count = notifications.filter(is_read=False).count()
+    unread_count = notification_utils.get_unread_count(request.user.id)
+    if request.query_params.get('count_only') in ('1', 'true', 'True'):
+        return Response({'unread_count': unread_count})
+    
+    notifications, next_cursor, has_more = notification_utils.paginate_notifications(
+        request.user,
+        cursor=request.query_params.get('cursor'),
+        since=request.query_params.get('since'),
+        limit=request.query_params.get('limit'),
+    )
     
     serializer = NotificationSerializer(notifications, many=True)
     return Response({
         'notifications': serializer.data,
-        'unread_count': unread_count
+        'unread_count': unread_count,
+        'next_cursor': next_cursor,
+        'has_more': has_more
     })
 
 
@@ -5444,13 +4964,16 @@ def mark_notification_read(request, notification_id):
     """Mark a notification as read"""
     from .models import Notification
     
-    try:
-        notification = Notification.objects.get(id=notification_id, user=request.user)
-        notification.is_read = True
-        notification.save()
-        return Response({'message': 'Notification marked as read'})
-    except Notification.DoesNotExist:
+    updated = Notification.objects.filter(
+        id=notification_id, user=request.user, is_read=False
+    ).update(is_read=True)
+    
+    if updated:
+        notification_utils.decrement_unread(request.user.id, updated)
+    elif not Notification.objects.filter(id=notification_id, user=request.user).exists():
         return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({'message': 'Notification marked as read'})
 
 
 @api_view(['PUT'])
@@ -5460,6 +4983,7 @@ def mark_all_notifications_read(request):
     from .models import Notification
     
     Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    notification_utils.reset_unread(request.user.id)
     return Response({'message': 'All notifications marked as read'})
 
 
@@ -5956,20 +5480,14 @@ def update_typing_status(request):
     if not recipient_id:
         return Response({'error': 'recipient_id is required'}, status=400)
     
-    # Verify recipient exists
     try:
-        recipient = User.objects.get(id=recipient_id)
-    except User.DoesNotExist:
+        recipient_id = int(recipient_id)
+    except (TypeError, ValueError):
         return Response({'error': 'Recipient not found'}, status=404)
-        
-    # Update or create indicator
-    indicator, created = TypingIndicator.objects.get_or_create(
-        user=request.user,
-        recipient=recipient
-    )
     
-    indicator.is_typing = is_typing
-    indicator.save() # Updates last_typed_at automatically due to auto_now=True
+    # Typing state lives in the shared cache with a short TTL (see core/presence.py)
+    if not presence.set_typing(request.user.id, recipient_id, bool(is_typing)):
+        return Response({'error': 'Recipient not found'}, status=404)
     
     return Response({'status': 'success'})
 
@@ -5984,23 +5502,13 @@ def get_typing_status(request):
     user_id = request.query_params.get('user_id')
     if not user_id:
         return Response({'error': 'user_id is required'}, status=400)
-        
+    
     try:
-        indicator = TypingIndicator.objects.get(
-            user_id=user_id, 
-            recipient=request.user
-        )
-        
-        # Check if "expired" (e.g. > 5 seconds old)
-        time_threshold = timezone.now() - timedelta(seconds=5)
-        if indicator.last_typed_at < time_threshold:
-             indicator.is_typing = False
-             indicator.save(update_fields=['is_typing'])
-             return Response({'is_typing': False})
-             
-        return Response({'is_typing': indicator.is_typing})
-    except TypingIndicator.DoesNotExist:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
         return Response({'is_typing': False})
+    
+    return Response({'is_typing': presence.is_typing(user_id, request.user.id)})
 
 
 # 🎓 Get Coordinator Settings for Student
@@ -6087,6 +5595,7 @@ def generate_student_qr_code(request):
 def public_student_profile(request, token):
     """Public student profile accessible via QR code scan"""
     from .two_factor_utils import decrypt_student_qr_token
+    from .thumbnails import thumbnail_url
     import logging
     logger = logging.getLogger(__name__)
     logger.error(f"[QR DEBUG] Token received: {token}")
@@ -6114,6 +5623,7 @@ def public_student_profile(request, token):
                 'student_id': profile.student_id,
                 'email': user.email,
                 'profile_picture': request.build_absolute_uri(profile.profile_picture.url) if profile.profile_picture else None,
+                'profile_picture_thumbnail': thumbnail_url(request, profile.profile_picture, 'medium'),
                 'has_active_internship': False,
                 'evaluation_count': PerformanceEvaluation.objects.filter(student=user).count()
             })
@@ -6135,6 +5645,7 @@ def public_student_profile(request, token):
             'year': profile.year,
             'college': profile.get_college_display() if profile.college else '',
             'profile_picture': request.build_absolute_uri(profile.profile_picture.url) if profile.profile_picture else None,
+            'profile_picture_thumbnail': thumbnail_url(request, profile.profile_picture, 'medium'),
             'has_active_internship': True,
             'company_name': company.name,
             'company_address': company.address,
@@ -6215,8 +5726,7 @@ def public_submit_evaluation(request, token):
         
         # Send email copy to supervisor
         try:
-            from django.core.mail import send_mail
-            from django.conf import settings
+            from .email_outbox import enqueue_email
             
             email_subject = f"Performance Evaluation Copy - {student.get_full_name()}"
             email_body = f"""
@@ -6240,12 +5750,11 @@ Best regards,
 EARIST OJT Management System
             """
             
-            send_mail(
-                email_subject,
-                email_body,
-                settings.EMAIL_HOST_USER,
-                [supervisor_email],
-                fail_silently=True
+            enqueue_email(
+                subject=email_subject,
+                to_email=supervisor_email,
+                body_text=email_body,
+                from_email=settings.EMAIL_HOST_USER
             )
         except Exception as email_error:
             # Don't fail the request if email fails
@@ -6,23 +6,15 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from django.core.cache import cache
+from django.core.management import call_command
 
 username = '224-09101M'
 
 try:
     user = User.objects.get(username=username)
     
-    # Clear all possible cache keys for login attempts
-    cache_keys = [
-        f'login_attempts_{username}',
-        f'login_locked_{username}',
-        f'failed_attempts_{username}',
-        f'lockout_{username}',
-    ]
-    
-    for key in cache_keys:
-        cache.delete(key)
+    # Failures and lockouts live in the cache (see core/login_throttle.py)
+    call_command('clear_login_lockouts', username)
     
     print(f"\n{'='*50}")
     print(f"✅ Account unlocked successfully!")
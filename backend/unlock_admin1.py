@@ -1,5 +1,5 @@
 """
-Unlock admin1 account by clearing login attempts
+Unlock admin1 account by clearing cached login failures and lockouts
 """
 import os
 import sys
@@ -10,7 +10,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
 from django.contrib.auth.models import User
-from core.models import LoginAttempt
+from django.core.management import call_command
 
 try:
     # Check if user exists
@@ -20,20 +20,9 @@ try:
     print("🔓 UNLOCKING ADMIN1 ACCOUNT")
     print("="*60 + "\n")
     
-    # Check for login attempts
-    try:
-        login_attempt = LoginAttempt.objects.get(username='admin1')
-        print(f"📊 Current Status:")
-        print(f"   Failed Attempts: {login_attempt.attempts}")
-        print(f"   Last Attempt: {login_attempt.last_attempt}")
-        print(f"   IP Address: {login_attempt.ip_address}")
-        
-        # Delete the login attempt record to unlock
-        login_attempt.delete()
-        print(f"\n✅ Login attempts cleared!")
-        
-    except LoginAttempt.DoesNotExist:
-        print("ℹ️  No login attempt records found (account was not locked)")
+    # Failures and lockouts live in the cache (see core/login_throttle.py)
+    call_command('clear_login_lockouts', 'admin1')
+    print(f"\n✅ Login attempts cleared!")
     
     # Also reset the password to admin123 to be sure
     user.set_password('admin123')
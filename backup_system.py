@@ -4,21 +4,28 @@ EARIST OJT System - Automated Backup Script
 
 This script creates automated backups of:
 1. Database (SQLite)
-2. Uploaded files (media folder)
+2. Uploaded files (media folder, incremental)
 3. Environment configuration
 
 Backups are stored with timestamps and old backups are automatically cleaned.
+Media backups only copy files that are new or changed since the last run; a
+full backup is taken every few runs (or with --full-media). Archive volumes are
+compressed in parallel (--workers N), and images, PDFs and Office files are
+stored without recompressing them. Timings for each phase are printed and
+saved in backup_info_<timestamp>.json.
 
 Usage:
     python backup_system.py
+    python backup_system.py --full-media
+    python backup_system.py --workers 2
 
 Schedule this to run daily using Windows Task Scheduler.
 """
 
 import os
+import sys
 import shutil
 import datetime
-import zipfile
 import json
 from pathlib import Path
 
@@ -37,6 +44,14 @@ ENV_FILE = BACKEND_DIR / ".env"
 BACKUP_DIR = BASE_DIR / "backups"
 BACKUP_DIR.mkdir(exist_ok=True)
 
+# Shared backup engine (plain Python, no Django needed)
+sys.path.insert(0, str(BACKEND_DIR))
+from core.backup_engine import (
+    online_sqlite_backup, backup_timestamp, DB_BACKUP_GLOB,
+    scan_media, backup_media_incremental, referenced_media_archives, phase_stats,
+    MEDIA_MANIFEST_GLOB, MEDIA_ARCHIVE_GLOB, MEDIA_BACKUP_WORKERS,
+)
+
 # Retention policy
 KEEP_DAILY_BACKUPS = 30      # Keep daily backups for 30 days
 KEEP_WEEKLY_BACKUPS = 12     # Keep weekly backups for 12 weeks
@@ -46,12 +61,33 @@ KEEP_MONTHLY_BACKUPS = 12    # Keep monthly backups for 12 months
 # BACKUP FUNCTIONS
 # ============================================================================
 
+def get_workers():
+    """Worker processes for media compression (--workers N overrides the default)."""
+    if "--workers" in sys.argv:
+        try:
+            return max(int(sys.argv[sys.argv.index("--workers") + 1]), 1)
+        except (IndexError, ValueError):
+            print("⚠️  --workers needs a number, using the default")
+    return MEDIA_BACKUP_WORKERS
+
+def print_phases(phases):
+    """Print how long each backup phase took and how fast it went."""
+    for name, stats in phases.items():
+        line = f"   {name:<12} {stats['seconds']:>7.2f}s"
+        if stats.get('mb_per_s') is not None:
+            line += f"  {stats['bytes'] / (1024 * 1024):>9.2f} MB  {stats['mb_per_s']:>8.2f} MB/s"
+        if 'files' in stats:
+            line += f"  {stats['files']} files"
+        if 'volumes' in stats:
+            line += f" in {stats['volumes']} volume(s) ({stats['stored']} stored, {stats['deflated']} deflated)"
+        print(line)
+
 def get_timestamp():
     """Get current timestamp for backup naming."""
     return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def get_backup_info():
-    """Get information about what's being backed up."""
+def get_backup_info(media_scan=None):
+    """Get information about what's being backed up (media_scan comes from scan_media)."""
     info = {
         "timestamp": datetime.datetime.now().isoformat(),
         "database_size": 0,
@@ -62,48 +98,49 @@ def get_backup_info():
     if DATABASE_FILE.exists():
         info["database_size"] = DATABASE_FILE.stat().st_size
     
-    if MEDIA_DIR.exists():
-        media_files = list(MEDIA_DIR.rglob("*"))
-        info["files_backed_up"] = len([f for f in media_files if f.is_file()])
-        info["media_size"] = sum(f.stat().st_size for f in media_files if f.is_file())
+    if media_scan:
+        info["files_backed_up"] = len(media_scan)
+        info["media_size"] = sum(size for size, _ in media_scan.values())
     
     return info
 
-def backup_database(timestamp):
-    """Backup the SQLite database."""
+def backup_database(timestamp, phases=None):
+    """Backup the SQLite database (online backup API, safe while the site is running)."""
     if not DATABASE_FILE.exists():
         print(f"⚠️  Database not found: {DATABASE_FILE}")
         return None
     
-    backup_file = BACKUP_DIR / f"db_backup_{timestamp}.sqlite3"
+    backup_file = BACKUP_DIR / f"db_backup_{timestamp}.sqlite3.gz"
     
     try:
-        shutil.copy2(DATABASE_FILE, backup_file)
-        size_mb = backup_file.stat().st_size / (1024 * 1024)
-        print(f"✅ Database backed up: {backup_file.name} ({size_mb:.2f} MB)")
+        result = online_sqlite_backup(DATABASE_FILE, backup_file)
+        size_mb = result['size'] / (1024 * 1024)
+        print(f"✅ Database backed up: {backup_file.name} ({size_mb:.2f} MB compressed, "
+              f"{result['pages']} pages in {result['seconds']}s, integrity ok)")
+        if phases is not None:
+            phases["database"] = phase_stats(result['seconds'], DATABASE_FILE.stat().st_size)
         return backup_file
     except Exception as e:
         print(f"❌ Database backup failed: {e}")
         return None
 
-def backup_media(timestamp):
-    """Backup uploaded media files."""
+def backup_media(timestamp, media_scan=None, full=False, workers=MEDIA_BACKUP_WORKERS, phases=None):
+    """Backup uploaded media files (only new or changed files unless full)."""
     if not MEDIA_DIR.exists():
         print(f"⚠️  Media directory not found: {MEDIA_DIR}")
         return None
     
-    backup_file = BACKUP_DIR / f"media_backup_{timestamp}.zip"
-    
     try:
-        with zipfile.ZipFile(backup_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file in MEDIA_DIR.rglob("*"):
-                if file.is_file():
-                    arcname = file.relative_to(MEDIA_DIR)
-                    zipf.write(file, arcname)
-        
-        size_mb = backup_file.stat().st_size / (1024 * 1024)
-        print(f"✅ Media files backed up: {backup_file.name} ({size_mb:.2f} MB)")
-        return backup_file
+        result = backup_media_incremental(MEDIA_DIR, BACKUP_DIR, timestamp, scan=media_scan, full=full,
+                                          workers=workers)
+        if phases is not None:
+            phases.update({f"media_{name}": stats for name, stats in result['phases'].items()})
+        size_mb = result['size'] / (1024 * 1024)
+        print(f"✅ Media files backed up ({result['kind']}): {Path(result['manifest']).name} "
+              f"({result['new']} new, {result['changed']} changed, {result['unchanged']} unchanged, "
+              f"{result['removed']} removed; {len(result['archives'])} volume(s), {size_mb:.2f} MB "
+              f"in {result['seconds']}s)")
+        return result
     except Exception as e:
         print(f"❌ Media backup failed: {e}")
         return None
@@ -141,12 +178,11 @@ def cleanup_old_backups():
     
     # Get all backup files
     all_backups = {}
-    for pattern in ["db_backup_*.sqlite3", "media_backup_*.zip", "env_backup_*.txt", "backup_info_*.json"]:
+    for pattern in [DB_BACKUP_GLOB, MEDIA_ARCHIVE_GLOB, MEDIA_MANIFEST_GLOB, "env_backup_*.txt", "backup_info_*.json"]:
         for backup_file in BACKUP_DIR.glob(pattern):
             try:
                 # Extract timestamp from filename
-                timestamp_str = backup_file.stem.split('_')[-2] + backup_file.stem.split('_')[-1]
-                backup_date = datetime.datetime.strptime(timestamp_str, "%Y%m%d%H%M%S")
+                backup_date = datetime.datetime.strptime(backup_timestamp(backup_file.name), "%Y%m%d_%H%M%S")
                 
                 if backup_date not in all_backups:
                     all_backups[backup_date] = []
@@ -157,7 +193,7 @@ def cleanup_old_backups():
     # Sort backups by date
     sorted_backups = sorted(all_backups.items(), key=lambda x: x[0], reverse=True)
     
-    deleted_count = 0
+    expired = []
     for backup_date, files in sorted_backups:
         age_days = (now - backup_date).days
         
@@ -178,13 +214,24 @@ def cleanup_old_backups():
             if backup_date.day == 1:
                 continue
         
-        # Delete old backups
-        for file in files:
-            try:
-                file.unlink()
-                deleted_count += 1
-            except Exception as e:
-                print(f"⚠️  Could not delete {file.name}: {e}")
+        expired.extend(files)
+    
+    # Media volumes from an expired run may still hold unchanged files for a
+    # newer manifest that is being kept
+    expired_set = set(expired)
+    kept_manifests = [f for f in BACKUP_DIR.glob(MEDIA_MANIFEST_GLOB) if f not in expired_set]
+    still_needed = referenced_media_archives(kept_manifests)
+    
+    # Delete old backups
+    deleted_count = 0
+    for file in expired:
+        if file.name in still_needed:
+            continue
+        try:
+            file.unlink()
+            deleted_count += 1
+        except Exception as e:
+            print(f"⚠️  Could not delete {file.name}: {e}")
     
     if deleted_count > 0:
         print(f"🗑️  Cleaned up {deleted_count} old backup files")
@@ -204,8 +251,16 @@ def run_backup():
     # Get timestamp for this backup
     timestamp = get_timestamp()
     
+    # Scan media once; the same listing feeds the info and the incremental backup
+    phases = {}
+    scan_started = datetime.datetime.now()
+    media_scan = scan_media(MEDIA_DIR) if MEDIA_DIR.exists() else {}
+    phases["media_scan"] = phase_stats((datetime.datetime.now() - scan_started).total_seconds(), files=len(media_scan))
+    full_media = "--full-media" in sys.argv
+    workers = get_workers()
+    
     # Get backup info
-    info = get_backup_info()
+    info = get_backup_info(media_scan)
     print(f"📊 Backup Information:")
     print(f"   Database size: {info['database_size'] / (1024*1024):.2f} MB")
     print(f"   Media files: {info['files_backed_up']} files ({info['media_size'] / (1024*1024):.2f} MB)")
@@ -213,10 +268,18 @@ def run_backup():
     
     # Perform backups
     print("📦 Creating backups...")
-    db_backup = backup_database(timestamp)
-    media_backup = backup_media(timestamp)
+    db_backup = backup_database(timestamp, phases)
+    media_backup = backup_media(timestamp, media_scan, full=full_media, workers=workers, phases=phases)
+    if media_backup:
+        info["media_backup"] = {key: media_backup[key] for key in ("kind", "new", "changed", "unchanged", "removed", "size")}
     env_backup = backup_env(timestamp)
     
+    # Phase timings
+    print()
+    print(f"⏱️  Phase timings ({workers} worker(s)):")
+    print_phases(phases)
+    info["phases"] = phases
+    
     # Save metadata
     print()
     save_backup_metadata(timestamp, info)
@@ -15,6 +15,7 @@ Shows:
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
@@ -26,6 +27,10 @@ import json
 BASE_DIR = Path(__file__).parent
 BACKUP_DIR = BASE_DIR / "backups"
 
+# Shared backup engine (plain Python, no Django needed)
+sys.path.insert(0, str(BASE_DIR / "backend"))
+from core.backup_engine import backup_timestamp, DB_BACKUP_GLOB, media_manifest_path, media_backup_files
+
 # ============================================================================
 # CHECK FUNCTIONS
 # ============================================================================
@@ -47,7 +52,7 @@ def check_backup_status():
         return
     
     # Find all database backups
-    db_backups = sorted(BACKUP_DIR.glob("db_backup_*.sqlite3"), reverse=True)
+    db_backups = sorted(BACKUP_DIR.glob(DB_BACKUP_GLOB), reverse=True)
     
     if not db_backups:
         print("❌ CRITICAL: No backups found!")
@@ -60,7 +65,7 @@ def check_backup_status():
     
     # Extract timestamp from filename
     try:
-        timestamp_str = latest_backup.stem.replace("db_backup_", "")
+        timestamp_str = backup_timestamp(latest_backup.name)
         latest_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
     except:
         print("⚠️  Could not parse backup date")
@@ -97,7 +102,8 @@ def check_backup_status():
     print()
     
     # Check for corresponding files
-    media_file = BACKUP_DIR / f"media_backup_{timestamp_str}.zip"
+    media_manifest = media_manifest_path(BACKUP_DIR, timestamp_str)
+    media_files = media_backup_files(BACKUP_DIR, timestamp_str)
     env_file = BACKUP_DIR / f"env_backup_{timestamp_str}.txt"
     info_file = BACKUP_DIR / f"backup_info_{timestamp_str}.json"
     
@@ -105,9 +111,9 @@ def check_backup_status():
     db_size = latest_backup.stat().st_size / (1024 * 1024)
     print(f"📊 Database: {db_size:.2f} MB")
     
-    # Media
-    if media_file.exists():
-        media_size = media_file.stat().st_size / (1024 * 1024)
+    # Media (an incremental run with no changes has a manifest but no new volumes)
+    if media_manifest.exists() or media_files:
+        media_size = sum(f.stat().st_size for f in media_files) / (1024 * 1024)
         print(f"📁 Media: {media_size:.2f} MB")
     else:
         print(f"📁 Media: ❌ Missing")
@@ -138,7 +144,7 @@ def check_backup_status():
     backups_by_day = {}
     for db_backup in db_backups:
         try:
-            timestamp_str = db_backup.stem.replace("db_backup_", "")
+            timestamp_str = backup_timestamp(db_backup.name)
             backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
             day_key = backup_date.strftime("%Y-%m-%d")
             
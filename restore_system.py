@@ -8,12 +8,15 @@ Usage:
     python restore_system.py
 
 The script will show available backups and let you choose which one to restore.
+Incremental media backups are rebuilt to exactly the state of the chosen backup
+from its manifest (base backup plus the changes copied since).
 
 ⚠️  WARNING: This will OVERWRITE your current database and files!
     Make sure you have a backup of the current state before restoring.
 """
 
 import os
+import sys
 import shutil
 import zipfile
 import json
@@ -31,6 +34,13 @@ MEDIA_DIR = BACKEND_DIR / "media"
 ENV_FILE = BACKEND_DIR / ".env"
 BACKUP_DIR = BASE_DIR / "backups"
 
+# Shared backup engine (plain Python, no Django needed)
+sys.path.insert(0, str(BACKEND_DIR))
+from core.backup_engine import (
+    online_sqlite_backup, restore_sqlite_backup, backup_timestamp, DB_BACKUP_GLOB,
+    media_manifest_path, load_media_manifest, restore_media_snapshot,
+)
+
 # ============================================================================
 # RESTORE FUNCTIONS
 # ============================================================================
@@ -42,7 +52,7 @@ def list_available_backups():
         return []
     
     # Find all database backups (use these as the primary backup identifier)
-    db_backups = list(BACKUP_DIR.glob("db_backup_*.sqlite3"))
+    db_backups = list(BACKUP_DIR.glob(DB_BACKUP_GLOB))
     
     if not db_backups:
         print("❌ No backups found!")
@@ -51,15 +61,18 @@ def list_available_backups():
     backups = []
     for db_file in sorted(db_backups, reverse=True):
         # Extract timestamp
-        timestamp_str = db_file.stem.replace("db_backup_", "")
+        timestamp_str = backup_timestamp(db_file.name)
         
         try:
             backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
         except:
             continue
         
-        # Check for corresponding files
+        # Check for corresponding files (a manifest for incremental media, a single zip for older backups)
+        media_manifest = media_manifest_path(BACKUP_DIR, timestamp_str)
         media_file = BACKUP_DIR / f"media_backup_{timestamp_str}.zip"
+        if media_manifest.exists():
+            media_file = media_manifest
         env_file = BACKUP_DIR / f"env_backup_{timestamp_str}.txt"
         info_file = BACKUP_DIR / f"backup_info_{timestamp_str}.json"
         
@@ -103,7 +116,15 @@ def display_backups(backups):
         print(f"    📊 Database: {db_size:.2f} MB")
         
         # Media info
-        if backup["media_file"]:
+        if backup["media_file"] and backup["media_file"].suffix == ".json":
+            try:
+                manifest = load_media_manifest(backup["media_file"])
+                total_size = sum(entry["size"] for entry in manifest["files"].values()) / (1024 * 1024)
+                print(f"    📁 Media: {len(manifest['files'])} files, {total_size:.2f} MB "
+                      f"({manifest['kind']}, base {manifest['base']})")
+            except Exception:
+                print(f"    📁 Media: ⚠️  Manifest unreadable")
+        elif backup["media_file"]:
             media_size = backup["media_file"].stat().st_size / (1024 * 1024)
             print(f"    📁 Media: {media_size:.2f} MB")
         else:
@@ -129,12 +150,12 @@ def restore_database(backup_file):
     # Backup current database first
     if DATABASE_FILE.exists():
         current_backup = DATABASE_FILE.parent / f"db_before_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.sqlite3"
-        shutil.copy2(DATABASE_FILE, current_backup)
+        online_sqlite_backup(DATABASE_FILE, current_backup, compress=False)
         print(f"   ✅ Current database backed up to: {current_backup.name}")
     
-    # Restore from backup
+    # Restore from backup (handles .sqlite3 and .sqlite3.gz, verified before it is applied)
     try:
-        shutil.copy2(backup_file, DATABASE_FILE)
+        restore_sqlite_backup(backup_file, DATABASE_FILE)
         print(f"   ✅ Database restored successfully!")
         return True
     except Exception as e:
@@ -159,6 +180,11 @@ def restore_media(backup_file):
     
     # Extract backup
     try:
+        if backup_file.suffix == ".json":
+            # Incremental backup: pull every file from whichever volume holds it
+            restored = restore_media_snapshot(backup_file, BACKUP_DIR, MEDIA_DIR)
+            print(f"   ✅ Media files restored successfully! ({restored} files, checksums verified)")
+            return True
         with zipfile.ZipFile(backup_file, 'r') as zipf:
             zipf.extractall(MEDIA_DIR)
         print(f"   ✅ Media files restored successfully!")